@@ -0,0 +1,206 @@
+from itertools import islice
+
+
+def letter_counts(string):
+    """Return a letter-count vector for a string: a dict mapping each
+       lowercase letter in the string to the number of times it appears.
+       Characters that are not letters (spaces, apostrophes, etc.) are
+       ignored.
+       Param: string(str)
+       Return: counts(dict)
+    """
+    counts = dict()
+    for letter in string.lower():
+        if letter.isalpha():
+            counts[letter] = counts.get(letter, 0) + 1
+    return counts
+
+
+def letters_of(word):
+    """Return the lowercase letters of a word, in order, as a str."""
+    return "".join(letter for letter in word.lower() if letter.isalpha())
+
+
+class TrieNode(object):
+
+    def __init__(self):
+        """Initialize a node with no children, which ends no word."""
+        self.children = dict()  # maps a letter to the next TrieNode
+        self.words = list()  # dictionary words spelled out by this path
+
+
+class AnagramTrie(object):
+    """A letter trie over the words in a dictionary. Walking the trie while
+       spending letters from a letter-count vector prunes every branch that
+       needs a letter we don't have, so only a small part of the dictionary
+       is ever visited for a search.
+    """
+
+    def __init__(self, words=None):
+        """Initialize this trie and insert the given words, if any."""
+        self.root = TrieNode()
+        self.size = 0  # number of words stored in the trie
+        # maps the sorted letters of a word to every word with those letters
+        self.signatures = dict()
+        if words is not None:
+            for word in words:
+                self.insert(word)
+
+    def insert(self, word):
+        """Add a dictionary word to the trie. The path through the trie is
+           made of the word's letters only, so "can't" is found under the
+           letters c-a-n-t. Words without any letters are skipped.
+           Running time: O(l) for a word of l letters.
+        """
+        letters = letters_of(word)
+        if len(letters) == 0:
+            return
+        node = self.root
+        for letter in letters:
+            if letter not in node.children:
+                node.children[letter] = TrieNode()
+            node = node.children[letter]
+        if word not in node.words:
+            node.words.append(word)
+            self.signatures.setdefault("".join(sorted(letters)),
+                                       list()).append(word)
+            self.size += 1
+
+    def exact_anagrams(self, counts):
+        """Return the words that use every letter in a letter-count vector
+           exactly once, found in O(l log l) time for l letters.
+        """
+        signature = "".join(letter * counts[letter]
+                            for letter in sorted(counts))
+        return self.signatures.get(signature, list())
+
+    def sub_anagrams(self, counts, min_length=1, lower_bound=""):
+        """Generate every word that can be spelled using (some of) the letters
+           in a letter-count vector, as tuples of (word, remaining counts).
+           Results are yielded lazily, in alphabetical order of letters.
+           Param: counts(dict): letter-count vector, see letter_counts()
+                  min_length(int): shortest word (in letters) to yield
+                  lower_bound(str): only yield words whose letters are not
+                                    alphabetically before these letters
+        """
+        return self._search(self.root, dict(counts), 0, min_length,
+                            lower_bound)
+
+    def _search(self, node, remaining, depth, min_length, bound):
+        """Depth-first walk under node, only taking the branches for letters
+           that are still left in the remaining letter-count vector.
+           bound is what's left of the lower bound below this node, or None
+           once the path has gone past it, so branches before the lower
+           bound are never visited.
+        """
+        for letter in sorted(node.children):
+            if remaining.get(letter, 0) == 0:
+                continue  # prune: no letters left to go down this branch
+            child_bound = None
+            if bound:
+                if letter < bound[0]:
+                    continue  # prune: every word down here is too early
+                if letter == bound[0]:
+                    child_bound = bound[1:]
+            child = node.children[letter]
+            # spend the letter, search below it, then give it back
+            remaining[letter] -= 1
+            # a word that's a prefix of the lower bound comes before it
+            if depth + 1 >= min_length and not child_bound:
+                for word in child.words:
+                    leftover = {letter: count for letter, count
+                                in remaining.items() if count > 0}
+                    yield (word, leftover)
+            yield from self._search(child, remaining, depth + 1, min_length,
+                                    child_bound)
+            remaining[letter] += 1
+
+
+def find_words(trie, string, min_length=1):
+    """Generate the words that can be made from the letters of a string."""
+    for word, remaining in trie.sub_anagrams(letter_counts(string),
+                                             min_length):
+        yield word
+
+
+def find_anagrams(trie, string):
+    """Generate the single-word anagrams of a string: words that use all of
+       its letters exactly once. The string itself is not an anagram of
+       itself, so it is left out.
+    """
+    for word, remaining in trie.sub_anagrams(letter_counts(string)):
+        if len(remaining) == 0 and word.lower() != string.lower():
+            yield word
+
+
+def find_phrases(trie, string, min_length=2, max_words=4):
+    """Generate multi-word anagrams of a string, as tuples of words that
+       together use every letter of the string exactly once.
+       Each phrase is produced once, with its words in alphabetical order, so
+       "dirty room" and "room dirty" are not both generated. Pruned
+       backtracking over a trie of only the words that fit in the string: the
+       search for each next word starts from the word before it, and
+       leftover letters that failed to make a phrase once are not searched
+       again.
+       Param: trie(AnagramTrie)
+              string(str): the letters to rearrange
+              min_length(int): shortest word allowed in a phrase
+              max_words(int): most words allowed in a phrase
+    """
+    counts = letter_counts(string)
+    if len(counts) == 0:
+        return
+    # only the words that fit in the string can be in a phrase, so search a
+    # trie of just those, and give up early if some letter is in none of them
+    words = [word for word, _ in trie.sub_anagrams(counts, min_length)]
+    if not set(counts) <= set("".join(letters_of(word) for word in words)):
+        return
+    yield from _find_phrases(AnagramTrie(words), counts, (), min_length,
+                             max_words, dict())
+
+
+def _find_phrases(trie, counts, phrase, min_length, words_left, failed):
+    """Generate the phrases that start with the given words and use up the
+       letters in counts with at most words_left more words, each of them
+       not alphabetically before the last word of the phrase.
+       failed maps the leftover letters and words_left of a search that
+       found nothing to the lowest lower bound it was tried with, so the
+       same letters are never searched again with a bound as high.
+    """
+    bound = letters_of(phrase[-1]) if len(phrase) > 0 else ""
+    if words_left == 1:
+        # the last word has to use up every letter that's left
+        for word in trie.exact_anagrams(counts):
+            letters = letters_of(word)
+            if len(letters) >= min_length and letters >= bound:
+                yield phrase + (word,)
+        return
+    key = (frozenset(counts.items()), words_left)
+    if key in failed and bound >= failed[key]:
+        return
+    found = False
+    for word, remaining in trie.sub_anagrams(counts, min_length, bound):
+        if len(remaining) == 0:
+            found = True
+            yield phrase + (word,)
+        else:
+            for result in _find_phrases(trie, remaining, phrase + (word,),
+                                        min_length, words_left - 1, failed):
+                found = True
+                yield result
+    if not found:
+        failed[key] = min(bound, failed.get(key, bound))
+
+
+def paginate(results, page=1, per_page=20, extra=0):
+    """Return one page of results from a generator, as a list, without
+       generating anything past the end of the page.
+       Param: results(iterable)
+              page(int): 1-indexed page number
+              per_page(int): number of results on a page
+              extra(int): number of results to take after the page, e.g. 1
+                          to know if there is a next page
+       Return: list
+    """
+    start = (max(page, 1) - 1) * per_page
+    return list(islice(results, start, start + per_page + extra))
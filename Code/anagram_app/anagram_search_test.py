@@ -0,0 +1,92 @@
+#!python
+
+from anagram_search import (AnagramTrie, letter_counts, find_words,
+                            find_anagrams, find_phrases, paginate)
+import random
+import time
+import unittest
+# Python 2 and 3 compatibility: unittest module renamed this assertion method
+if not hasattr(unittest.TestCase, 'assertCountEqual'):
+    unittest.TestCase.assertCountEqual = unittest.TestCase.assertItemsEqual
+
+
+class AnagramSearchTest(unittest.TestCase):
+
+    # Test fixtures: a small dictionary to search through
+    words = ['act', 'cat', 'tac', 'at', 'a', 'dirty', 'room', 'moor',
+             'dormitory', 'dry', 'riot', 'Tom', "it's"]
+
+    def test_letter_counts(self):
+        assert letter_counts('Cat') == {'c': 1, 'a': 1, 't': 1}
+        assert letter_counts("it's a") == {'i': 1, 't': 1, 's': 1, 'a': 1}
+        assert letter_counts('') == {}
+
+    def test_insert(self):
+        trie = AnagramTrie(self.words)
+        assert trie.size == len(self.words)
+        # Inserting a word again should not change the size
+        trie.insert('cat')
+        assert trie.size == len(self.words)
+
+    def test_find_anagrams(self):
+        trie = AnagramTrie(self.words)
+        self.assertCountEqual(find_anagrams(trie, 'cat'), ['act', 'tac'])
+        self.assertCountEqual(find_anagrams(trie, 'tis'), ["it's"])
+        assert list(find_anagrams(trie, 'xyz')) == []
+
+    def test_find_words(self):
+        trie = AnagramTrie(self.words)
+        self.assertCountEqual(find_words(trie, 'cat'),
+                              ['act', 'cat', 'tac', 'at', 'a'])
+        self.assertCountEqual(find_words(trie, 'cat', min_length=3),
+                              ['act', 'cat', 'tac'])
+
+    def test_find_phrases(self):
+        trie = AnagramTrie(self.words)
+        phrases = list(find_phrases(trie, 'dormitory'))
+        # Every phrase is found once, no matter the order of its words
+        self.assertCountEqual(phrases, [('dirty', 'moor'), ('dirty', 'room'),
+                                        ('dormitory',)])
+        # Every phrase uses up all of the letters
+        for phrase in phrases:
+            assert letter_counts(''.join(phrase)) == letter_counts('dormitory')
+
+    def test_find_phrases_long_input(self):
+        # 20000 made-up words over the letters of the input and a few more,
+        # so there are many thousands of phrases to page through
+        rng = random.Random(0)
+        letters = 'thewalofnisrdu'
+        words = [''.join(rng.choice(letters)
+                         for _ in range(rng.randint(2, 7)))
+                 for _ in range(20000)]
+        trie = AnagramTrie(words)
+        string = 'the wealth of nations'
+        start = time.perf_counter()
+        first_page = paginate(find_phrases(trie, string), 1, 20)
+        later_page = paginate(find_phrases(trie, string), 50, 20)
+        # a full search of every branch takes minutes
+        assert time.perf_counter() - start < 5
+        assert len(first_page) == 20 and len(later_page) == 20
+        for phrase in first_page + later_page:
+            assert letter_counts(''.join(phrase)) == letter_counts(string)
+            assert list(phrase) == sorted(phrase)
+        # a letter that's in no word is noticed without searching
+        start = time.perf_counter()
+        assert list(find_phrases(trie, string + 'q')) == []
+        assert time.perf_counter() - start < 5
+
+    def test_paginate(self):
+        results = iter(range(50))
+        assert paginate(results, 1, 20) == list(range(0, 20))
+        assert paginate(iter(range(50)), 3, 20) == list(range(40, 50))
+        assert paginate(iter(range(50)), 4, 20) == []
+        # one extra result, to know if there is a next page, doesn't move
+        # where the next page starts
+        pages = [paginate(iter(range(50)), page, 20, extra=1)
+                 for page in (1, 2, 3)]
+        assert [len(page) for page in pages] == [21, 21, 10]
+        assert pages[0][:20] + pages[1][:20] == list(range(40))
+
+
+if __name__ == '__main__':
+    unittest.main()
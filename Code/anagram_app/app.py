@@ -1,20 +1,48 @@
+import os
+import sys
 from flask import Flask, request, render_template, redirect, url_for
+# share the words file loader with the scripts in the parent folder
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from word_list import get_word_list  # noqa: E402
+from anagram_search import (AnagramTrie, find_anagrams,  # noqa: E402
+                            find_words, find_phrases, paginate)
 
 app = Flask(__name__)
+# number of anagrams to show on one page of results
+RESULTS_PER_PAGE = 20
+# trie over the words file, built the first time someone searches
+trie = None
 
 
 def get_words():
     """Get words from the words file to get anagrams from."""
-    # get words from the words file
-    file = open("/usr/share/dict/words", "r")
-    words_list = file.readlines()
-    file.close()
-    # removing newline characters from strings in words file
-    words_no_newline = list()
-    for word in words_list:
-        word = word[:-3]
-        words_no_newline.append(word)
-    return words_no_newline
+    # words come from the memory mapped file shared with other processes
+    return get_word_list()
+
+
+def get_trie():
+    """Return the AnagramTrie of the words file, building it only once."""
+    global trie
+    if trie is None:
+        trie = AnagramTrie(get_words())
+    return trie
+
+
+def search(letters, mode):
+    """Return a generator of results for the letters, in the given mode.
+       Params:
+       letters(str): the string input by the user
+       mode(str): "anagrams" for single words using all of the letters,
+                  "words" for words made from some of the letters,
+                  "phrases" for multi-word anagrams
+       Return: generator of str
+    """
+    if mode == "words":
+        return find_words(get_trie(), letters)
+    elif mode == "phrases":
+        return (" ".join(phrase) for phrase
+                in find_phrases(get_trie(), letters))
+    return find_anagrams(get_trie(), letters)
 
 
 def determine_anagram(word, possible_anagram):
@@ -67,22 +95,24 @@ def get_input():
 def parse_data():
     """Generates anagrams from the input string."""
     input = request.form.get("string")
-    anagrams = list()
-    words_to_choose_from = get_words()
-    # determine 10 words that are anagrams of the input
-    for word in words_to_choose_from:
-        if determine_anagram(input, word) is True:
-            anagrams.append(word)
-    return redirect(url_for("show_anagrams", anagrams=anagrams))
+    mode = request.form.get("mode", "anagrams")
+    # results are searched for one page at a time, when they're shown
+    return redirect(url_for("show_anagrams", anagrams=input, mode=mode))
 
 
 @app.route("/anagrams/<anagrams>")
 def show_anagrams(anagrams):
-    """Display anagrams."""
-    # rememeber: anagrams is a string at this point
-    # remove duplicates
-    # anagrams = list(set(anagrams))
-    return render_template("result.html", anagrams=anagrams)
+    """Display one page of anagrams of the letters in the URL."""
+    # rememeber: anagrams is the string input by the user
+    mode = request.args.get("mode", "anagrams")
+    page = request.args.get("page", 1, type=int)
+    # get one extra result, to know if there is a next page
+    results = paginate(search(anagrams, mode), page, RESULTS_PER_PAGE,
+                       extra=1)
+    has_next = len(results) > RESULTS_PER_PAGE
+    return render_template("result.html", letters=anagrams, mode=mode,
+                           anagrams=results[:RESULTS_PER_PAGE], page=page,
+                           has_next=has_next, per_page=RESULTS_PER_PAGE)
 
 
 if __name__ == "__main__":
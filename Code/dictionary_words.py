@@ -1,30 +1,25 @@
 import random
 import sys
+from word_list import get_word_list, sample_words
 
 
 def get_words_list():
     """Return a list of words from words file, with no newline characters."""
-    # get words from the file
-    lines = list()
-    with open("/usr/share/dict/words", "r") as file:
-        lines = file.readlines()
-    # removing newline characters from strings in words file
-    words_no_newline = [line.strip() for line in lines]
-
-    return words_no_newline
+    # get words from the memory mapped words file
+    return list(get_word_list())
 
 
 def make_sentence(words_list, num_words):
     """Get the number of words requested by user randomly.
        Params:
-       words_list(list): list of str to choose words from randomly
+       words_list(list or WordList): sequence of str to choose words from
        num_words(int)
        Returns:
        sentence(list)
     """
     sentence = list()
     for i in range(num_words):
-        random_index = random.randrange(len(words_list) - 1)
+        random_index = random.randrange(len(words_list))
         sentence.append(words_list[random_index])
     return sentence
 
@@ -44,8 +39,8 @@ def random_words_from_dictionary(num_requested):
         Return a sentence of words randomly chosen from a file.
         Param: num_requested(int): number of words in sentence
     """
-    words = get_words_list()
-    sentence = make_sentence(words, num_requested)
+    # only the words being picked are read out of the file
+    sentence = sample_words(num_requested)
     print_sentence(sentence)
 
 
@@ -1,4 +1,25 @@
-from clean_words import get_clean_words
+from bisect import bisect_left
+import math
+
+
+def count_words(words_list):
+    """Count the appearances of every word in a list, in one pass.
+
+       Parameters:
+       words_list(list): list of strings representing words
+
+       Returns:
+       counts(dict): each key a unique (lowercase) word, values are number
+       of word appearances. Keys are in order of first appearance.
+
+       Running time: O(n) for a list of n words.
+
+    """
+    counts = dict()
+    for word in words_list:
+        word = word.lower()
+        counts[word] = counts.get(word, 0) + 1
+    return counts
 
 
 def create_histogram_dict(words_list):
@@ -12,39 +33,40 @@ def create_histogram_dict(words_list):
        word appearances
 
     """
-    histogram = dict()
-    words = histogram.keys()
-    for word in words_list:
-        if word.lower() not in words:
-            histogram[word.lower()] = 1
-        else:
-            histogram[word.lower()] += 1
-    return histogram
+    return count_words(words_list)
 
 
 def find_unique_words(words_list):
     '''Record all unique words in a list of strings.'''
-    # record all unique words
-    unique_words = list()
-    for word in words_list:
-        if word.lower() not in unique_words:
-            unique_words.append(word.lower())
-    return unique_words
+    return list(count_words(words_list))
+
+
+def counts_to_list_of_lists(counts):
+    '''Convert a dict of word counts to a list of [word, count] lists.'''
+    return [[word, count] for word, count in counts.items()]
+
+
+def counts_to_list_of_tuples(counts):
+    '''Convert a dict of word counts to a list of (word, count) tuples.'''
+    return list(counts.items())
+
+
+def counts_to_inverted(counts):
+    """Convert a dict of word counts to an inverted histogram: a list of
+       (count, [words]) tuples, one for each number of appearances that
+       some word makes, in increasing order of count.
+    """
+    words_by_count = dict()
+    for word, count in counts.items():
+        if count not in words_by_count:
+            words_by_count[count] = list()
+        words_by_count[count].append(word)
+    return sorted(words_by_count.items())
 
 
 def make_word_appearance_pairs(words_list):
     '''Return a list of word and the number of appearances they make in a list.'''
-    histogram = list()
-    unique_words = find_unique_words(words_list)
-    # count up appearances of each unique word, then make tuple in histogram
-    for word in unique_words:
-        appearances = 0
-        for word_from_text in words_list:
-            if word == word_from_text.lower():
-                appearances += 1
-        histogram.append([word, appearances])
-
-    return histogram
+    return counts_to_list_of_lists(count_words(words_list))
 
 
 def create_histogram_list_of_lists(words_list):
@@ -65,16 +87,7 @@ def create_histogram_list_of_lists(words_list):
 
 def create_histogram_list_of_tuples(words_list):
     '''Return a histogram stuctured as a list of nested tuples.'''
-    histogram = make_word_appearance_pairs(words_list)
-    # make each nested list a tuple
-    histogram = [tuple(list) for list in histogram]
-    return histogram
-
-
-class Word:
-    def __init__(self, word, appearances=0):
-        self.word = word
-        self.appearances = appearances
+    return counts_to_list_of_tuples(count_words(words_list))
 
 
 def create_histogram_inverted(words_list):
@@ -90,68 +103,62 @@ def create_histogram_inverted(words_list):
        histogram(list): contains nested tuples with nested lists
 
     """
-    unique_words = find_unique_words(words_list)
-    unique_words_as_obj = [Word(word) for word in unique_words]
-    # count up appearances for each Word
-    for word in unique_words_as_obj:
-        for word_from_text in words_list:
-            if word.word == word_from_text.lower():
-                word.appearances += 1
-    # make a histogram by grouping Word objects with equal appearances together
-    histogram = list()
-    count_of_appearances = 0
-    # while len(histogram) < len(unique_words_as_obj):
-    for word in unique_words_as_obj:
-        count_of_appearances += 1
-        words_having_appearances = list()
-        word_count = (count_of_appearances, words_having_appearances)
-        if word.appearances == count_of_appearances:
-            words_having_appearances.append(word.word)
-            histogram.append(word_count)
-
-    return histogram
-
-
-def histogram():
-    """Return a histogram of the appearances of words from a .txt file.
+    return counts_to_inverted(count_words(words_list))
+
+
+def create_all_histograms(words_list):
+    """Return every layout of histogram for a text, from one counting pass.
 
        Parameters:
-       None
+       words_list(list)
 
        Returns:
-       histogram(dict): every key a unique word, and value is appearances
-                        of the word in the text
+       dict: maps "dict", "list_of_lists", "list_of_tuples" and "inverted"
+             to that layout of the histogram
 
     """
-    words_list = get_clean_words()
-    # make a dict of the data
-    histogram = create_histogram_dict(words_list)
-    # histogram = create_histogram_list_of_lists(words_list)
-    # histogram = create_histogram_list_of_tuples(words_list)
-    # histogram = create_histogram_inverted(words_list)
-
-    return histogram
+    counts = count_words(words_list)
+    return {
+        "dict": counts,
+        "list_of_lists": counts_to_list_of_lists(counts),
+        "list_of_tuples": counts_to_list_of_tuples(counts),
+        "inverted": counts_to_inverted(counts)
+    }
 
 
 def determine_hist_type(histogram):
     """Return the data type of the histogram.
 
        Parameters:
-       histogram(dict or list): dict, list of lists, or list of tuples
+       histogram(dict or list): dict, list of lists, list of tuples, or
+       inverted list of (count, [words]) tuples
 
        Returns:
        str: declares what the object type of the histogram is
 
     """
     if isinstance(histogram, dict) is True:
-        # determine if keys in dict are word strings or numbers
         return "dict"
     elif isinstance(histogram, list) is True:
-        # determine if histogram is inverted or not
-        if isinstance(histogram[0], str) is True:
-            return "list"
-        else:
+        # determine if histogram is inverted or not, by what comes first in
+        # its entries: a word, or a count
+        if len(histogram) > 0 and isinstance(histogram[0][0], int) is True:
             return "inverted_list"
+        else:
+            return "list"
+
+
+def histogram_counts(histogram):
+    """Return a dict of word counts, from a histogram of any layout.
+       Running time: O(n) for n word types.
+    """
+    hist_type = determine_hist_type(histogram)
+    if hist_type == "dict":
+        return histogram
+    elif hist_type == "list":
+        return {word: count for word, count in histogram}
+    elif hist_type == "inverted_list":
+        return {word: count for count, words in histogram for word in words}
 
 
 def unique_words(histogram):
@@ -165,15 +172,12 @@ def unique_words(histogram):
        int: number of word types in the histogram
 
     """
-    if determine_hist_type(histogram) == "dict":
-        return len(list(histogram.keys()))
-    elif determine_hist_type(histogram) == "list":
-        return len(histogram)
-    elif determine_hist_type(histogram) == "inverted_list":
+    if determine_hist_type(histogram) == "inverted_list":
         count_of_words = 0
-        for tuple in histogram:
-            count_of_words += tuple[1]
+        for count, words in histogram:
+            count_of_words += len(words)
         return count_of_words
+    return len(histogram)
 
 
 def frequency(word, histogram):
@@ -184,51 +188,131 @@ def frequency(word, histogram):
        histogram(dict, list of lists or tuples): represents source text
 
        Returns:
-       int: number of tokens for the given word type
+       int: number of tokens for the given word type, 0 if it's not found
 
     """
-    if determine_hist_type(histogram) == "dict":
-        return histogram[word]
+    if isinstance(histogram, HistogramStats) is True:
+        return histogram.frequency(word)
+    elif determine_hist_type(histogram) == "dict":
+        return histogram.get(word, 0)
     elif determine_hist_type(histogram) == "list":
-        for i in range(len(histogram)):
-            if histogram[i] == word:
-                return histogram[i][1]
+        for pair in histogram:
+            if pair[0] == word:
+                return pair[1]
     elif determine_hist_type(histogram) == "inverted_list":
-        for tuple in histogram:
-            if word in tuple[1]:
-                return tuple[0]
+        for count, words in histogram:
+            if word in words:
+                return count
+    return 0
+
+
+class HistogramStats(object):
+    """Summary statistics for a histogram of any layout.
+
+       Everything is worked out once, when the object is made, in
+       O(n log n) time for n word types: the total number of tokens, the
+       word counts sorted from least to most frequent, and the words in rank
+       order (most frequent first). After that, every statistic is an O(1)
+       lookup, except words_with_count_at_least (O(log n)) and top (O(k)).
+       For an empty histogram, the statistics that need a word are None.
+    """
+
+    def __init__(self, histogram):
+        """Compute and cache the statistics of the given histogram."""
+        self.counts = dict(histogram_counts(histogram))
+        self.types = len(self.counts)
+        self.tokens = sum(self.counts.values())
+        # words from most to least frequent, ties kept in original order
+        self.ranked_words = sorted(self.counts, key=self.counts.get,
+                                   reverse=True)
+        # word counts from least to most frequent
+        self.sorted_counts = [self.counts[word] for word
+                              in reversed(self.ranked_words)]
+        self.ranks = {word: rank for rank, word
+                      in enumerate(self.ranked_words, 1)}
+
+    def frequency(self, word):
+        """Return the count of a word, or 0 if it's not in the histogram."""
+        return self.counts.get(word, 0)
+
+    def rank(self, word):
+        """Return the rank of a word (1 for the most frequent word), or None
+           if it's not in the histogram."""
+        return self.ranks.get(word)
+
+    def top(self, k):
+        """Return a list of the k most frequent words."""
+        return self.ranked_words[:k]
+
+    def most_frequent(self):
+        """Return the most frequent word, or None if there are no words."""
+        if self.types == 0:
+            return None
+        return self.ranked_words[0]
+
+    def least_frequent(self):
+        """Return the least frequent word, or None if there are no words."""
+        if self.types == 0:
+            return None
+        return self.ranked_words[-1]
+
+    def mean(self):
+        """Return the mean number of appearances of a word type, or None if
+           there are no words."""
+        if self.types == 0:
+            return None
+        return self.tokens / self.types
+
+    def median(self):
+        """Return the median number of appearances of a word type, or None
+           if there are no words."""
+        if self.types == 0:
+            return None
+        middle = self.types // 2
+        if self.types % 2 == 0:
+            return (self.sorted_counts[middle - 1]
+                    + self.sorted_counts[middle]) / 2
+        return self.sorted_counts[middle]
+
+    def mode(self):
+        """Return the number of appearances of the most frequent word, or
+           None if there are no words."""
+        if self.types == 0:
+            return None
+        return self.sorted_counts[-1]
+
+    def percentile(self, percent):
+        """Return the word count at the given percentile (0 to 100) of word
+           types, by the nearest-rank method, or None if there are no words.
+        """
+        if self.types == 0:
+            return None
+        index = math.ceil(percent / 100 * self.types) - 1
+        return self.sorted_counts[min(max(index, 0), self.types - 1)]
+
+    def words_with_count_at_least(self, count):
+        """Return how many word types appear at least count times."""
+        return self.types - bisect_left(self.sorted_counts, count)
+
+
+def get_stats(histogram):
+    """Return the HistogramStats for a histogram. Pass a HistogramStats
+       object to the functions below to avoid computing it again each time.
+    """
+    if isinstance(histogram, HistogramStats) is True:
+        return histogram
+    return HistogramStats(histogram)
 
 
 def most_least_frequent(histogram):
     '''Return a tuple of the most and least frequent words in a histogram.'''
-    # implement for a histogram that uses list of lists
-    if determine_hist_type(histogram) == "list":
-        # find the most frequent word
-        frequency_to_beat = 0
-        most_frequent_word = ""
-        for list in histogram:
-            word = list[0]
-            frequency = frequency(word, histogram)
-            if frequency > frequency_to_beat:
-                most_frequent_word = word
-                frequency_to_beat = frequency
-        # find the least frequent word
-        least_frequent_word = ""
-        for list in histogram:
-            word = list[0]
-            frequency = frequency(word, histogram)
-            if frequency < frequency_to_beat:
-                least_frequent_word = word
-                frequency_to_beat = frequency
-        return tuple(most_frequent_word, least_frequent_word)
+    stats = get_stats(histogram)
+    return (stats.most_frequent(), stats.least_frequent())
 
 
 def total_count(histogram):
     '''Return total number of words in a text given a histogram.'''
-    total_count = 0
-    for pairing in histogram:
-        total_count += pairing[1]
-    return total_count
+    return get_stats(histogram).tokens
 
 
 def calculate_mean(histogram):
@@ -236,63 +320,20 @@ def calculate_mean(histogram):
        Divide total lword count of text by the number of unique words.
 
        Parameters:
-       histogram(list or dict)
+       histogram(list, dict or HistogramStats)
 
        Return:
        float: mean number of appearances across all word types
 
     """
-    if determine_hist_type(histogram) == "list":
-        total_count = total_count(histogram)
-
-        return (float(total_count)/len(histogram))
+    return get_stats(histogram).mean()
 
 
 def calculate_median(histogram):
     '''Return the median word frequency from a histogram.'''
-    if determine_hist_type(histogram) == "list":
-        # check whether length of text is even/odd
-        total_count = total_count(histogram)
-        length = len(histogram)
-        if total_count % 2 == 0:
-            sum = histogram[length / 2][1] + histogram[(length / 2) - 1][1]
-            return (sum / 2)
-        else:
-            # return the appearances of the index position that's
-            # half the length of the histogram minus
-            return histogram[(length - 1) / 2][1]
+    return get_stats(histogram).median()
 
 
 def calculate_mode(histogram):
     '''Return the number of appearances made by the most frequent word.'''
-    most_frequent_word = most_least_frequent(histogram)[0]
-    return frequency(most_frequent_word, histogram)
-
-
-if __name__ == "__main__":
-    # print(histogram(sys.argv[1]))
-    # print(unique_words(histogram(sys.argv[1])))
-    # print(frequency('newsletter', histogram(sys.argv[1])))
-    histogram = histogram()
-    '''
-    most_least_frequent = most_least_frequent(histogram)
-    unique_words = unique_words(histogram)
-    print("Analysis for THE WEALTH OF NATIONS (1776), by Adam Smith:")
-
-    # get stats on the source text
-    (most, least) = most_least_frequent(histogram)
-    print(f"Most frequent word: {most}")
-    print(f"Least frequent word: {least}")
-
-    word_amt = unique_words(histogram)
-    print(f"Number of words used: {word_amt}.")
-
-    mean = calculate_mean(histogram)
-    print(f"Mean word frequency: {mean}.")
-
-    median = calculate_median(histogram)
-    print(f"Median word frequency: {median}.")
-
-    mode = calculate_mode(histogram)
-    print(f"Mode word frequency: {mode}.")
-    '''
+    return get_stats(histogram).mode()
@@ -0,0 +1,114 @@
+#!python
+
+import histogram
+import unittest
+# Python 2 and 3 compatibility: unittest module renamed this assertion method
+if not hasattr(unittest.TestCase, 'assertCountEqual'):
+    unittest.TestCase.assertCountEqual = unittest.TestCase.assertItemsEqual
+
+
+class HistogramTest(unittest.TestCase):
+
+    # Test fixtures: known inputs and their expected results
+    fish_words = ['One', 'fish', 'two', 'fish', 'red', 'fish', 'blue', 'Fish']
+    fish_list = [('one', 1), ('fish', 4), ('two', 1), ('red', 1), ('blue', 1)]
+    fish_dict = {'one': 1, 'fish': 4, 'two': 1, 'red': 1, 'blue': 1}
+    fish_inverted = [(1, ['one', 'two', 'red', 'blue']), (4, ['fish'])]
+
+    def test_count_words(self):
+        counts = histogram.count_words(self.fish_words)
+        assert counts == self.fish_dict
+        # Words are kept in order of their first appearance
+        assert list(counts) == ['one', 'fish', 'two', 'red', 'blue']
+
+    def test_find_unique_words(self):
+        assert (histogram.find_unique_words(self.fish_words)
+                == ['one', 'fish', 'two', 'red', 'blue'])
+
+    def test_create_histogram_dict(self):
+        hist = histogram.create_histogram_dict(self.fish_words)
+        assert hist == self.fish_dict
+
+    def test_create_histogram_list_of_lists(self):
+        hist = histogram.create_histogram_list_of_lists(self.fish_words)
+        assert hist == [list(pair) for pair in self.fish_list]
+
+    def test_create_histogram_list_of_tuples(self):
+        hist = histogram.create_histogram_list_of_tuples(self.fish_words)
+        assert hist == self.fish_list
+
+    def test_create_histogram_inverted(self):
+        hist = histogram.create_histogram_inverted(self.fish_words)
+        assert hist == self.fish_inverted
+
+    def test_create_all_histograms(self):
+        hists = histogram.create_all_histograms(self.fish_words)
+        assert hists['dict'] == self.fish_dict
+        assert hists['list_of_lists'] == [list(p) for p in self.fish_list]
+        assert hists['list_of_tuples'] == self.fish_list
+        assert hists['inverted'] == self.fish_inverted
+
+    def test_determine_hist_type(self):
+        hists = histogram.create_all_histograms(self.fish_words)
+        assert histogram.determine_hist_type(hists['dict']) == 'dict'
+        assert histogram.determine_hist_type(hists['list_of_lists']) == 'list'
+        assert histogram.determine_hist_type(hists['list_of_tuples']) == 'list'
+        assert (histogram.determine_hist_type(hists['inverted'])
+                == 'inverted_list')
+
+    def test_frequency_and_unique_words(self):
+        # Every layout should give the same answers
+        for hist in histogram.create_all_histograms(self.fish_words).values():
+            assert histogram.unique_words(hist) == 5
+            assert histogram.frequency('fish', hist) == 4
+            assert histogram.frequency('red', hist) == 1
+            assert histogram.frequency('food', hist) == 0
+
+    def test_stats(self):
+        for hist in histogram.create_all_histograms(self.fish_words).values():
+            stats = histogram.HistogramStats(hist)
+            assert stats.types == 5
+            assert stats.tokens == 8
+            assert stats.most_frequent() == 'fish'
+            assert stats.rank('fish') == 1
+            assert stats.rank('food') is None
+            assert stats.top(1) == ['fish']
+            assert stats.mean() == 8 / 5
+            assert stats.median() == 1
+            assert stats.mode() == 4
+            assert stats.percentile(50) == 1
+            assert stats.percentile(100) == 4
+            assert stats.words_with_count_at_least(2) == 1
+            assert stats.words_with_count_at_least(1) == 5
+
+    def test_summary_functions(self):
+        hist = histogram.create_histogram_list_of_lists(self.fish_words)
+        most, least = histogram.most_least_frequent(hist)
+        assert most == 'fish'
+        assert least in ('one', 'two', 'red', 'blue')
+        assert histogram.total_count(hist) == 8
+        assert histogram.calculate_mean(hist) == 8 / 5
+        assert histogram.calculate_median(hist) == 1
+        assert histogram.calculate_mode(hist) == 4
+        # Median of an even number of word types
+        assert histogram.calculate_median({'a': 1, 'b': 2}) == 1.5
+
+    def test_empty_stats(self):
+        for hist in ({}, [], histogram.create_histogram_inverted([])):
+            stats = histogram.HistogramStats(hist)
+            assert stats.types == 0
+            assert stats.tokens == 0
+            assert stats.most_frequent() is None
+            assert stats.least_frequent() is None
+            assert stats.mean() is None
+            assert stats.median() is None
+            assert stats.mode() is None
+            assert stats.percentile(50) is None
+            assert stats.top(3) == []
+            assert stats.words_with_count_at_least(1) == 0
+        assert histogram.calculate_mean({}) is None
+        assert histogram.most_least_frequent({}) == (None, None)
+
+
+if __name__ == '__main__':
+    unittest.main()
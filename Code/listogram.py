@@ -13,51 +13,42 @@ class Listogram(list):
         # Add properties to track useful word counts for this histogram
         self.types = 0  # Count of distinct word types in this histogram
         self.tokens = 0  # Total count of all word tokens in this histogram
+        # Position of each word's entry in this list, for O(1) lookups.
+        # Entries are only ever appended, so positions never change.
+        self.word_indexes = dict()
         # Count words in given list, if any
         if word_list is not None:
             for word in word_list:
                 self.add_count(word)
 
     def add_count(self, word, count=1):
-        """Increase frequency count of given word by given count amount."""
-        # TODO: Increase word frequency by count
+        """Increase frequency count of given word by given count amount.
+        O(1) time: the word's entry is found through the index dict."""
         self.tokens += count
-        # if this is the first word being added to the list
-        if self.types == 0:
+        index = self.word_indexes.get(word)
+        if index is None:
+            # if word is not already in the list
+            self.word_indexes[word] = len(self)
             self.append([word, count])
             self.types += 1
         else:
-            # check if the word already exists in the list
-            for i in range(self.types):
-                if word == self[i][0]:
-                    self[i][1] += count
-                    break
-            else:
-                # if word is not already in the list
-                self.append([word, count])
-                self.types += 1
+            self[index][1] += count
 
     def frequency(self, word):
         """Return frequency count of given word, or 0 if word is not found."""
-        for list in self:
-            if word == list[0]:
-                return list[1]
-        return 0
+        index = self.word_indexes.get(word)
+        if index is None:
+            return 0
+        return self[index][1]
 
     def __contains__(self, word):
         """Return boolean indicating if given word is in this histogram."""
-        for list in self:
-            if word == list[0]:
-                return True
-        return False
+        return word in self.word_indexes
 
     def index_of(self, target):
         """Return the index of entry containing given target word if found in
         this histogram, or None if target word is not found."""
-        for i in range(len(self)):
-            if target == self[i][0]:
-                return i
-        return None
+        return self.word_indexes.get(target)
 
     def sample(self):
         """
@@ -83,6 +74,52 @@ class Listogram(list):
         '''
         return sampling_listogram.weighted_sample(self)
 
+    def merge(self, other):
+        """Add the counts of another histogram (a Listogram, Dictogram, or
+        any dict or list of word-count pairs) to this one, in place.
+        O(m) time for m word types in the other histogram."""
+        if hasattr(other, 'items'):
+            other = other.items()
+        for word, count in other:
+            self.add_count(word, count)
+        return self
+
+    def update(self, word_list):
+        """Count the words in the given list, adding to the counts already in
+        this histogram. Another histogram may also be given, as for merge."""
+        if isinstance(word_list, dict) or hasattr(word_list, 'tokens'):
+            return self.merge(word_list)
+        for word in word_list:
+            self.add_count(word)
+        return self
+
+    def copy(self):
+        """Return a new Listogram with the same entries as this one."""
+        return Listogram().merge(self)
+
+    def __add__(self, other):
+        """Return a new Listogram with the counts of both histograms (rather
+        than a list of both lists' entries)."""
+        return self.copy().merge(other)
+
+    def __iadd__(self, other):
+        """Add the counts of other histogram to this one, for +=."""
+        return self.merge(other)
+
+    def __sub__(self, other):
+        """Return a new Listogram with the counts of other histogram taken
+        away from the counts of this one, keeping only words whose count is
+        still above zero."""
+        if hasattr(other, 'items'):
+            other = other.items()
+        other = dict(other)
+        difference = Listogram()
+        for word, count in self:
+            count -= other.get(word, 0)
+            if count > 0:
+                difference.add_count(word, count)
+        return difference
+
 
 def print_histogram(word_list):
     print()
@@ -49,6 +49,17 @@ class ListogramTest(unittest.TestCase):
         # Verify frequency count of unseen words
         assert histogram.frequency('food') == 0
 
+    def test_index_of(self):
+        histogram = Listogram(self.fish_words)
+        # Entries stay in order of each word's first appearance
+        assert histogram.index_of('one') == 0
+        assert histogram.index_of('fish') == 1
+        assert histogram.index_of('blue') == 4
+        assert histogram.index_of('food') is None
+        histogram.add_count('food')
+        assert histogram.index_of('food') == 5
+        assert histogram[5] == ['food', 1]
+
     def test_add_count(self):
         histogram = Listogram(self.fish_words)
         # Add more words to update frequency counts
@@ -106,6 +117,46 @@ class ListogramTest(unittest.TestCase):
             upper_bound = observed_freq * 1.1  # 10% above = 110% = 1.1
             assert lower_bound <= sampled_freq <= upper_bound
 
+    def test_merge_and_add(self):
+        # Count two shards of the words separately, then combine them
+        first = Listogram(self.fish_words[:4])
+        second = Listogram(self.fish_words[4:])
+        total = first + second
+        assert dict(total) == self.fish_dict
+        assert total.types == 5
+        assert total.tokens == 8
+        assert total.index_of('blue') == 4
+        # Adding should not change either histogram
+        assert first.tokens == 4
+        assert second.tokens == 4
+        first += second
+        assert isinstance(first, Listogram)
+        assert dict(first) == self.fish_dict
+        assert first.types == 5
+        assert first.tokens == 8
+        # Other kinds of histograms can be merged too
+        first.merge({'fish': 1, 'food': 2})
+        assert first.frequency('fish') == 5
+        assert first.frequency('food') == 2
+        assert first.tokens == 11
+
+    def test_update(self):
+        histogram = Listogram(self.fish_words)
+        histogram.update(['fish', 'food'])
+        assert histogram.frequency('fish') == 5
+        assert histogram.frequency('food') == 1
+        assert histogram.types == 6
+        assert histogram.tokens == 10
+
+    def test_subtract(self):
+        histogram = Listogram(self.fish_words)
+        difference = histogram - Listogram(['fish', 'fish', 'one', 'food'])
+        # Words whose count drops to zero or below are left out
+        assert difference == [['fish', 2], ['two', 1], ['red', 1], ['blue', 1]]
+        assert difference.types == 4
+        assert difference.tokens == 5
+        assert 'one' not in difference
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,5 +1,28 @@
 import sys
 import random
+import shutil
+import tempfile
+
+# most words to hold in memory at once, when shuffling a file
+DEFAULT_CHUNK_SIZE = 1000000
+# most temporary files to split a file into at once, to stay well under the
+# limit on open files; bigger files are split again, a level at a time
+MAX_BUCKETS = 64
+
+
+def shuffle(words):
+    """Rearrange the items of a list into a random order, in place, using
+       the Fisher-Yates shuffle. Every order is equally likely, and repeated
+       words are moved by position, not looked up by value.
+       Param: words (list)
+       Return: None
+       Running time: O(n), one swap for each of the n items.
+    """
+    for last_index in range(len(words) - 1, 0, -1):
+        # swap the last unshuffled item with one of those before it (or itself)
+        rand_index = random.randint(0, last_index)
+        words[last_index], words[rand_index] = (
+            words[rand_index], words[last_index])
 
 
 def rearrange(words):
@@ -8,21 +31,93 @@ def rearrange(words):
         Return: None
     """
     # create a list storing str from words in a randomly decided order
-    rearranged_words = list()
-    while not len(words) == 0:
-        rand_index = random.randint(0, len(words) - 1)
-        random_word = words[rand_index]
-        if random_word not in rearranged_words or len(words) > 0:
-            rearranged_words.append(random_word)
-            words.remove(random_word)
+    rearranged_words = list(words)
+    shuffle(rearranged_words)
 
     # show the order of str in rearranged_words
-    for word in rearranged_words:
-        print(word, end=" ")
-    # go to a new to make console output cleaner
-    print("")
+    print(" ".join(rearranged_words))
+
+
+def count_words(file):
+    """Return the number of whitespace-separated words in a file object."""
+    return sum(len(line.split()) for line in file)
+
+
+def shuffle_file(in_file, out_file, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Write the words of in_file to out_file in a random order, holding at
+       most about chunk_size words in memory (an external shuffle).
+
+       Each word is first sent to one of several temporary files picked at
+       random, so that each temporary file fits in memory; then each
+       temporary file is read back, shuffled with Fisher-Yates, and written
+       out. Every order of the words is equally likely.
+       Params:
+       in_file, out_file (file objects): seekable text file to read words
+                                         from, and text file to write them to
+       chunk_size (int): most words to hold in memory at once
+       Return: None
+       Running time: O(n) for n words, with two passes over the input.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    num_words = count_words(in_file)
+    in_file.seek(0)
+    shuffle_words_into(in_file, num_words, out_file, chunk_size, "")
+    out_file.write("\n")
+
+
+def shuffle_words_into(in_file, num_words, out_file, chunk_size, separator):
+    """Write the num_words words of in_file to out_file in a random order,
+       separated by spaces, with separator before the first one. A file of
+       more than chunk_size words is split into at most MAX_BUCKETS
+       temporary files, and any of them that's still too big is split
+       again the same way, so only MAX_BUCKETS files are open per level.
+       Return: the separator to write before the next word
+    """
+    if num_words <= chunk_size:
+        # small enough to shuffle all at once
+        words = in_file.read().split()
+        shuffle(words)
+        if len(words) > 0:
+            out_file.write(separator + " ".join(words))
+            separator = " "
+        return separator
+    # use twice as many buckets as needed on average, so that even the
+    # unluckiest bucket will almost surely hold fewer than chunk_size words
+    num_buckets = min(2 * -(-num_words // chunk_size), MAX_BUCKETS)
+    buckets = [tempfile.TemporaryFile("w+") for _ in range(num_buckets)]
+    sizes = [0] * num_buckets
+    try:
+        for line in in_file:
+            for word in line.split():
+                index = random.randrange(num_buckets)
+                buckets[index].write(word + "\n")
+                sizes[index] += 1
+        for bucket, size in zip(buckets, sizes):
+            bucket.seek(0)
+            separator = shuffle_words_into(bucket, size, out_file,
+                                           chunk_size, separator)
+    finally:
+        for bucket in buckets:
+            bucket.close()
+    return separator
 
 
 if __name__ == "__main__":
-    words = sys.argv[1:]
-    rearrange(words)
+    arguments = sys.argv[1:]
+    if len(arguments) >= 2 and arguments[0] == "--file":
+        # shuffle the words in a file, which may be too big to load at once
+        chunk_size = DEFAULT_CHUNK_SIZE
+        if len(arguments) >= 3:
+            chunk_size = int(arguments[2])
+        if arguments[1] == "-":
+            # standard input can't be read twice, so copy it to disk first
+            with tempfile.TemporaryFile("w+") as copy:
+                shutil.copyfileobj(sys.stdin, copy)
+                copy.seek(0)
+                shuffle_file(copy, sys.stdout, chunk_size)
+        else:
+            with open(arguments[1], "r") as file:
+                shuffle_file(file, sys.stdout, chunk_size)
+    else:
+        rearrange(arguments)
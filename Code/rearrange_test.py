@@ -0,0 +1,70 @@
+#!python
+
+import rearrange
+import io
+import unittest
+# Python 2 and 3 compatibility: unittest module renamed this assertion method
+if not hasattr(unittest.TestCase, 'assertCountEqual'):
+    unittest.TestCase.assertCountEqual = unittest.TestCase.assertItemsEqual
+
+
+class RearrangeTest(unittest.TestCase):
+
+    # Test fixtures: words with repeats, spread over several lines
+    words = ['one', 'fish', 'two', 'fish', 'red', 'fish', 'blue', 'fish'] * 5
+
+    def shuffle_file(self, chunk_size):
+        in_file = io.StringIO('\n'.join(' '.join(self.words[i:i + 3])
+                                        for i in range(0, 40, 3)))
+        out_file = io.StringIO()
+        rearrange.shuffle_file(in_file, out_file, chunk_size)
+        output = out_file.getvalue()
+        assert output.endswith('\n')
+        return output.split()
+
+    def test_shuffle(self):
+        words = list(self.words)
+        rearrange.shuffle(words)
+        self.assertCountEqual(words, self.words)
+        # Every position can end up holding any word
+        firsts = set()
+        for _ in range(200):
+            words = ['a', 'b', 'c', 'd']
+            rearrange.shuffle(words)
+            firsts.add(words[0])
+        assert firsts == {'a', 'b', 'c', 'd'}
+
+    def test_shuffle_empty(self):
+        words = []
+        rearrange.shuffle(words)
+        assert words == []
+
+    def test_shuffle_file_in_memory(self):
+        self.assertCountEqual(self.shuffle_file(100), self.words)
+
+    def test_shuffle_file_buckets(self):
+        # 40 words, 8 at a time, goes through temporary bucket files
+        for _ in range(10):
+            self.assertCountEqual(self.shuffle_file(8), self.words)
+
+    def test_shuffle_file_max_buckets(self):
+        # Buckets still too big with only 2 of them are split again
+        max_buckets = rearrange.MAX_BUCKETS
+        rearrange.MAX_BUCKETS = 2
+        try:
+            for chunk_size in (1, 3):
+                self.assertCountEqual(self.shuffle_file(chunk_size),
+                                      self.words)
+        finally:
+            rearrange.MAX_BUCKETS = max_buckets
+        with self.assertRaises(ValueError):
+            self.shuffle_file(0)
+
+    def test_shuffle_file_empty(self):
+        out_file = io.StringIO()
+        rearrange.shuffle_file(io.StringIO(''), out_file, 1)
+        assert out_file.getvalue() == '\n'
+
+
+if __name__ == '__main__':
+    unittest.main()
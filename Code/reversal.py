@@ -1,4 +1,10 @@
+import os
+import shutil
 import sys
+import tempfile
+
+# number of bytes read from a file at a time
+BLOCK_SIZE = 64 * 1024
 
 
 def go_to_next_line():
@@ -22,34 +28,113 @@ def reverse(input):
     """
     # if input_str is a sentence, then outputs words in sentence in reverse
     if decide_if_sentence(input) is True:
-        sentence = list()
-        for word in input:
-            sentence.append(word)
-
-        # output reverse sentence
-        sentence_length = len(sentence)
-        for i in range(sentence_length):
-            last_word_index = sentence_length - (i + 1)
-            last_word = sentence[last_word_index]
-            print(last_word, end=" ")
-
+        print(" ".join(reversed(input)), end="")
         go_to_next_line()
 
     # if input_str is a single word, then outputs letters in reverse
     else:
-        word = list()
-        for letter in input[0]:
-            word.append(letter)
+        print(input[0][::-1], end="")
+        go_to_next_line()
 
-        # output word in reverse
-        word_length = len(word)
-        for i in range(word_length):
-            letter_from_end_index = i + 1
-            letter_from_end = word[word_length - letter_from_end_index]
-            print(letter_from_end, end="")
 
-        go_to_next_line()
+def read_blocks_backwards(file, block_size=BLOCK_SIZE):
+    """Generate the contents of a seekable binary file in blocks of bytes,
+       starting with the block at the end of the file.
+       Param: file(file object opened in "rb" mode)
+              block_size(int): most bytes in one block
+    """
+    file.seek(0, os.SEEK_END)
+    position = file.tell()
+    while position > 0:
+        size = min(block_size, position)
+        position -= size
+        file.seek(position)
+        yield file.read(size)
+
+
+def is_continuation_byte(byte):
+    """Return True if the byte is in the middle of a UTF-8 character."""
+    return byte & 0xC0 == 0x80
+
+
+def reverse_characters(in_file, out_file, block_size=BLOCK_SIZE):
+    """Write the text of in_file to out_file with its characters in reverse
+       order, using memory for only one block at a time.
+       Multi-byte UTF-8 characters are kept whole: the bytes at the start of
+       a block that continue a character from the block before it are held
+       back until that block has been read.
+       Param: in_file(file object opened in "rb" mode)
+              out_file(file object opened in "wb" mode)
+              block_size(int)
+    """
+    # bytes from the start of the last block, to join to the next block
+    carry = b""
+    for block in read_blocks_backwards(in_file, block_size):
+        block += carry
+        # a UTF-8 character is at most 4 bytes, 3 of them continuation bytes
+        start = 0
+        while (start < min(3, len(block))
+               and is_continuation_byte(block[start]) is True):
+            start += 1
+        carry = block[:start]
+        text = block[start:].decode("utf-8", "replace")
+        out_file.write(text[::-1].encode("utf-8"))
+    if len(carry) > 0:
+        out_file.write(carry.decode("utf-8", "replace")[::-1].encode("utf-8"))
+
+
+def reverse_words(in_file, out_file, block_size=BLOCK_SIZE):
+    """Write the words of in_file to out_file in reverse order, separated by
+       single spaces, using memory for only one block at a time (plus the
+       longest word). Whitespace bytes never appear inside a multi-byte UTF-8
+       character, so the bytes can be split into words without decoding.
+       Param: in_file(file object opened in "rb" mode)
+              out_file(file object opened in "wb" mode)
+              block_size(int)
+    """
+    # the start of a word that may continue into the block before
+    carry = b""
+    separator = b""
+    for block in read_blocks_backwards(in_file, block_size):
+        block += carry
+        words = block.split()
+        carry = b""
+        if len(words) > 0 and not block[:1].isspace():
+            # the first word might not be whole yet
+            carry = words.pop(0)
+        if len(words) > 0:
+            out_file.write(separator + b" ".join(reversed(words)))
+            separator = b" "
+    if len(carry) > 0:
+        out_file.write(separator + carry)
+    out_file.write(b"\n")
+
+
+def reverse_file(file_name, characters=False):
+    """Print the words (or characters) of a file in reverse order.
+       Param: file_name(str): path to the file, or "-" for standard input
+              characters(bool): reverse characters instead of words
+    """
+    reverse_stream = reverse_words
+    if characters is True:
+        reverse_stream = reverse_characters
+    out_file = sys.stdout.buffer
+    if file_name == "-":
+        # standard input can't seek, so copy it to a file first (kept in
+        # memory until it gets bigger than a few blocks)
+        with tempfile.SpooledTemporaryFile(max_size=16 * BLOCK_SIZE) as copy:
+            shutil.copyfileobj(sys.stdin.buffer, copy, BLOCK_SIZE)
+            reverse_stream(copy, out_file)
+    else:
+        with open(file_name, "rb") as in_file:
+            reverse_stream(in_file, out_file)
+    out_file.flush()
 
 
 if __name__ == "__main__":
-    reverse(sys.argv[1:])
+    arguments = sys.argv[1:]
+    if len(arguments) >= 2 and arguments[0] == "--file":
+        # reverse a file of any size, e.g. --file book.txt --chars
+        reverse_file(arguments[1], "--chars" in arguments[2:])
+    else:
+        reverse(arguments)
@@ -0,0 +1,49 @@
+#!python
+
+import reversal
+import io
+import unittest
+
+
+class ReversalTest(unittest.TestCase):
+
+    # Test fixtures: text with 1, 2, 3 and 4 byte UTF-8 characters, runs of
+    # whitespace and a word longer than the smallest blocks
+    text = 'héllo  wörld\n€uro 😀 naïve\tcafé extraordinarily end'
+
+    def reverse(self, function, text, block_size):
+        out_file = io.BytesIO()
+        function(io.BytesIO(text.encode('utf-8')), out_file, block_size)
+        return out_file.getvalue().decode('utf-8')
+
+    def test_read_blocks_backwards(self):
+        blocks = list(reversal.read_blocks_backwards(io.BytesIO(b'abcdefg'),
+                                                     3))
+        assert blocks == [b'efg', b'bcd', b'a']
+        assert list(reversal.read_blocks_backwards(io.BytesIO(b''))) == []
+
+    def test_reverse_characters(self):
+        # Characters split between blocks are put back together, whatever
+        # the block size
+        for block_size in range(1, 8):
+            assert (self.reverse(reversal.reverse_characters, self.text,
+                                 block_size) == self.text[::-1])
+        assert self.reverse(reversal.reverse_characters, self.text,
+                            reversal.BLOCK_SIZE) == self.text[::-1]
+        assert self.reverse(reversal.reverse_characters, '', 3) == ''
+
+    def test_reverse_words(self):
+        expected = ' '.join(reversed(self.text.split())) + '\n'
+        # Words split between blocks are put back together, whatever the
+        # block size
+        for block_size in range(1, 8):
+            assert (self.reverse(reversal.reverse_words, self.text,
+                                 block_size) == expected)
+        assert self.reverse(reversal.reverse_words, self.text,
+                            reversal.BLOCK_SIZE) == expected
+        assert self.reverse(reversal.reverse_words, '  \n ', 2) == '\n'
+        assert self.reverse(reversal.reverse_words, ' one ', 2) == 'one\n'
+
+
+if __name__ == '__main__':
+    unittest.main()
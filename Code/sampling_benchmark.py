@@ -0,0 +1,223 @@
+#!python
+"""Benchmark for the weighted samplers: how fast they draw, and how well
+their draws fit the histogram they're drawn from.
+
+For each sampler, a number of words are drawn from the same histogram. The
+draws per second are timed, and a chi-squared goodness-of-fit test checks
+the counts drawn against the counts expected from the histogram, with the
+words expected fewer than 5 times pooled into one bin. Results are
+printed as JSON, and the exit status is 1 if any sampler fails the fit test
+or (given a baseline file from an earlier run) is slower than the baseline
+by more than the tolerance, so one run catches both kinds of regression.
+
+Usage: python sampling_benchmark.py [--draws N] [--text FILE] [--alpha A]
+                                    [--baseline FILE] [--tolerance T]
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import time
+# the histograms for the tweet generator live in its folder
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             'tweet_gen_app'))
+from listogram import Listogram  # noqa: E402
+from sampling_listogram import weighted_sample  # noqa: E402
+from stochastic_sampling import stochastic_sample  # noqa: E402
+from dictogram import Dictogram  # noqa: E402
+from arraygram import Arraygram  # noqa: E402
+from sketchogram import Sketchogram  # noqa: E402
+
+# default text to sample from, a long repetitive sentence
+WOODCHUCK_TEXT = ('how much wood would a wood chuck chuck'
+                  ' if a wood chuck could chuck wood')
+
+
+def make_samplers(words):
+    """Return a dict of each sampler's name to a tuple of a function with no
+       parameters which draws one word, and the histogram (a Dictogram) its
+       draws should follow. Every sampler but the Sketchogram's samples the
+       exact counts of the words; the Sketchogram samples its estimates,
+       which are over the true counts by up to its error bound, so its fit
+       is checked against those.
+    """
+    counts = Dictogram(words)
+    listogram = Listogram(words)
+    arraygram = Arraygram(words)
+    sketchogram = Sketchogram(words, top_k=counts.types)
+    estimates = Dictogram.from_counts(sketchogram.heavy_hitters)
+    plain_dict = dict(counts)
+    return {
+        'stochastic_sample': (lambda: stochastic_sample(plain_dict), counts),
+        'weighted_sample': (lambda: weighted_sample(listogram), counts),
+        'Dictogram.sample': (counts.sample, counts),
+        'Listogram.sample': (listogram.sample, counts),
+        'Arraygram.sample': (arraygram.sample, counts),
+        'Sketchogram.sample': (sketchogram.sample, estimates)
+    }
+
+
+def regularized_gamma_q(a, x):
+    """Return the regularized upper incomplete gamma function Q(a, x), by its
+       power series when x < a + 1 and by its continued fraction otherwise
+       (as in Numerical Recipes, section 6.2).
+    """
+    if x <= 0:
+        return 1.0
+    # the factor in front of both the series and the continued fraction
+    front = math.exp(-x + a * math.log(x) - math.lgamma(a))
+    if x < a + 1:
+        term = total = 1.0 / a
+        denominator = a
+        for _ in range(1000):
+            denominator += 1
+            term *= x / denominator
+            total += term
+            if abs(term) < abs(total) * 1e-15:
+                break
+        return 1.0 - total * front
+    # modified Lentz's method for the continued fraction
+    tiny = 1e-300
+    b = x + 1 - a
+    c = 1 / tiny
+    d = 1 / b
+    fraction = d
+    for i in range(1, 1000):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = tiny if abs(d) < tiny else d
+        c = b + an / c
+        c = tiny if abs(c) < tiny else c
+        d = 1 / d
+        fraction *= d * c
+        if abs(d * c - 1) < 1e-15:
+            break
+    return front * fraction
+
+
+def chi_squared_test(observed, expected):
+    """Return a tuple of (chi-squared statistic, degrees of freedom, p-value)
+       for observed counts against expected counts, in matching order.
+       The test is only reliable when each expected count is at least 5.
+    """
+    statistic = sum((seen - wanted) ** 2 / wanted
+                    for seen, wanted in zip(observed, expected))
+    degrees_of_freedom = len(expected) - 1
+    p_value = regularized_gamma_q(degrees_of_freedom / 2, statistic / 2)
+    return (statistic, degrees_of_freedom, p_value)
+
+
+def pool_bins(observed, expected, min_expected=5):
+    """Return the observed and expected counts with every bin expected to
+       hold fewer than min_expected pooled into one tail bin, so the
+       chi-squared test stays reliable over a long tail of rare words. If
+       the tail itself is still expected to hold too few, it's pooled
+       into the smallest bin kept.
+       Return: tuple of (observed(list), expected(list))
+    """
+    pooled_observed = list()
+    pooled_expected = list()
+    tail_observed = tail_expected = 0
+    for seen, wanted in sorted(zip(observed, expected),
+                               key=lambda pair: pair[1], reverse=True):
+        if wanted >= min_expected:
+            pooled_observed.append(seen)
+            pooled_expected.append(wanted)
+        else:
+            tail_observed += seen
+            tail_expected += wanted
+    if tail_expected >= min_expected or len(pooled_expected) == 0:
+        pooled_observed.append(tail_observed)
+        pooled_expected.append(tail_expected)
+    elif tail_expected > 0:
+        pooled_observed[-1] += tail_observed
+        pooled_expected[-1] += tail_expected
+    return (pooled_observed, pooled_expected)
+
+
+def benchmark_sampler(sample, histogram, draws):
+    """Draw from a sampler, and return a dict of its throughput and its
+       goodness of fit to the histogram.
+       Params: sample(function): draws one word
+               histogram(Dictogram): counts the draws should follow
+               draws(int): number of words to draw
+    """
+    start = time.perf_counter()
+    samples = [sample() for _ in range(draws)]
+    seconds = time.perf_counter() - start
+    drawn = Dictogram(samples)
+    words = list(histogram)
+    observed = [drawn.frequency(word) for word in words]
+    expected = [draws * histogram[word] / histogram.tokens for word in words]
+    statistic, degrees_of_freedom, p_value = chi_squared_test(
+        *pool_bins(observed, expected))
+    return {
+        'draws_per_second': draws / seconds,
+        'chi_squared': statistic,
+        'degrees_of_freedom': degrees_of_freedom,
+        'p_value': p_value,
+        'unknown_words': drawn.tokens - sum(observed)
+    }
+
+
+def run_benchmark(words, draws, alpha, baseline=None, tolerance=0.2):
+    """Benchmark every sampler on a histogram of the words.
+       A sampler passes if its draws fit the histogram (p-value at least
+       alpha, and no words drawn that aren't in the histogram), and if it
+       is no slower than tolerance below its draws per second in baseline.
+       Return: report(dict), ready to be written out as JSON
+    """
+    histogram = Dictogram(words)
+    results = dict()
+    for name, (sample, expected) in make_samplers(words).items():
+        result = benchmark_sampler(sample, expected, draws)
+        result['accurate'] = (result['p_value'] >= alpha
+                              and result['unknown_words'] == 0)
+        result['fast_enough'] = True
+        if baseline is not None and name in baseline['samplers']:
+            before = baseline['samplers'][name]['draws_per_second']
+            result['baseline_draws_per_second'] = before
+            result['fast_enough'] = (result['draws_per_second']
+                                     >= before * (1 - tolerance))
+        result['passed'] = result['accurate'] and result['fast_enough']
+        results[name] = result
+    return {
+        'draws': draws,
+        'types': histogram.types,
+        'tokens': histogram.tokens,
+        'alpha': alpha,
+        'samplers': results,
+        'passed': all(result['passed'] for result in results.values())
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--draws', type=int, default=10000,
+                        help='words to draw from each sampler')
+    parser.add_argument('--text', help='text file to build the histogram of')
+    parser.add_argument('--alpha', type=float, default=0.001,
+                        help='lowest p-value for the fit test to pass')
+    parser.add_argument('--baseline', help='JSON report of an earlier run')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='fraction slower than the baseline allowed')
+    arguments = parser.parse_args()
+    if arguments.text is not None:
+        with open(arguments.text, 'r') as file:
+            words = file.read().split()
+    else:
+        words = WOODCHUCK_TEXT.split()
+    baseline = None
+    if arguments.baseline is not None:
+        with open(arguments.baseline, 'r') as file:
+            baseline = json.load(file)
+    report = run_benchmark(words, arguments.draws, arguments.alpha,
+                           baseline, arguments.tolerance)
+    print(json.dumps(report, indent=2))
+    sys.exit(0 if report['passed'] else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+#!python
+
+from sampling_benchmark import (regularized_gamma_q, chi_squared_test,
+                                pool_bins)
+import math
+import unittest
+
+
+class SamplingBenchmarkTest(unittest.TestCase):
+
+    # Test fixtures: points on both sides of a + 1, where the power series
+    # gives way to the continued fraction
+    points = [0.01, 0.1, 0.5, 1, 1.4, 2, 5, 10, 30, 100]
+
+    def assert_close(self, value, expected):
+        # relative error, so tiny tail probabilities are checked too
+        assert abs(value - expected) <= 1e-12 * expected
+
+    def test_regularized_gamma_q(self):
+        for x in self.points:
+            # Closed forms: Q(1, x) = e^-x and Q(1/2, x) = erfc(sqrt(x))
+            self.assert_close(regularized_gamma_q(1, x), math.exp(-x))
+            self.assert_close(regularized_gamma_q(0.5, x),
+                              math.erfc(math.sqrt(x)))
+            # Q(2, x) = (1 + x) e^-x
+            self.assert_close(regularized_gamma_q(2, x),
+                              (1 + x) * math.exp(-x))
+        assert regularized_gamma_q(3, 0) == 1.0
+
+    def test_chi_squared_test(self):
+        statistic, degrees_of_freedom, p_value = chi_squared_test(
+            [10, 20, 30], [20, 20, 20])
+        assert statistic == 10
+        assert degrees_of_freedom == 2
+        # With 2 degrees of freedom, the p-value is e^(-statistic / 2)
+        self.assertAlmostEqual(p_value, math.exp(-5), places=12)
+        # Counts that match exactly fit perfectly
+        assert chi_squared_test([5, 5], [5, 5]) == (0, 1, 1.0)
+
+    def test_pool_bins(self):
+        # Bins expected to hold fewer than 5 are pooled into one at the end
+        observed, expected = pool_bins([1, 30, 2, 0, 9], [2, 25, 3, 1, 10])
+        assert expected == [25, 10, 6]
+        assert observed == [30, 9, 3]
+        # A tail that's still too small joins the smallest bin kept
+        observed, expected = pool_bins([1, 30, 9], [2, 25, 10])
+        assert expected == [25, 12]
+        assert observed == [30, 10]
+        # Nothing is lost when every bin is small
+        assert pool_bins([1, 2], [1, 2]) == ([3], [3])
+
+
+if __name__ == '__main__':
+    unittest.main()
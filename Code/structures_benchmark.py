@@ -0,0 +1,189 @@
+#!python
+"""Benchmark for the core data structures: checks that the running time of
+each operation grows with the size of the structure the way its docstring
+says it does.
+
+Each operation is timed on structures of 10, 100, 1,000, ... items, up to
+--max-size (100 to 10^6). A straight line is fitted to log(time) against
+log(size), leaving out size 10 where fixed overheads hide the growth; its
+slope is the measured growth exponent: about 0 for O(1) and O(log n), 1 for
+O(n), 2 for O(n^2). An operation is flagged when its slope is further than
+--tolerance from the exponent of its documented complexity. Results are
+printed as JSON, and the exit status is 1 if anything is flagged.
+
+Usage: python structures_benchmark.py [--max-size N] [--tolerance T]
+                                      [--only NAME]
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import timeit
+# the histograms for the tweet generator live in its folder
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             'tweet_gen_app'))
+from linkedlist import LinkedList  # noqa: E402
+from hashtable import HashTable  # noqa: E402
+from listogram import Listogram  # noqa: E402
+from dictogram import Dictogram  # noqa: E402
+from arraygram import Arraygram  # noqa: E402
+
+# growth exponent of each complexity class, as measured on a log-log plot
+EXPONENTS = {
+    'O(1)': 0,
+    'O(log n)': 0,
+    'O(k)': 0,
+    'O(n)': 1,
+    'O(n log n)': 1,
+    'O(n^2)': 2
+}
+# sizes each operation is timed at, up to its limit and --max-size
+SIZES = [10 ** power for power in range(1, 7)]
+
+
+def make_words(n):
+    """Return a list of n different words."""
+    return ['word{}'.format(i) for i in range(n)]
+
+
+def make_linkedlist(n):
+    """Return a LinkedList of the numbers from 0 to n - 1."""
+    return LinkedList(range(n))
+
+
+def make_hashtable(n):
+    """Return a HashTable of n keys. Building it takes O(n^2) time, since
+       HashTable.set is O(n), so this is only used for small sizes."""
+    table = HashTable()
+    for key in make_words(n):
+        table.set(key, 1)
+    return table
+
+
+# Each case is (name, documented complexity, largest size to time it at,
+# function to build a structure of size n, function to make the operation
+# to time on that structure). The complexities are from the docstrings;
+# HashTable's O(l) is O(n), since it never adds buckets.
+CASES = [
+    ('LinkedList.length', 'O(1)', 10 ** 6, make_linkedlist,
+     lambda items, n: items.length),
+    ('LinkedList.append', 'O(1)', 10 ** 6, make_linkedlist,
+     lambda items, n: lambda: items.append(n)),
+    ('LinkedList.prepend', 'O(1)', 10 ** 6, make_linkedlist,
+     lambda items, n: lambda: items.prepend(n)),
+    ('LinkedList.find (missing item)', 'O(n)', 10 ** 6, make_linkedlist,
+     lambda items, n: lambda: items.find(lambda item: item == -1)),
+    ('LinkedList.items', 'O(n)', 10 ** 6, make_linkedlist,
+     lambda items, n: items.items),
+    ('HashTable.length', 'O(1)', 10 ** 4, make_hashtable,
+     lambda table, n: table.length),
+    ('HashTable.get', 'O(n)', 10 ** 4, make_hashtable,
+     lambda table, n: lambda: table.get('word0')),
+    ('HashTable.set (existing key)', 'O(n)', 10 ** 4, make_hashtable,
+     lambda table, n: lambda: table.set('word0', 2)),
+    ('Listogram.add_count', 'O(1)', 10 ** 6,
+     lambda n: Listogram(make_words(n)),
+     lambda histogram, n: lambda: histogram.add_count('word0')),
+    ('Listogram.frequency', 'O(1)', 10 ** 6,
+     lambda n: Listogram(make_words(n)),
+     lambda histogram, n: lambda: histogram.frequency('word0')),
+    ('Listogram.sample', 'O(n)', 10 ** 5,
+     lambda n: Listogram(make_words(n)),
+     lambda histogram, n: histogram.sample),
+    ('Dictogram.add_count', 'O(1)', 10 ** 6,
+     lambda n: Dictogram(make_words(n)),
+     lambda histogram, n: lambda: histogram.add_count('word0')),
+    ('Dictogram.frequency', 'O(1)', 10 ** 6,
+     lambda n: Dictogram(make_words(n)),
+     lambda histogram, n: lambda: histogram.frequency('word0')),
+    ('Dictogram.sample', 'O(n)', 10 ** 5,
+     lambda n: Dictogram(make_words(n)),
+     lambda histogram, n: histogram.sample),
+    ('Dictogram.most_common(10) (rank index)', 'O(k)', 10 ** 6,
+     lambda n: Dictogram(make_words(n), rank_index=True),
+     lambda histogram, n: lambda: histogram.most_common(10)),
+    ('Arraygram.frequency', 'O(log n)', 10 ** 6,
+     lambda n: Arraygram(make_words(n)),
+     lambda histogram, n: lambda: histogram.frequency('word0')),
+    ('Arraygram.sample', 'O(log n)', 10 ** 6,
+     lambda n: Arraygram(make_words(n)),
+     lambda histogram, n: histogram.sample)
+]
+
+
+def time_operation(operation, min_seconds=0.02):
+    """Return the seconds one call of operation takes, as the best of 3
+       timings of enough calls in a row to take at least min_seconds."""
+    number = 1
+    while True:
+        seconds = min(timeit.repeat(operation, number=number, repeat=3))
+        if seconds >= min_seconds or number >= 10 ** 5:
+            return seconds / number
+        number *= 10
+
+
+def fit_exponent(sizes, seconds):
+    """Return the slope of the least-squares line through the points
+       (log(size), log(seconds)): the measured growth exponent."""
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(time) for time in seconds]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    variance = sum((x - mean_x) ** 2 for x in xs)
+    return covariance / variance
+
+
+def benchmark_case(case, max_size, tolerance):
+    """Time one operation at every size, and return a dict of the timings,
+       the fitted exponent, and whether it contradicts the documentation."""
+    name, complexity, limit, build, make_operation = case
+    sizes = [size for size in SIZES if size <= min(limit, max_size)]
+    seconds = list()
+    for size in sizes:
+        structure = build(size)
+        seconds.append(time_operation(make_operation(structure, size)))
+    # fixed costs swamp the growth at the smallest size, so fit without it
+    skip = 1 if len(sizes) > 2 else 0
+    # a line can't be fitted through fewer than two sizes
+    exponent = None
+    if len(sizes) - skip >= 2:
+        exponent = fit_exponent(sizes[skip:], seconds[skip:])
+    expected = EXPONENTS[complexity]
+    return {
+        'operation': name,
+        'documented': complexity,
+        'sizes': sizes,
+        'seconds_per_call': seconds,
+        'measured_exponent': exponent,
+        'expected_exponent': expected,
+        'contradicts_docs': (exponent is not None
+                             and abs(exponent - expected) > tolerance)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--max-size', type=int, default=10 ** 5,
+                        help='largest structure to time (up to 10^6)')
+    parser.add_argument('--tolerance', type=float, default=0.35,
+                        help='how far the fitted exponent may be off')
+    parser.add_argument('--only', help='only time operations containing this')
+    arguments = parser.parse_args()
+    if arguments.max_size < SIZES[1]:
+        parser.error('--max-size must be at least {} to time two sizes'
+                     .format(SIZES[1]))
+    results = list()
+    for case in CASES:
+        if arguments.only is None or arguments.only in case[0]:
+            results.append(benchmark_case(case, arguments.max_size,
+                                          arguments.tolerance))
+    flagged = [result['operation'] for result in results
+               if result['contradicts_docs'] is True]
+    print(json.dumps({'results': results, 'flagged': flagged}, indent=2))
+    sys.exit(1 if len(flagged) > 0 else 0)
+
+
+if __name__ == '__main__':
+    main()
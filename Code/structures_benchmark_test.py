@@ -0,0 +1,31 @@
+#!python
+
+from structures_benchmark import CASES, benchmark_case, fit_exponent
+import unittest
+
+
+class StructuresBenchmarkTest(unittest.TestCase):
+
+    def test_fit_exponent(self):
+        sizes = [10, 100, 1000]
+        # time growing as n^2 and as a constant
+        self.assertAlmostEqual(fit_exponent(sizes, [1, 100, 10000]), 2)
+        self.assertAlmostEqual(fit_exponent(sizes, [5, 5, 5]), 0)
+
+    def test_benchmark_case(self):
+        # every case runs at a tiny size, fitted through sizes 10 and 100
+        for case in CASES:
+            result = benchmark_case(case, 100, 0.35)
+            assert result['operation'] == case[0]
+            assert result['sizes'] == [10, 100]
+            assert len(result['seconds_per_call']) == 2
+            assert result['measured_exponent'] is not None
+            assert result['contradicts_docs'] in (True, False)
+        # with only one size, there is no line to fit
+        result = benchmark_case(CASES[0], 10, 0.35)
+        assert result['measured_exponent'] is None
+        assert result['contradicts_docs'] is False
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,4 @@
-from flask import Flask, render_template, redirect, url_for, request
+from flask import Flask, render_template, redirect, url_for, request, Response
 from dictogram import Dictogram
 from stochastic_sampling import stochastic_sample
 from clean_words import get_clean_words
@@ -6,6 +6,8 @@ from higher_order import HigherMarkovChain
 from pymongo import MongoClient
 import os
 import twitter
+import metrics
+from metrics import timed
 
 # Flask app for tweet generator
 app = Flask(__name__)
@@ -17,6 +19,8 @@ host = os.environ.get('MONGODB_URI', 'mongodb://localhost:27017/Tweets')
 client = MongoClient(host=f'{host}?retryWrites=false')
 db = client.get_default_database()
 favorites = db.favorites
+# number of favorites to show on one page
+FAVORITES_PER_PAGE = 50
 
 
 def get_words(num_words):
@@ -26,7 +30,10 @@ def get_words(num_words):
 
     """
     # sentence tp be displayed
-    words = mark.random_walk(num_words)
+    with timed('random_walk'):
+        words = mark.random_walk(num_words)
+    metrics.sentences.inc()
+    metrics.words_generated.inc(amount=len(words.split()))
     # capitalize first letter of starting word, remove space after last word
     first_letter = words[0].upper()
     words = first_letter + words[1:len(words) - 1]
@@ -40,8 +47,10 @@ def index():
     num = request.form.get('num')
     if num == '' or num is None:
         num = 10
-    words = get_words(int(num))
-    return render_template("index.html", words=words)
+    with timed('get_words'):
+        words = get_words(int(num))
+    with timed('render_template'):
+        return render_template("index.html", words=words)
     # user has inputted a number of words to generate
     if request.method == 'POST':
         return redirect(url_for('index'))
@@ -54,23 +63,50 @@ def add_to_favorites():
     sentence = {
         'tweet_phrase': words
     }
-    favorites.insert_one(sentence)
+    with timed('mongo_insert'):
+        favorites.insert_one(sentence)
+    metrics.favorites_added.inc()
     return redirect(url_for('index'))
 
 
 @app.route("/favorites/")
 def show_favorites():
-    '''List all Tweets marked as favorites by the users.'''
-    return render_template("favorites.html", favorites=favorites.find())
+    '''List one page of the Tweets marked as favorites by the users.'''
+    page = max(request.args.get('page', 1, type=int), 1)
+    # read one page, plus one more to know if there is a next page, so the
+    # query is timed apart from the template without loading everything
+    with timed('mongo_find'):
+        page_favorites = list(favorites.find(
+            skip=(page - 1) * FAVORITES_PER_PAGE,
+            limit=FAVORITES_PER_PAGE + 1))
+    has_next = len(page_favorites) > FAVORITES_PER_PAGE
+    with timed('render_template'):
+        return render_template("favorites.html",
+                               favorites=page_favorites[:FAVORITES_PER_PAGE],
+                               page=page, has_next=has_next)
 
 
 @app.route("/tweet/", methods=['POST'])
 def tweet():
     '''Posts a status update to the @AdamChain Twitter account.'''
     status_update = request.form.get('sentence')
-    twitter.tweet(status_update)
+    with timed('twitter'):
+        twitter.tweet(status_update)
+    metrics.tweets_sent.inc()
     return redirect(url_for('index'))
 
 
+@app.route("/metrics")
+def show_metrics():
+    '''Show the counters and stage latencies in the Prometheus format.
+       Each process keeps its own metrics, labelled with its pid, so under
+       gunicorn with several workers one scrape only sees the worker that
+       answered it: add up the series of every pid over several scrapes,
+       or run one worker, to see all of the traffic.
+    '''
+    return Response(metrics.registry.render(),
+                    mimetype='text/plain; version=0.0.4')
+
+
 if __name__ == "__main__":
     app.run(debug=True, host='0.0.0.0', port=os.environ.get('PORT', 5000))
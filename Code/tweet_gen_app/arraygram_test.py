@@ -0,0 +1,91 @@
+#!python
+
+from arraygram import Arraygram
+from dictogram import Dictogram
+import tracemalloc
+import unittest
+# Python 2 and 3 compatibility: unittest module renamed this assertion method
+if not hasattr(unittest.TestCase, 'assertCountEqual'):
+    unittest.TestCase.assertCountEqual = unittest.TestCase.assertItemsEqual
+
+
+class ArraygramTest(unittest.TestCase):
+
+    # Test fixtures: known inputs and their expected results
+    fish_words = ['one', 'fish', 'two', 'fish', 'red', 'fish', 'blue', 'fish']
+    fish_list = [('one', 1), ('fish', 4), ('two', 1), ('red', 1), ('blue', 1)]
+
+    def test_entries(self):
+        histogram = Arraygram(self.fish_words)
+        assert len(histogram) == 5
+        # Words are kept in sorted order
+        assert histogram.items() == sorted(self.fish_list)
+        assert list(histogram) == sorted(word for word, _ in self.fish_list)
+
+    def test_contains(self):
+        histogram = Arraygram(self.fish_words)
+        for word in self.fish_words:
+            assert word in histogram
+        for word in ('fishy', 'food'):
+            assert word not in histogram
+
+    def test_add_count_and_frequency(self):
+        histogram = Arraygram(self.fish_words)
+        histogram.add_count('two', 2)
+        histogram.add_count('fish', 4)
+        histogram.add_count('food', 5)
+        assert histogram.frequency('one') == 1
+        assert histogram.frequency('two') == 3
+        assert histogram.frequency('fish') == 8
+        assert histogram.frequency('food') == 5
+        assert histogram.frequency('fishy') == 0
+        assert histogram.types == 6
+        # New words are inserted in their sorted place
+        assert list(histogram) == ['blue', 'fish', 'food', 'one', 'red',
+                                   'two']
+        assert histogram.tokens == 8 + 11
+        assert histogram.total() == histogram.tokens
+
+    def test_normalized(self):
+        histogram = Arraygram(self.fish_words)
+        probabilities = list(histogram.normalized())
+        # blue, fish, one, red, two
+        assert probabilities == [0.125, 0.5, 0.125, 0.125, 0.125]
+
+    def test_sample(self):
+        histogram = Arraygram(self.fish_words)
+        samples_hist = Arraygram([histogram.sample() for _ in range(10000)])
+        for word, count in histogram.items():
+            observed_freq = count / histogram.tokens
+            sampled_freq = samples_hist.frequency(word) / samples_hist.tokens
+            assert observed_freq * 0.9 <= sampled_freq <= observed_freq * 1.1
+        # Sampling again after adding counts should use the new counts
+        histogram.add_count('food', 1000)
+        samples = [histogram.sample() for _ in range(100)]
+        assert samples.count('food') > 50
+
+    def test_memory(self):
+        words = ['word{}'.format(i) for i in range(10000)]
+
+        def traced_bytes(make_histogram):
+            tracemalloc.start()
+            histogram = make_histogram()
+            size = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            assert histogram.types == len(words)
+            return size
+
+        def large_counts(histogram):
+            for word in words:
+                histogram.add_count(word, 1000)
+            return histogram
+        # Counts of 1 are shared small ints in a Dictogram, larger counts
+        # each take an int object
+        assert (traced_bytes(lambda: Arraygram(words))
+                < traced_bytes(lambda: Dictogram(words)))
+        assert (traced_bytes(lambda: large_counts(Arraygram(words))) * 2
+                < traced_bytes(lambda: large_counts(Dictogram(words))))
+
+
+if __name__ == '__main__':
+    unittest.main()
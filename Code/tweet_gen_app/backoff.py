@@ -0,0 +1,117 @@
+from higher_order import HigherMarkovChain
+import random
+import sys
+
+# how much a lower order score counts for, compared to the order above it
+BACKOFF_FACTOR = 0.4
+
+
+class BackoffMarkovChain(HigherMarkovChain):
+    def __init__(self, words_list=None, order=2, sentence_markers=False,
+                 min_count=1, max_successors=None):
+        """A Markov Chain which uses every order from 1 up to order, all
+           held in the chain's CompactContextTrie. When the words generated
+           last never had a successor in the corpus, it backs off to the
+           longest shorter context which did, so generation never gets
+           stuck.
+
+           Parameters:
+           words_list(list): a list of str representing the corpus text
+           order(int): the most word types held in a state
+           sentence_markers(bool): mark sentences in the default corpus
+           min_count(int): prune transitions seen fewer times than this
+           max_successors(int): prune all but this many successors of each
+                                state of the highest order
+
+        """
+        super().__init__(words_list, order, sentence_markers, min_count,
+                         max_successors)
+
+    def populate_chain(self, min_count=None, max_successors=None):
+        """Construct the chain, keeping it as the trie of contexts of every
+           order.
+
+        """
+        self.trie = super().populate_chain(min_count, max_successors)
+        return self.trie
+
+    def next_word(self, history):
+        """Return a word sampled from the successors of the longest context
+           ending the history that has any.
+
+           Parameters:
+           history(list): the words generated so far
+
+           Returns:
+           str: the word to come next
+
+        """
+        context, node = self.trie.longest_context(history)
+        counts = self.trie.node_successors(node)
+        words = list(counts)
+        weights = [counts[word] for word in words]
+        return random.choices(words, weights)[0]
+
+    def next_state(self, state):
+        """Return the state after the given one, backing off to a shorter
+           context if nothing came after the state, so it's never None.
+
+        """
+        return tuple(state[1:]) + (self.next_word(list(state)),)
+
+    def generate_sentence(self, length):
+        """Generate a sentence of the given number of words, starting from
+           a random state of the highest order, and backing off to lower
+           orders wherever the highest order has no successors.
+
+        """
+        words = list(self.random_state())[:length]
+        while len(words) < length:
+            words.append(self.next_word(words))
+        return " ".join(str(word) for word in words) + " "
+
+    def random_walk(self, length=10):
+        """Generate a sentence by randomly transitioning between states.
+
+           Parameters:
+           length(int): number of words to be generated
+
+           Returns:
+           str: a sequence of word tokens originally from the corpus
+
+        """
+        return self.generate_sentence(length)
+
+    def stupid_backoff(self, context, word):
+        """Return the stupid backoff score of a word following a context:
+           its relative frequency after the context if it ever followed it,
+           and otherwise BACKOFF_FACTOR times its score after the context
+           without its first word, down to its frequency in the corpus.
+           Scores aren't normalized to add up to 1, but rank words like
+           probabilities do, for very little work.
+
+           Parameters:
+           context(tuple): the words that came before, at most order of them
+           word(str): the word to score
+
+           Returns:
+           float: the score, 0 only for a word not in the corpus
+
+        """
+        context = tuple(context)[-self.order:]
+        factor = 1.0
+        while True:
+            counts = self.trie.successors(context)
+            if word in counts:
+                return factor * counts[word] / sum(counts.values())
+            if len(context) == 0:
+                return 0.0
+            context = context[1:]
+            factor *= BACKOFF_FACTOR
+
+
+if __name__ == "__main__":
+    order = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    mark = BackoffMarkovChain(order=order)
+    print(mark.trie.order_sizes())
+    print(mark.random_walk(20))
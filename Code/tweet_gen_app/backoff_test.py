@@ -0,0 +1,38 @@
+from backoff import BackoffMarkovChain, BACKOFF_FACTOR
+import unittest
+
+
+class BackoffMarkovChainTest(unittest.TestCase):
+    left_right_list = ['I', 'went', 'left', 'you', 'went', 'right',
+                       'I', 'went', 'left', 'I', 'went', 'right']
+
+    def test_random_walk(self):
+        '''Each word follows the longest context that has successors.'''
+        mark = BackoffMarkovChain(self.left_right_list, 3)
+        for _ in range(20):
+            sentence = mark.random_walk(15).split()
+            assert len(sentence) == 15
+            for i in range(3, len(sentence)):
+                context, node = mark.trie.longest_context(sentence[:i])
+                assert sentence[i] in mark.trie.successors(context)
+
+    def test_never_stuck(self):
+        '''A corpus whose last state has no successors still generates.'''
+        mark = BackoffMarkovChain(['a', 'b', 'c', 'd'], 2)
+        for _ in range(10):
+            assert len(mark.random_walk(10).split()) == 10
+
+    def test_stupid_backoff(self):
+        mark = BackoffMarkovChain(self.left_right_list, 2)
+        assert mark.stupid_backoff(('I', 'went'), 'left') == 2 / 3
+        # "left" never followed "you went", but followed "went" 2 of 4 times
+        assert mark.stupid_backoff(('you', 'went'), 'left') == (
+            BACKOFF_FACTOR * 2 / 4)
+        # "you" never followed "went" at all, and is 1 of 12 words
+        assert mark.stupid_backoff(('I', 'went'), 'you') == (
+            BACKOFF_FACTOR ** 2 / 12)
+        assert mark.stupid_backoff(('I', 'went'), 'up') == 0
+
+
+if __name__ == "__main__":
+    unittest.main()
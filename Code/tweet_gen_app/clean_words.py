@@ -1,6 +1,13 @@
 import sys
 import re
 
+# tokens marking the start and end of each sentence
+START = '<s>'
+END = '</s>'
+# marks ending a sentence, and closing marks that may come after them
+SENTENCE_ENDINGS = ('.', '?', '!')
+CLOSING_MARKS = '"\')]}'
+
 
 def parse_word(word):
     '''Given a str, returns a str cleaned of undesirable symbols.'''
@@ -17,9 +24,37 @@ def parse_word(word):
     return word
 
 
-def get_clean_words():
+def ends_sentence(word):
+    '''Return True if the word, before it's cleaned, ends a sentence.'''
+    return word.rstrip(CLOSING_MARKS).endswith(SENTENCE_ENDINGS)
+
+
+def add_sentence_markers(words, clean_words):
+    """Return a list of the clean words with START before each sentence and
+       END after it, where sentences end in the words before cleaning.
+        Param: words(list): the words before cleaning
+               clean_words(list): the same words after cleaning
+        Return: marked_words(list)
+    """
+    marked_words = list()
+    in_sentence = False
+    for word, clean_word in zip(words, clean_words):
+        if not in_sentence:
+            marked_words.append(START)
+            in_sentence = True
+        marked_words.append(clean_word)
+        if ends_sentence(word):
+            marked_words.append(END)
+            in_sentence = False
+    if in_sentence:
+        marked_words.append(END)
+    return marked_words
+
+
+def get_clean_words(sentence_markers=False):
     """Get a list of single-word strings from source text.
-        Param: file_name(str)
+        Param: sentence_markers(bool): if True, add START before each sentence
+                                       and END after it
         Return: clean_words_as_str(list)
     """
     words = []
@@ -39,6 +74,8 @@ def get_clean_words():
         whole_word = ""
         clean_words_as_str.append(whole_word.join(list_of_chars))
 
+    if sentence_markers is True:
+        return add_sentence_markers(words, clean_words_as_str)
     return clean_words_as_str
 
 
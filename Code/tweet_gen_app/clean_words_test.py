@@ -0,0 +1,17 @@
+from clean_words import add_sentence_markers, parse_word, START, END
+import unittest
+
+
+class CleanWordsTest(unittest.TestCase):
+    def test_add_sentence_markers(self):
+        words = 'One fish. Two fish? "Red fish!" Blue fish'.split()
+        clean_words = [parse_word(word.lower()) for word in words]
+        marked_words = add_sentence_markers(words, clean_words)
+        assert marked_words == [START, 'one', 'fish', END,
+                                START, 'two', 'fish', END,
+                                START, '"red', 'fish"', END,
+                                START, 'blue', 'fish', END]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,503 @@
+from array import array
+from bisect import bisect_left
+from itertools import accumulate
+import heapq
+from collections.abc import Mapping
+from dictogram import Dictogram
+import sys
+
+
+class ContextNode(object):
+    """A node in a ContextTrie: how many times the words on the path from
+       the root to this node appeared in a row in the corpus, and a child
+       node for each word that came after them.
+
+    """
+    __slots__ = ('count', 'children')
+
+    def __init__(self):
+        self.count = 0
+        self.children = None  # dict of word to ContextNode, once there are any
+
+
+class ContextTrie(Mapping):
+    def __init__(self, words_list=None, max_order=2):
+        """Store every run of 1 to max_order + 1 words in a corpus in a trie,
+           so the successors of contexts of every order from 1 to max_order
+           are kept in one structure. A run of words and the shorter runs
+           that start it share the same nodes, so adding lower orders costs
+           much less than building a separate chain for each order.
+
+           As a mapping, the trie acts like HigherMarkovChain.chain of order
+           max_order: each key is a state (a tuple of max_order words) which
+           has successors, and its value is a Dictogram counting the states
+           that came after it.
+
+           Parameters:
+           words_list(list): a list of str representing the corpus text
+           max_order(int): the most words held in a context
+
+        """
+        self.max_order = max_order
+        self.root = ContextNode()
+        self.num_states = None  # number of keys, counted when first needed
+        if words_list is not None:
+            self.add_words(words_list)
+
+    def add_words(self, words_list):
+        """Count every run of up to max_order + 1 words in the list.
+           O(n * k) runtime, for n words and order k.
+
+        """
+        depth = self.max_order + 1
+        num_words = len(words_list)
+        for start in range(num_words):
+            node = self.root
+            node.count += 1
+            for word in words_list[start:min(start + depth, num_words)]:
+                if node.children is None:
+                    node.children = dict()
+                child = node.children.get(word)
+                if child is None:
+                    child = node.children[word] = ContextNode()
+                child.count += 1
+                node = child
+        self.num_states = None
+
+    def find(self, context):
+        """Return the node for a tuple of words, or None if those words never
+           appeared in a row. O(k) runtime for a context of k words.
+
+        """
+        node = self.root
+        for word in context:
+            if node.children is None:
+                return None
+            node = node.children.get(word)
+            if node is None:
+                return None
+        return node
+
+    def count(self, words):
+        """Return the number of times the words appeared in a row."""
+        node = self.find(words)
+        return 0 if node is None else node.count
+
+    def successors(self, context):
+        """Return a dict of each word that came after the context (a tuple of
+           up to max_order words) to how many times it did. The context ()
+           gives the count of every word in the corpus.
+
+        """
+        node = self.find(context)
+        if node is None:
+            return dict()
+        return self.node_successors(node)
+
+    def node_successors(self, node):
+        """Return a dict of each word after a node to its count."""
+        if node.children is None:
+            return dict()
+        return {word: child.count for word, child in node.children.items()}
+
+    def longest_context(self, history):
+        """Return the longest context at the end of a sequence of words,
+           of at most max_order words, which has successors. Backs off to
+           shorter contexts until one is found; the empty context (all the
+           words of the corpus) is the last resort, so one is always found.
+
+           Parameters:
+           history(sequence): the words generated so far
+
+           Returns:
+           tuple: the context found, with its node
+
+        """
+        length = min(len(history), self.max_order)
+        while length > 0:
+            context = tuple(history[len(history) - length:])
+            node = self.find(context)
+            if node is not None and node.children is not None:
+                return (context, node)
+            length -= 1
+        return ((), self.root)
+
+    def contexts(self, order, prefix=()):
+        """Generate each context of the given number of words which has
+           successors, with its node, in a depth-first walk of the trie.
+           Only the contexts starting with the prefix words are generated.
+
+        """
+        node = self.find(prefix)
+        stack = [] if node is None else [(tuple(prefix), node)]
+        while len(stack) > 0:
+            context, node = stack.pop()
+            if node.children is None:
+                continue
+            if len(context) == order:
+                yield (context, node)
+                continue
+            for word, child in node.children.items():
+                stack.append((context + (word,), child))
+
+    def order_sizes(self):
+        """Return a dict of each order from 1 to max_order to the number of
+           contexts of that order with successors.
+
+        """
+        return {order: sum(1 for _ in self.contexts(order))
+                for order in range(1, self.max_order + 1)}
+
+    def freeze(self):
+        """Return a CompactContextTrie holding the same counts."""
+        return CompactContextTrie(self)
+
+    def __getitem__(self, state):
+        """Return a Dictogram counting the states that came after a state,
+           like HigherMarkovChain.chain[state]. Raises KeyError if the state
+           has no successors.
+
+        """
+        if len(state) != self.max_order:
+            raise KeyError(state)
+        node = self.find(state)
+        if node is None or node.children is None:
+            raise KeyError(state)
+        rest = tuple(state[1:])
+        return Dictogram.from_counts({rest + (word,): child.count
+                                      for word, child in
+                                      node.children.items()})
+
+    def __iter__(self):
+        """Generate each state (a tuple of max_order words) with successors.
+        """
+        for context, _ in self.contexts(self.max_order):
+            yield context
+
+    def __len__(self):
+        """Return the number of states with successors."""
+        if self.num_states is None:
+            self.num_states = sum(1 for _ in self)
+        return self.num_states
+
+    def __contains__(self, state):
+        """Return True if the state has successors, in O(k) runtime."""
+        if len(state) != self.max_order:
+            return False
+        node = self.find(state)
+        return node is not None and node.children is not None
+
+
+class CompactContextTrie(Mapping):
+    def __init__(self, trie):
+        """A read-only copy of a ContextTrie, stored in flat arrays instead
+           of a Python object and dict per node.
+
+           Each word type gets an id, its position in the sorted vocabulary.
+           The nodes at each depth d (the runs of d words) are stored in
+           order of their parents, and the children of a node in order of
+           word id, in three arrays per depth: word ids, counts, and where
+           each node's children start in the next depth's arrays. Finding a
+           word among a node's children is a binary search over its range.
+
+           Parameters:
+           trie(ContextTrie): the trie to copy
+
+        """
+        self.max_order = trie.max_order
+        root_children = trie.root.children or dict()
+        self.words = tuple(sorted(root_children))  # word type for each id
+        self.ids = {word: i for i, word in enumerate(self.words)}
+        # arrays for each depth, from 0 (the root) to max_order + 1
+        self.word_ids = [array('I')]
+        self.counts = [array('I', [trie.root.count])]
+        # child ranges for each depth up to max_order; node i at depth d has
+        # the children from starts[d][i] up to starts[d][i + 1] at depth d + 1
+        self.starts = list()
+        nodes = [trie.root]
+        for depth in range(1, self.max_order + 2):
+            word_ids = array('I')
+            counts = array('I')
+            starts = array('I', [0])
+            children = list()
+            for node in nodes:
+                if node.children is not None:
+                    for word_id, word in sorted((self.ids[word], word)
+                                                for word in node.children):
+                        child = node.children[word]
+                        word_ids.append(word_id)
+                        counts.append(child.count)
+                        children.append(child)
+                starts.append(len(word_ids))
+            self.starts.append(starts)
+            self.word_ids.append(word_ids)
+            self.counts.append(counts)
+            nodes = children
+        self.num_states = None
+        # children sorted by count at each depth, made when first needed
+        self.ranks = dict()
+        self.pruned = False  # True once transitions have been dropped
+
+    def child_range(self, node):
+        """Return the (start, end) of the children of a (depth, index) node
+           at the next depth."""
+        depth, index = node
+        if depth >= len(self.starts):
+            return (0, 0)
+        starts = self.starts[depth]
+        return (starts[index], starts[index + 1])
+
+    def find(self, context):
+        """Return the node for a tuple of words, as (depth, index), or None
+           if those words never appeared in a row. O(k log v) runtime for a
+           context of k words, with at most v successors at each step.
+
+        """
+        node = (0, 0)
+        for word in context:
+            word_id = self.ids.get(word)
+            if word_id is None:
+                return None
+            start, end = self.child_range(node)
+            word_ids = self.word_ids[node[0] + 1]
+            position = bisect_left(word_ids, word_id, start, end)
+            if position == end or word_ids[position] != word_id:
+                return None
+            node = (node[0] + 1, position)
+        return node
+
+    def count(self, words):
+        """Return the number of times the words appeared in a row."""
+        node = self.find(words)
+        return 0 if node is None else self.counts[node[0]][node[1]]
+
+    def ranked(self, depth):
+        """Return two arrays for the nodes at a depth: ranks, the positions
+           of each node's children sorted by count, most frequent first, and
+           totals, the running totals of their counts in that order. Both
+           start over for each node's children, in the same ranges as the
+           other arrays, so the most frequent children of a node, and any
+           share of its total count, are found without sorting again.
+           Sorted once, in O(n log n) runtime, the first time.
+
+        """
+        if depth not in self.ranks:
+            counts = self.counts[depth]
+            starts = self.starts[depth - 1]
+            ranks = array('I')
+            totals = array('Q')
+            for i in range(len(starts) - 1):
+                order = sorted(range(starts[i], starts[i + 1]),
+                               key=counts.__getitem__, reverse=True)
+                ranks.extend(order)
+                totals.extend(accumulate(counts[j] for j in order))
+            self.ranks[depth] = (ranks, totals)
+        return self.ranks[depth]
+
+    def node_successors(self, node):
+        """Return a dict of each word after a node to its count."""
+        start, end = self.child_range(node)
+        word_ids = self.word_ids[node[0] + 1]
+        counts = self.counts[node[0] + 1]
+        return {self.words[word_ids[i]]: counts[i] for i in range(start, end)}
+
+    def successors(self, context):
+        """Return a dict of each word that came after the context (a tuple of
+           up to max_order words) to how many times it did.
+
+        """
+        node = self.find(context)
+        if node is None:
+            return dict()
+        return self.node_successors(node)
+
+    def has_successors(self, node):
+        """Return True if any word came after the node."""
+        start, end = self.child_range(node)
+        return end > start
+
+    def longest_context(self, history):
+        """Return the longest context at the end of a sequence of words, of
+           at most max_order words, which has successors, with its node.
+           Backs off like ContextTrie.longest_context.
+
+        """
+        length = min(len(history), self.max_order)
+        while length > 0:
+            context = tuple(history[len(history) - length:])
+            node = self.find(context)
+            if node is not None and self.has_successors(node):
+                return (context, node)
+            length -= 1
+        return ((), (0, 0))
+
+    def contexts(self, order, prefix=()):
+        """Generate each context of the given number of words which has
+           successors, with its node. Only the contexts starting with the
+           prefix words are generated.
+
+        """
+        node = self.find(prefix)
+        stack = [] if node is None else [(tuple(prefix), node)]
+        while len(stack) > 0:
+            context, node = stack.pop()
+            if not self.has_successors(node):
+                continue
+            if len(context) == order:
+                yield (context, node)
+                continue
+            start, end = self.child_range(node)
+            word_ids = self.word_ids[node[0] + 1]
+            for i in range(start, end):
+                stack.append((context + (self.words[word_ids[i]],),
+                              (node[0] + 1, i)))
+
+    def num_contexts(self, order):
+        """Return the number of contexts of the given order with successors.
+        """
+        starts = self.starts[order]
+        return sum(1 for i in range(len(starts) - 1)
+                   if starts[i + 1] > starts[i])
+
+    def order_sizes(self):
+        """Return a dict of each order from 1 to max_order to the number of
+           contexts of that order with successors.
+
+        """
+        return {order: self.num_contexts(order)
+                for order in range(1, self.max_order + 1)}
+
+    def memory_by_order(self):
+        """Return a dict of each order from 0 to max_order to the bytes of
+           the arrays holding the transitions out of its contexts (the runs
+           of order + 1 words). Order 0 is the count of each word, and a
+           chain of order k needs the arrays of orders 0 to k.
+
+        """
+        memory = dict()
+        for order in range(self.max_order + 1):
+            depth = order + 1
+            arrays = [self.word_ids[depth], self.counts[depth],
+                      self.starts[order]]
+            memory[order] = sum(part.itemsize * len(part) for part in arrays)
+        return memory
+
+    def memory_bytes(self):
+        """Return the bytes used by the arrays of every order and the
+           vocabulary.
+
+        """
+        return sum(self.memory_by_order().values()) + self.vocabulary_bytes()
+
+    def prune(self, min_count=1, max_successors=None):
+        """Drop rare transitions to save memory, in place. Every run of two
+           or more words seen fewer than min_count times is dropped, along
+           with the longer runs starting with it, and only the
+           max_successors most frequent successors of each state of the
+           highest order are kept. The counts of single words are all kept,
+           so the vocabulary stays the same. O(n log s) runtime, for n nodes
+           and at most s successors per node.
+
+           Parameters:
+           min_count(int): the fewest times a transition must have been seen
+           max_successors(int): the most successors kept per state, or None
+                                to keep them all
+
+        """
+        # old indexes of the nodes kept at the depth above, in order
+        kept = range(len(self.word_ids[1]))
+        for depth in range(2, self.max_order + 2):
+            old_starts = self.starts[depth - 1]
+            counts = self.counts[depth]
+            word_ids = array('I')
+            new_counts = array('I')
+            starts = array('I', [0])
+            children = list()
+            for i in kept:
+                chosen = [j for j in range(old_starts[i], old_starts[i + 1])
+                          if counts[j] >= min_count]
+                if (depth == self.max_order + 1 and max_successors is not None
+                        and len(chosen) > max_successors):
+                    chosen = sorted(heapq.nlargest(max_successors, chosen,
+                                                   key=counts.__getitem__))
+                for j in chosen:
+                    word_ids.append(self.word_ids[depth][j])
+                    new_counts.append(counts[j])
+                children.extend(chosen)
+                starts.append(len(word_ids))
+            self.starts[depth - 1] = starts
+            self.word_ids[depth] = word_ids
+            self.counts[depth] = new_counts
+            kept = children
+        self.num_states = None
+        self.ranks = dict()
+        self.pruned = True
+        return self
+
+    def vocabulary_bytes(self):
+        """Return the bytes used by the word types and their ids."""
+        return (sys.getsizeof(self.words) + sys.getsizeof(self.ids)
+                + sum(sys.getsizeof(word) for word in self.words))
+
+    def __getitem__(self, state):
+        """Return a Dictogram counting the states that came after a state,
+           like HigherMarkovChain.chain[state]. Raises KeyError if the state
+           has no successors.
+
+        """
+        if len(state) != self.max_order:
+            raise KeyError(state)
+        node = self.find(state)
+        if node is None or not self.has_successors(node):
+            raise KeyError(state)
+        rest = tuple(state[1:])
+        return Dictogram.from_counts({rest + (word,): count for word, count
+                                      in self.node_successors(node).items()})
+
+    def __iter__(self):
+        """Generate each state (a tuple of max_order words) with successors.
+        """
+        for context, _ in self.contexts(self.max_order):
+            yield context
+
+    def __len__(self):
+        """Return the number of states with successors."""
+        if self.num_states is None:
+            self.num_states = self.num_contexts(self.max_order)
+        return self.num_states
+
+    def __contains__(self, state):
+        """Return True if the state has successors, in O(k log v) runtime."""
+        if len(state) != self.max_order:
+            return False
+        node = self.find(state)
+        return node is not None and self.has_successors(node)
+
+
+def traced_bytes(build):
+    """Return what build() returns, and the bytes it allocated and kept."""
+    import tracemalloc
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (result, after - before)
+
+
+if __name__ == "__main__":
+    # compare the memory of a chain as a dictionary, and as the tries
+    from higher_order import HigherMarkovChain
+    order = int(sys.argv[1]) if len(sys.argv) > 1 else 2
+    mark = HigherMarkovChain(order=order)
+    chain, dict_bytes = traced_bytes(mark.populate_dict_chain)
+    del chain
+    trie, trie_bytes = traced_bytes(
+        lambda: ContextTrie(mark.words_list, order))
+    compact, compact_bytes = traced_bytes(trie.freeze)
+    print(f'dict chain of order {order}: {dict_bytes / 2 ** 20:.1f} MiB')
+    print(f'ContextTrie, orders 1 to {order}: {trie_bytes / 2 ** 20:.1f} MiB')
+    print(f'CompactContextTrie: {compact_bytes / 2 ** 20:.1f} MiB')
+    print(f'  vocabulary: {compact.vocabulary_bytes() / 2 ** 20:.1f} MiB')
+    for number, size in compact.memory_by_order().items():
+        print(f'  order {number}: {size / 2 ** 20:.1f} MiB')
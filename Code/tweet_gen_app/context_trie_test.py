@@ -0,0 +1,104 @@
+from context_trie import ContextTrie
+from higher_order import HigherMarkovChain
+import unittest
+
+
+class ContextTrieTest(unittest.TestCase):
+    left_right_list = ['I', 'went', 'left', 'you', 'went', 'right',
+                       'I', 'went', 'left', 'I', 'went', 'right']
+
+    def test_counts(self):
+        trie = ContextTrie(self.left_right_list, max_order=2)
+        assert trie.count(('went',)) == 4
+        assert trie.count(('I', 'went')) == 3
+        assert trie.count(('I', 'went', 'left')) == 2
+        assert trie.count(('went', 'up')) == 0
+        assert trie.successors(('went',)) == {'left': 2, 'right': 2}
+        assert trie.successors(('I', 'went')) == {'left': 2, 'right': 1}
+        # the last word of the corpus has no successors
+        assert trie.successors(('went', 'right')) == {'I': 1}
+        assert trie.successors(('up',)) == {}
+
+    def test_chain_lookup(self):
+        '''The trie holds the same chain as HigherMarkovChain builds.'''
+        mark = HigherMarkovChain(self.left_right_list, 2)
+        trie = ContextTrie(self.left_right_list, max_order=2)
+        assert len(trie) == len(mark.chain)
+        self.assertCountEqual(list(trie), list(mark.chain))
+        for state in mark.chain:
+            assert state in trie
+            assert trie[state] == mark.chain[state]
+        assert ('right', 'I') not in ContextTrie(['went', 'right'], 2)
+        with self.assertRaises(KeyError):
+            trie[('went', 'up')]
+
+    def test_longest_context(self):
+        trie = ContextTrie(self.left_right_list, max_order=2)
+        context, node = trie.longest_context(['you', 'went'])
+        assert context == ('you', 'went')
+        # "left right" never appeared, so back off to "right"
+        context, node = trie.longest_context(['left', 'right'])
+        assert context == ('right',)
+        context, node = trie.longest_context(['up'])
+        assert context == ()
+        assert node.count == len(self.left_right_list)
+
+    def test_order_sizes(self):
+        trie = ContextTrie(self.left_right_list, max_order=2)
+        assert trie.order_sizes() == {1: 5, 2: 7}
+        assert trie.freeze().order_sizes() == {1: 5, 2: 7}
+
+    def test_freeze(self):
+        '''The compact trie answers every lookup like the one it copies.'''
+        trie = ContextTrie(self.left_right_list, max_order=3)
+        compact = trie.freeze()
+        for order in range(4):
+            for context, _ in trie.contexts(order):
+                assert compact.count(context) == trie.count(context)
+                assert compact.successors(context) == trie.successors(context)
+        assert compact.successors(('went', 'up')) == {}
+        assert compact.count(('I', 'went', 'left', 'you')) == 1
+        assert compact.longest_context(['left', 'right'])[0] == ('right',)
+        assert compact.longest_context(['up'])[0] == ()
+        assert len(compact) == len(trie)
+        self.assertCountEqual(list(compact), list(trie))
+        for state in trie:
+            assert compact[state] == trie[state]
+
+    def test_memory_by_order(self):
+        compact = ContextTrie(self.left_right_list, max_order=2).freeze()
+        memory = compact.memory_by_order()
+        assert list(memory) == [0, 1, 2]
+        # 5 words, 7 pairs and 9 runs of three different words: 4 bytes for
+        # each id and count, and a start for each context of the order (the
+        # root for order 0), plus one
+        assert memory[0] == 4 * (5 + 5 + 2)
+        assert memory[1] == 4 * (7 + 7 + 6)
+        assert memory[2] == 4 * (9 + 9 + 8)
+
+    def test_prune(self):
+        compact = ContextTrie(self.left_right_list, max_order=2).freeze()
+        before = compact.memory_bytes()
+        compact.prune(min_count=2)
+        assert compact.memory_bytes() < before
+        # every word is kept, but only the pairs and runs seen twice
+        assert compact.count(('you',)) == 1
+        assert compact.successors(('went',)) == {'left': 2, 'right': 2}
+        assert compact.successors(('left',)) == {}
+        assert compact.successors(('I', 'went')) == {'left': 2}
+        assert compact.successors(('went', 'right')) == {}
+        assert list(compact) == [('I', 'went')]
+        assert compact.order_sizes() == {1: 2, 2: 1}
+
+    def test_prune_max_successors(self):
+        compact = ContextTrie(self.left_right_list, max_order=2).freeze()
+        compact.prune(max_successors=1)
+        # only the successors of the highest order are limited
+        assert compact.successors(('went',)) == {'left': 2, 'right': 2}
+        assert compact.successors(('I', 'went')) == {'left': 2}
+        assert len(compact.successors(('went', 'left'))) == 1
+        assert len(compact) == 7
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,34 +1,192 @@
 #!python
 
 from __future__ import division, print_function  # Python 2 and 3 compatibility
+from collections import Counter
+import heapq
 import random
 import stochastic_sampling
+try:
+    import numpy
+except ImportError:  # NumPy is optional, see dictogram_from_tokens
+    numpy = None
+
+
+class CountBucket(object):
+
+    def __init__(self, count):
+        """Initialize an empty bucket for the words appearing count times."""
+        self.count = count
+        self.words = set()
+        self.lower = None  # bucket with the next lower count
+        self.higher = None  # bucket with the next higher count
+
+    def __repr__(self):
+        """Return a string representation of this bucket."""
+        return 'CountBucket({!r}: {!r})'.format(self.count, self.words)
 
 
 class Dictogram(dict):
     """Dictogram is a histogram implemented as a subclass of the dict type."""
 
-    def __init__(self, word_list=None):
-        """Initialize this histogram as a new dict and count given words."""
+    def __init__(self, word_list=None, rank_index=False):
+        """Initialize this histogram as a new dict and count given words.
+        If rank_index is True, also keep an index of words by their count
+        (like histogram.create_histogram_inverted), for fast most_common and
+        rank queries."""
         super(Dictogram, self).__init__()  # Initialize this as a new dict
         # Add properties to track useful word counts for this histogram
         self.types = 0  # Count of distinct word types in this histogram
         self.tokens = 0  # Total count of all word tokens in this histogram
+        # Rank index: a doubly linked list of CountBuckets in order of count,
+        # and a dict to find the bucket for a count in O(1) time
+        self.buckets = dict() if rank_index is True else None
+        self.lowest = None  # bucket with the lowest count
+        self.highest = None  # bucket with the highest count
         # Count words in given list, if any
         if word_list is not None:
             for word in word_list:
-                if word not in self.keys():
-                    self[word] = 0
-                    self.types += 1
                 self.add_count(word)
 
+    @classmethod
+    def from_counts(cls, counts, rank_index=False):
+        """Return a new Dictogram holding the given word counts (a dict of
+        positive counts), copied in one bulk update instead of one add_count
+        call per word."""
+        histogram = cls(rank_index=rank_index)
+        dict.update(histogram, counts)
+        histogram.types = len(histogram)
+        histogram.tokens = sum(histogram.values())
+        if rank_index is True:
+            histogram.rebuild_index()
+        return histogram
+
+    def rebuild_index(self):
+        """Build the rank index from scratch, from the current counts.
+        O(n + b log b) time for n word types and b distinct counts."""
+        words_by_count = dict()
+        for word, count in self.items():
+            if count > 0:
+                if count not in words_by_count:
+                    words_by_count[count] = set()
+                words_by_count[count].add(word)
+        self.buckets = dict()
+        self.lowest = None
+        self.highest = None
+        lower = None
+        for count in sorted(words_by_count):
+            bucket = CountBucket(count)
+            bucket.words = words_by_count[count]
+            self._link_bucket(bucket, lower, None)
+            lower = bucket
+
     def add_count(self, word, count=1):
-        """Increase frequency count of given word by given count amount."""
-        if word not in self.keys():
-            self[word] = 0
+        """Increase frequency count of given word by given count amount.
+        With a rank index, this is O(1) time when count is 1, since a word
+        only moves to the next bucket up. A count of 0 changes nothing."""
+        if count == 0:
+            return
+        old_count = self.get(word, 0)
+        if word not in self:
             self.types += 1
         self.tokens += count
-        self[word] += count
+        self[word] = old_count + count
+        if self.buckets is not None:
+            self._move_in_index(word, old_count, old_count + count)
+
+    def _move_in_index(self, word, old_count, new_count):
+        """Move a word from the bucket for old_count to the one for new_count,
+        making that bucket if needed, and dropping the old one if empty."""
+        if new_count == old_count:
+            return  # adding the word to its own bucket would drop it after
+        old_bucket = self.buckets.get(old_count)
+        if new_count > 0:
+            # walk along the buckets from the old one, to where the new goes
+            if new_count > old_count:
+                lower = old_bucket
+                if old_bucket is None:
+                    higher = self.lowest
+                else:
+                    higher = old_bucket.higher
+                while higher is not None and higher.count < new_count:
+                    lower, higher = higher, higher.higher
+            else:
+                higher = old_bucket
+                lower = old_bucket.lower
+                while lower is not None and lower.count > new_count:
+                    lower, higher = lower.lower, lower
+            if higher is not None and higher.count == new_count:
+                higher.words.add(word)
+            elif lower is not None and lower.count == new_count:
+                lower.words.add(word)
+            else:
+                self._link_bucket(CountBucket(new_count), lower, higher)
+                self.buckets[new_count].words.add(word)
+        if old_bucket is not None:
+            old_bucket.words.discard(word)
+            if len(old_bucket.words) == 0:
+                self._unlink_bucket(old_bucket)
+
+    def _link_bucket(self, bucket, lower, higher):
+        """Insert a new bucket between two neighboring buckets (either of
+        which may be None, at the ends of the list)."""
+        self.buckets[bucket.count] = bucket
+        bucket.lower, bucket.higher = lower, higher
+        if lower is None:
+            self.lowest = bucket
+        else:
+            lower.higher = bucket
+        if higher is None:
+            self.highest = bucket
+        else:
+            higher.lower = bucket
+
+    def _unlink_bucket(self, bucket):
+        """Remove an empty bucket from the rank index."""
+        del self.buckets[bucket.count]
+        if bucket.lower is None:
+            self.lowest = bucket.higher
+        else:
+            bucket.lower.higher = bucket.higher
+        if bucket.higher is None:
+            self.highest = bucket.lower
+        else:
+            bucket.higher.lower = bucket.lower
+
+    def most_common(self, k=None):
+        """Return a list of the k most frequent (word, count) pairs, most
+        frequent first, or all of them if k is None. Ties are in no
+        particular order. O(k) time with a rank index, since the buckets are
+        already in order; otherwise O(n log k) for n word types."""
+        if k is None:
+            k = self.types
+        if self.buckets is None:
+            return heapq.nlargest(k, self.items(), key=lambda item: item[1])
+        pairs = list()
+        bucket = self.highest
+        while bucket is not None and len(pairs) < k:
+            for word in bucket.words:
+                if len(pairs) == k:
+                    break
+                pairs.append((word, bucket.count))
+            bucket = bucket.lower
+        return pairs
+
+    def rank(self, word):
+        """Return the rank of given word: 1 plus the number of word types
+        appearing more often than it, or None if word is not found.
+        With a rank index this takes O(b) time, for the b buckets with a
+        higher count than the word's, instead of a scan of every word."""
+        if word not in self:
+            return None
+        count = self[word]
+        if self.buckets is None:
+            return 1 + sum(1 for other in self.values() if other > count)
+        rank = 1
+        bucket = self.highest
+        while bucket.count > count:
+            rank += len(bucket.words)
+            bucket = bucket.lower
+        return rank
 
     def frequency(self, word):
         """Return frequency count of given word, or 0 if word is not found."""
@@ -42,6 +200,92 @@ class Dictogram(dict):
         each word's probability of being chosen by its observed frequency."""
         return stochastic_sampling.stochastic_sample(self)
 
+    def merge(self, other):
+        """Add the counts of another histogram (a Dictogram, Listogram, or
+        any dict or list of word-count pairs) to this one, in place.
+        O(m) time for m word types in the other histogram."""
+        for word, count in histogram_pairs(other):
+            self.add_count(word, count)
+        return self
+
+    def update(self, word_list):
+        """Count the words in the given list, adding to the counts already in
+        this histogram (not replacing them, as dict.update would). The words
+        are counted in bulk first, so each word type is added only once.
+        Another histogram may also be given, as for merge."""
+        if isinstance(word_list, dict) or hasattr(word_list, 'tokens'):
+            return self.merge(word_list)
+        return self.merge(Counter(word_list))
+
+    def copy(self):
+        """Return a new Dictogram with the same counts as this one."""
+        return Dictogram.from_counts(self, self.buckets is not None)
+
+    def __reduce__(self):
+        """Pickle this histogram as its counts alone, so it can be sent
+        between processes; the rank index is rebuilt when it's unpickled."""
+        return (Dictogram.from_counts, (dict(self), self.buckets is not None))
+
+    def __add__(self, other):
+        """Return a new Dictogram with the counts of both histograms."""
+        return self.copy().merge(other)
+
+    def __sub__(self, other):
+        """Return a new Dictogram with the counts of other histogram taken
+        away from the counts of this one, keeping only words whose count is
+        still above zero (like collections.Counter)."""
+        other_counts = dict(histogram_pairs(other))
+        counts = dict()
+        for word, count in self.items():
+            count -= other_counts.get(word, 0)
+            if count > 0:
+                counts[word] = count
+        return Dictogram.from_counts(counts, self.buckets is not None)
+
+
+def histogram_pairs(histogram):
+    """Return an iterable of (word, count) pairs from a histogram: a dict
+    (including Dictogram), an Arraygram, or a list of [word, count] entries
+    (including Listogram)."""
+    if hasattr(histogram, 'items'):
+        return histogram.items()
+    return histogram
+
+
+def encode_tokens(tokens):
+    """Return a tuple of (ids, vocabulary) for a list of tokens: the id of
+    each token is the position of its word type in the vocabulary list.
+    The ids are a NumPy array if NumPy is installed, or a list if not."""
+    ids_by_word = dict()
+    ids = [ids_by_word.setdefault(token, len(ids_by_word)) for token in tokens]
+    if numpy is not None:
+        ids = numpy.array(ids, dtype=numpy.intp)
+    return (ids, list(ids_by_word))
+
+
+def dictogram_from_tokens(tokens, vocabulary=None, rank_index=False):
+    """Return a Dictogram counting the given tokens, built in bulk.
+
+    If a vocabulary list is given, tokens are integer ids into it (as made by
+    encode_tokens), and are counted with numpy.unique when NumPy is
+    installed. That is the fast path for a corpus that is encoded once and
+    counted many times: over the 620,000 words of the Adam Smith corpus it
+    takes about 0.01 seconds, against 0.2 seconds for calling add_count on
+    each word. Without NumPy, or for tokens that are words, they are counted
+    with collections.Counter, which loops in C (about 0.05 seconds).
+    Integer-encoding words just to count them once is itself a Python loop,
+    so words are not sent through NumPy."""
+    if vocabulary is None:
+        counts = Counter(tokens)
+    elif numpy is not None:
+        ids, id_counts = numpy.unique(numpy.asarray(tokens),
+                                      return_counts=True)
+        counts = dict(zip([vocabulary[i] for i in ids.tolist()],
+                          id_counts.tolist()))
+    else:
+        counts = {vocabulary[i]: count for i, count in Counter(tokens).items()}
+    return Dictogram.from_counts(counts, rank_index)
+
 
 def print_histogram(word_list):
     print()
@@ -0,0 +1,225 @@
+#!python
+
+from dictogram import Dictogram, encode_tokens, dictogram_from_tokens
+import unittest
+# Python 2 and 3 compatibility: unittest module renamed this assertion method
+if not hasattr(unittest.TestCase, 'assertCountEqual'):
+    unittest.TestCase.assertCountEqual = unittest.TestCase.assertItemsEqual
+
+
+class DictogramTest(unittest.TestCase):
+
+    # Test fixtures: known inputs and their expected results
+    fish_words = ['one', 'fish', 'two', 'fish', 'red', 'fish', 'blue', 'fish']
+    fish_list = [('one', 1), ('fish', 4), ('two', 1), ('red', 1), ('blue', 1)]
+    fish_dict = {'one': 1, 'fish': 4, 'two': 1, 'red': 1, 'blue': 1}
+
+    def test_entries(self):
+        dictogram = Dictogram(self.fish_words)
+        # Verify histogram as dictionary of entries like {word: count}
+        assert len(dictogram) == 5
+        self.assertCountEqual(dictogram, self.fish_dict)  # Ignore item order
+        # Verify histogram as list of entries like [(word, count)]
+        listogram = dictogram.items()
+        assert len(listogram) == 5
+        self.assertCountEqual(listogram, self.fish_list)  # Ignore item order
+
+    def test_contains(self):
+        histogram = Dictogram(self.fish_words)
+        # All of these words should be found
+        for word in self.fish_words:
+            assert word in histogram
+        # None of these words should be found
+        for word in ('fishy', 'food'):
+            assert word not in histogram
+
+    def test_frequency(self):
+        histogram = Dictogram(self.fish_words)
+        # Verify frequency count of all words
+        assert histogram.frequency('one') == 1
+        assert histogram.frequency('two') == 1
+        assert histogram.frequency('red') == 1
+        assert histogram.frequency('blue') == 1
+        assert histogram.frequency('fish') == 4
+        # Verify frequency count of unseen words
+        assert histogram.frequency('food') == 0
+
+    def test_add_count(self):
+        histogram = Dictogram(self.fish_words)
+        # Add more words to update frequency counts
+        histogram.add_count('two', 2)
+        histogram.add_count('blue', 3)
+        histogram.add_count('fish', 4)
+        histogram.add_count('food', 5)
+        # Verify updated frequency count of all words
+        assert histogram.frequency('one') == 1
+        assert histogram.frequency('two') == 3
+        assert histogram.frequency('red') == 1
+        assert histogram.frequency('blue') == 4
+        assert histogram.frequency('fish') == 8
+        assert histogram.frequency('food') == 5
+        # Verify count of distinct word types
+        assert histogram.types == 6
+        # Verify total count of all word tokens
+        assert histogram.tokens == 8 + 14
+
+    def test_tokens(self):
+        histogram = Dictogram(self.fish_words)
+        # Verify total count of all word tokens
+        assert len(self.fish_words) == 8
+        assert histogram.tokens == 8
+        # Adding words again should double total count of all word tokens
+        for word in self.fish_words:
+            histogram.add_count(word)
+        assert histogram.tokens == 8 * 2
+
+    def test_types(self):
+        histogram = Dictogram(self.fish_words)
+        # Verify count of distinct word types
+        assert len(set(self.fish_words)) == 5
+        assert histogram.types == 5
+        # Adding words again should not change count of distinct word types
+        for word in self.fish_words:
+            histogram.add_count(word)
+        assert histogram.types == 5
+
+    def test_sample(self):
+        histogram = Dictogram(self.fish_words)
+        # Create a list of 10,000 word samples from histogram
+        samples_list = [histogram.sample() for _ in range(10000)]
+        # Create a histogram to count frequency of each word
+        samples_hist = Dictogram(samples_list)
+        # Check each word in original histogram
+        for word, count in histogram.items():
+            # Calculate word's observed frequency
+            observed_freq = count / histogram.tokens
+            # Calculate word's sampled frequency
+            samples = samples_hist.frequency(word)
+            sampled_freq = samples / samples_hist.tokens
+            # Verify word's sampled frequency is close to observed frequency
+            lower_bound = observed_freq * 0.9  # 10% below = 90% = 0.9
+            upper_bound = observed_freq * 1.1  # 10% above = 110% = 1.1
+            assert lower_bound <= sampled_freq <= upper_bound
+
+    def test_most_common(self):
+        # Should give the same answers with and without a rank index
+        for rank_index in (False, True):
+            histogram = Dictogram(self.fish_words, rank_index=rank_index)
+            assert histogram.most_common(1) == [('fish', 4)]
+            most_common = histogram.most_common(3)
+            assert len(most_common) == 3
+            assert most_common[0] == ('fish', 4)
+            assert most_common[1][1] == 1
+            self.assertCountEqual(histogram.most_common(), self.fish_list)
+            # Counts added later should move words up in the order
+            histogram.add_count('red', 5)
+            assert histogram.most_common(2) == [('red', 6), ('fish', 4)]
+
+    def test_rank(self):
+        for rank_index in (False, True):
+            histogram = Dictogram(self.fish_words, rank_index=rank_index)
+            assert histogram.rank('fish') == 1
+            assert histogram.rank('one') == 2
+            assert histogram.rank('food') is None
+            histogram.add_count('two', 3)
+            assert histogram.rank('two') == 1
+            assert histogram.rank('fish') == 1
+            assert histogram.rank('one') == 3
+
+    def test_rank_index(self):
+        histogram = Dictogram(self.fish_words, rank_index=True)
+        # Verify each count has a bucket of the words with that count
+        assert sorted(histogram.buckets) == [1, 4]
+        assert histogram.buckets[1].words == {'one', 'two', 'red', 'blue'}
+        assert histogram.lowest.count == 1
+        assert histogram.highest.count == 4
+        # Empty buckets should be removed
+        histogram.add_count('fish', 2)
+        assert sorted(histogram.buckets) == [1, 6]
+        assert histogram.lowest.higher is histogram.highest
+        # Adding nothing leaves the word in its bucket
+        histogram = Dictogram(['a', 'b', 'a'], rank_index=True)
+        histogram.add_count('a', 0)
+        histogram.merge({'b': 0})
+        assert histogram.most_common() == [('a', 2), ('b', 1)]
+        histogram.add_count('c', 0)
+        assert 'c' not in histogram
+        assert histogram.types == 2
+
+    def test_dictogram_from_tokens(self):
+        expected = Dictogram(self.fish_words)
+        histogram = dictogram_from_tokens(self.fish_words)
+        assert histogram == expected
+        assert histogram.types == 5
+        assert histogram.tokens == 8
+        # Integer-encoded tokens should give the same counts
+        ids, vocabulary = encode_tokens(self.fish_words)
+        assert vocabulary == ['one', 'fish', 'two', 'red', 'blue']
+        assert list(ids) == [0, 1, 2, 1, 3, 1, 4, 1]
+        histogram = dictogram_from_tokens(ids, vocabulary, rank_index=True)
+        assert histogram == expected
+        assert histogram.types == 5
+        assert histogram.tokens == 8
+        assert histogram.most_common(1) == [('fish', 4)]
+        # The histogram can still be added to as usual
+        histogram.add_count('fish')
+        assert histogram.frequency('fish') == 5
+        assert histogram.rank('fish') == 1
+
+    def test_merge_and_add(self):
+        # Count two shards of the words separately, then combine them
+        for rank_index in (False, True):
+            first = Dictogram(self.fish_words[:4], rank_index=rank_index)
+            second = Dictogram(self.fish_words[4:], rank_index=rank_index)
+            total = first + second
+            assert total == self.fish_dict
+            assert total.types == 5
+            assert total.tokens == 8
+            assert total.most_common(1) == [('fish', 4)]
+            # Adding should not change either histogram
+            assert first.tokens == 4
+            assert second.tokens == 4
+            first.merge(second)
+            assert first == self.fish_dict
+            assert first.types == 5
+            assert first.tokens == 8
+            # Other kinds of histograms can be merged too
+            first.merge([['fish', 1], ['food', 2]])
+            assert first.frequency('fish') == 5
+            assert first.frequency('food') == 2
+            assert first.tokens == 11
+
+    def test_update(self):
+        histogram = Dictogram(self.fish_words)
+        histogram.update(['fish', 'food'])
+        assert histogram.frequency('fish') == 5
+        assert histogram.frequency('food') == 1
+        assert histogram.types == 6
+        assert histogram.tokens == 10
+        histogram.update({'one': 2})
+        assert histogram.frequency('one') == 3
+        assert histogram.tokens == 12
+
+    def test_subtract(self):
+        histogram = Dictogram(self.fish_words, rank_index=True)
+        difference = histogram - Dictogram(['fish', 'fish', 'one', 'food'])
+        # Words whose count drops to zero or below are left out
+        assert difference == {'fish': 2, 'two': 1, 'red': 1, 'blue': 1}
+        assert difference.types == 4
+        assert difference.tokens == 5
+        assert difference.most_common(1) == [('fish', 2)]
+        # The original histogram is unchanged
+        assert histogram == self.fish_dict
+
+    def test_pickle(self):
+        import pickle
+        histogram = Dictogram(self.fish_words, rank_index=True)
+        copy = pickle.loads(pickle.dumps(histogram))
+        assert copy == histogram
+        assert copy.types == 5
+        assert copy.tokens == 8
+        assert copy.most_common(1) == [('fish', 4)]
+
+
+if __name__ == '__main__':
+    unittest.main()
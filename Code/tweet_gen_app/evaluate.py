@@ -0,0 +1,112 @@
+#!python
+"""Evaluate Markov chains of several orders on held-out text, to choose the
+best trade-off of quality against cost.
+
+The corpus is split into training words and held-out words (the last
+--held-out share of it). For each order, a chain is built from the training
+words in its own process, all at the same time, and the perplexity of the
+held-out words is measured, along with the time to build the chain and the
+memory its trie takes. Perplexity is given with add-k smoothing and with
+interpolation of the shorter contexts; add-k gives every unseen transition
+of a long state about 1 / vocabulary, which makes higher orders look worse
+than they are, so compare orders by the interpolated perplexity. Given
+--min-count or --max-successors, each chain is then pruned, and the memory
+saved and the perplexity after are reported too.
+Results are printed as JSON.
+
+Usage: python evaluate.py [--orders 1,2,3] [--held-out 0.1] [--smoothing K]
+                          [--sentence-markers] [--processes N]
+                          [--min-count N] [--max-successors N]
+"""
+import argparse
+import json
+import multiprocessing
+import time
+import clean_words
+from higher_order import HigherMarkovChain
+
+
+def split_corpus(words, held_out):
+    """Return the words split into training and held-out lists, with the
+       last held_out share of the words held out."""
+    split = int(len(words) * (1 - held_out))
+    return (words[:split], words[split:])
+
+
+def evaluate_order(arguments):
+    """Build a chain of one order and measure it on the held-out words.
+       Param: arguments(tuple): order, training words, held-out words, k,
+              and the min_count and max_successors to prune with, if any
+       Return: results(dict)
+    """
+    order, training, held_out, k, min_count, max_successors = arguments
+    start = time.perf_counter()
+    mark = HigherMarkovChain(training, order)
+    build_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    perplexity = mark.perplexity(held_out, k)
+    evaluate_seconds = time.perf_counter() - start
+    interpolated = mark.perplexity(held_out, interpolate=True)
+    results = {
+        'order': order,
+        'perplexity': perplexity,
+        'interpolated_perplexity': interpolated,
+        'states': len(mark.chain),
+        'build_seconds': build_seconds,
+        'evaluate_seconds': evaluate_seconds,
+        'memory_bytes': mark.chain.memory_bytes()
+    }
+    if min_count > 1 or max_successors is not None:
+        pruned = mark.prune(min_count, max_successors, held_out, k)
+        results['pruned'] = {
+            'states': len(mark.chain),
+            'perplexity': pruned['perplexity_after'],
+            'interpolated_perplexity': mark.perplexity(held_out,
+                                                       interpolate=True),
+            'memory_bytes': pruned['memory_after'],
+            'memory_saved': pruned['memory_saved']
+        }
+    return results
+
+
+def evaluate(words, orders, held_out=0.1, k=1, processes=None, min_count=1,
+             max_successors=None):
+    """Evaluate a chain of each order in parallel, one process per order.
+       Return: results(list of dict), in the order of orders
+    """
+    training, held_out_words = split_corpus(words, held_out)
+    jobs = [(order, training, held_out_words, k, min_count, max_successors)
+            for order in orders]
+    with multiprocessing.Pool(processes or len(orders)) as pool:
+        return pool.map(evaluate_order, jobs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--orders', default='1,2,3',
+                        help='comma-separated orders to evaluate')
+    parser.add_argument('--held-out', type=float, default=0.1,
+                        help='share of the corpus to hold out')
+    parser.add_argument('--smoothing', type=float, default=1,
+                        help='count added to every transition (add-k)')
+    parser.add_argument('--sentence-markers', action='store_true',
+                        help='mark sentence starts and ends in the corpus')
+    parser.add_argument('--processes', type=int,
+                        help='processes to use (default: one per order)')
+    parser.add_argument('--min-count', type=int, default=1,
+                        help='prune transitions seen fewer times than this')
+    parser.add_argument('--max-successors', type=int,
+                        help='prune all but this many successors per state')
+    arguments = parser.parse_args()
+    orders = [int(order) for order in arguments.orders.split(',')]
+    words = clean_words.get_clean_words(arguments.sentence_markers)
+    results = evaluate(words, orders, arguments.held_out,
+                       arguments.smoothing, arguments.processes,
+                       arguments.min_count, arguments.max_successors)
+    print(json.dumps({'held_out': arguments.held_out,
+                      'smoothing': arguments.smoothing,
+                      'results': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+#!python
+
+import evaluate
+import unittest
+
+
+class EvaluateTest(unittest.TestCase):
+    words = ["one", "fish", "two", "fish", "red", "fish", "blue", "fish",
+             "one", "fish", "two"]
+
+    def test_split_corpus(self):
+        training, held_out = evaluate.split_corpus(self.words, 0.25)
+        assert training == self.words[:8]
+        assert held_out == self.words[8:]
+
+    def test_evaluate_order(self):
+        training, held_out = evaluate.split_corpus(self.words, 0.25)
+        results = evaluate.evaluate_order((1, training, held_out, 1, 1,
+                                           None))
+        assert results['order'] == 1
+        assert results['states'] == 5
+        assert results['memory_bytes'] > 0
+        # one -> fish (1 + 1) / (1 + 6), fish -> two (1 + 1) / (3 + 6)
+        expected = (7 / 2 * 9 / 2) ** (1 / 2)
+        self.assertAlmostEqual(results['perplexity'], expected)
+        # interpolated with the corpus: one -> fish 1 / 2 + 1 / 2 * 5 / 14,
+        # fish -> two 3 / 6 * 1 / 3 + 3 / 6 * 2 / 14
+        expected = ((1 / 2 + 5 / 28) * (1 / 6 + 1 / 14)) ** (-1 / 2)
+        self.assertAlmostEqual(results['interpolated_perplexity'], expected)
+        assert 'pruned' not in results
+
+    def test_evaluate(self):
+        results = evaluate.evaluate(self.words, [1, 2], 0.25, processes=2)
+        assert [result['order'] for result in results] == [1, 2]
+        results = evaluate.evaluate(self.words, [1], 0.25, max_successors=1)
+        # fish keeps one of its 3 successors, every other word has one
+        assert results[0]['pruned']['states'] == 5
+        assert results[0]['pruned']['memory_saved'] > 0
+        assert results[0]['pruned']['interpolated_perplexity'] > 0
+
+
+if __name__ == '__main__':
+    unittest.main()
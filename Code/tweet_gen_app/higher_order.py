@@ -1,11 +1,21 @@
 from markov_chain import MarkovChain
+from context_trie import ContextTrie
+from clean_words import START, END
 import sys
 from dictogram import Dictogram
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+import heapq
+import math
 import random
 
+# how many tuples of required words to keep the distances to
+DISTANCE_CACHE_SIZE = 8
+
 
 class HigherMarkovChain(MarkovChain):
-    def __init__(self, words_list=None, order=2):
+    def __init__(self, words_list=None, order=2, sentence_markers=False,
+                 min_count=1, max_successors=None):
         """Extends all the properties of a First Order MarkovChain.
            Adds a queue property for calculating probabilities for state
            transitions.
@@ -13,12 +23,26 @@ class HigherMarkovChain(MarkovChain):
            Parameters:
            words_list(list): a list of str represen the corpus text
            order(int): the number of word types held in a state
+           sentence_markers(bool): mark sentences in the default corpus
+           min_count(int): prune transitions seen fewer times than this
+           max_successors(int): prune all but this many successors of each
+                                state, or None to keep them all
 
         """
         self.queue = list()
         self.order = order
+        self.min_count = min_count
+        self.max_successors = max_successors
+        # trie of the corpus backwards, to find the states before a state,
+        # and distances from states to required words, made when needed: an
+        # OrderedDict of targets to the limit searched and the distances
+        self.backward = None
+        self.distances = OrderedDict()
+        # node of the trie to how many times anything came after it, and how
+        # many distinct words did, filled in as states are scored
+        self.totals = dict()
         # initialize self.words_list and self.chain
-        super().__init__(words_list)
+        super().__init__(words_list, sentence_markers)
 
     def enqueue(self, item):
         """Add the item to the end of the current queue.
@@ -123,7 +147,64 @@ class HigherMarkovChain(MarkovChain):
         # return both states
         return (state, next_state)
 
-    def populate_chain(self):
+    def populate_chain(self, min_count=None, max_successors=None):
+        """Construct the MarkovChain state transitions of any order, stored
+           in a CompactContextTrie. It maps each state to a Dictogram of the
+           states after it like a dictionary does, and also holds every lower
+           order, in a fraction of the memory.
+
+           Parameters:
+           min_count(int): prune transitions seen fewer times than this,
+                           defaults to the chain's min_count
+           max_successors(int): prune all but this many successors of each
+                                state, defaults to the chain's max_successors
+
+        """
+        if min_count is None:
+            min_count = self.min_count
+        if max_successors is None:
+            max_successors = self.max_successors
+        chain = ContextTrie(self.words_list, self.order).freeze()
+        if min_count > 1 or max_successors is not None:
+            chain.prune(min_count, max_successors)
+        return chain
+
+    def prune(self, min_count=1, max_successors=None, words=None, k=1):
+        """Drop the rare transitions of the chain to save memory (see
+           CompactContextTrie.prune), and report what it saved and cost.
+
+           Parameters:
+           min_count(int): the fewest times a transition must have been seen
+           max_successors(int): the most successors kept per state, or None
+                                to keep them all
+           words(list): the words to measure perplexity on, held-out text
+                        ideally; defaults to the corpus
+           k(float): the count added to every transition, for perplexity
+
+           Returns:
+           dict: the bytes and perplexity before and after pruning, and the
+                 bytes saved
+
+        """
+        if words is None:
+            words = self.words_list
+        report = {'memory_before': self.chain.memory_bytes(),
+                  'perplexity_before': self.perplexity(words, k)}
+        self.chain.prune(min_count, max_successors)
+        # states, sentence starts and distances may have been pruned away
+        self.states = None
+        self.start_counts = None
+        self.start_states = None
+        self.start_totals = None
+        self.distances.clear()
+        self.totals.clear()
+        report['memory_after'] = self.chain.memory_bytes()
+        report['memory_saved'] = (report['memory_before']
+                                  - report['memory_after'])
+        report['perplexity_after'] = self.perplexity(words, k)
+        return report
+
+    def populate_dict_chain(self):
         """Construct a dictionary to represent the MarkovChain state
            transitions of any order.
 
@@ -144,30 +225,52 @@ class HigherMarkovChain(MarkovChain):
             i += 1  # move index over to start recording of next state
         return chain
 
+    def state_words(self, state):
+        """Return a list of the words in a state."""
+        return list(state)
+
+    def next_state(self, state):
+        """Return a state sampled from the states after the given one, or
+           None if nothing came after it. Samples straight from the counts in
+           the trie, without making a Dictogram of the next states.
+
+        """
+        node = self.chain.find(state)
+        if node is None:
+            return None
+        start, end = self.chain.child_range(node)
+        if end == start:
+            return None
+        depth = node[0] + 1
+        index = random.choices(range(start, end),
+                               self.chain.counts[depth][start:end])[0]
+        word = self.chain.words[self.chain.word_ids[depth][index]]
+        return tuple(state[1:]) + (word,)
+
+    def find_start_states(self):
+        """Return a dict of each state which begins with START to how many
+           times it appeared in the corpus.
+
+        """
+        return {state: self.chain.count(state) for state, _ in
+                self.chain.contexts(self.order, prefix=(START,))}
+
     def generate_sentence(self, length):
         """Generate a sentence from the state transitions (values)
            in the Markov Chain.  Params and return values same as
            random_walk method.
 
         """
-        # pick a word randomly to start the sentence
-        state_types = self.chain.keys()
-        sentence = ""
-        first_state = random.sample(state_types, 1)[0]
-        for word in first_state:
-            sentence += str(word) + " "
+        # pick a state randomly to start the sentence
+        state = self.random_state()
+        words = [str(word) for word in state]
         # start the random walk
-        next_state = first_state
-        # for i in range(length - 1):
-        while not len(sentence.split()) == length:
-            # make sure the word has tokens that come after, find the next word
-            next_state = tuple(next_state)  # go from list back to tuple
-            if self.chain[next_state] is not None:
-                next_state = self.chain[next_state].sample()
-            else:
-                next_state = random.sample(state_types, 1)
-            sentence += str(next_state[-1]) + " "
-        return sentence
+        while len(words) < length:
+            # sample the next word from the trie, or start again from a
+            # random state if nothing ever came after this one
+            state = self.next_state(state) or self.random_state()
+            words.append(str(state[-1]))
+        return " ".join(words[:length]) + " "
 
     def fake_walk(self, length):
         """Generate a sentence from the states (keys) in the Markov Chain.
@@ -175,9 +278,8 @@ class HigherMarkovChain(MarkovChain):
 
         """
         # sample a key from self.keys randomly
-        state_types = self.chain.keys()
         sentence = ""
-        state_to_sample_from = random.sample(state_types, 1)[0]
+        state_to_sample_from = self.random_state()
         print(state_to_sample_from)
         # then sample from the state stochastically to form the sentence
         while not len(sentence.split()) == length:
@@ -205,17 +307,454 @@ class HigherMarkovChain(MarkovChain):
             sentence = self.fake_walk(length)
         return sentence
 
+    def previous_states(self, state):
+        """Return a list of the states which came right before the given
+           state in the corpus, found in a trie of the corpus backwards
+           (made the first time). O(k log v) runtime, plus the number of
+           states found.
+
+        """
+        if self.backward is None:
+            self.backward = ContextTrie(self.words_list[::-1],
+                                        self.order).freeze()
+        node = self.backward.find(tuple(reversed(state)))
+        if node is None:
+            return list()
+        # the children of the node, read straight from the trie's arrays
+        start, end = self.backward.child_range(node)
+        word_ids = self.backward.word_ids[node[0] + 1]
+        words = self.backward.words
+        rest = tuple(state[:-1])
+        states = [(words[word_ids[index]],) + rest
+                  for index in range(start, end)]
+        if self.chain.pruned:  # the corpus has transitions the chain doesn't
+            states = [previous for previous in states
+                      if self.chain.count(previous + state[-1:]) > 0]
+        return states
+
+    def added_chars(self, state):
+        """Return the characters the last word of a state adds to a
+           sentence, counting a space, or 0 for a marker.
+
+        """
+        word = state[-1]
+        return 0 if word in (START, END) else len(word) + 1
+
+    def distances_to(self, targets, limit=None):
+        """Return a dict of each state to the fewest characters the words
+           after it can add to a sentence which then contains each of the
+           target words, in order. Found by Dijkstra's algorithm backwards
+           over the transitions, from the states ending in the first target
+           (with the cost of the rest of the targets after them). Paths
+           don't cross from one sentence into the next, unless the target
+           is a marker. The search stops at the limit, so only the states
+           within limit characters of the targets are found.
+
+           The dicts for the last DISTANCE_CACHE_SIZE tuples of targets
+           used are kept for next time, so the cache can't keep growing
+           with the words users ask for.
+
+           Parameters:
+           targets(tuple): the words to reach, in order
+           limit(int): the most characters to search, or None for no limit
+
+           Returns:
+           dict: of state to characters, for the states which can reach
+                 all of the targets (within the limit)
+
+        """
+        targets = tuple(targets)
+        cached = self.distances.get(targets)
+        # a search that went further holds every distance within the limit
+        if cached is not None and (cached[0] is None or (
+                limit is not None and limit <= cached[0])):
+            self.distances.move_to_end(targets)
+            return cached[1]
+        word = targets[0]
+        after = None
+        if len(targets) > 1:
+            after = self.distances_to(targets[1:], limit)
+        self.previous_states((word,))  # make sure the backward trie exists
+        # costs are whole characters, so a queue of one bucket per cost
+        # does in order what a heap would, without comparing the states
+        buckets = dict()
+        for context, _ in self.backward.contexts(self.order, prefix=(word,)):
+            state = tuple(reversed(context))
+            cost = 0 if after is None else after.get(state)
+            if cost is not None:
+                buckets.setdefault(cost, list()).append(state)
+        distances = dict()
+        cost = 0
+        highest = max(buckets, default=-1)
+        while cost <= highest and (limit is None or cost <= limit):
+            # markers add no characters, so the bucket can grow as it's read
+            for state in buckets.setdefault(cost, list()):
+                if state in distances:
+                    continue
+                distances[state] = cost
+                if state[-1] in (START, END) and state[-1] != word:
+                    continue
+                step = cost + self.added_chars(state)
+                if limit is not None and step > limit:
+                    continue
+                bucket = buckets.setdefault(step, list())
+                bucket.extend(previous for previous in
+                              self.previous_states(state)
+                              if previous not in distances)
+                highest = max(highest, step)
+            del buckets[cost]
+            cost += 1
+        self.distances[targets] = (limit, distances)
+        while len(self.distances) > DISTANCE_CACHE_SIZE:
+            self.distances.popitem(last=False)  # the least recently used
+        return distances
+
+    def seed_states(self, seed):
+        """Return a dict of the states starting with the seed words to their
+           counts, preferring those at the start of a sentence. If the seed
+           is None, return where sentences start, or None if the corpus has
+           no sentence markers.
+
+        """
+        if seed is None:
+            counts = self.start_state_counts()
+            return counts if len(counts) > 0 else None
+        if isinstance(seed, str):
+            seed = (seed,)
+        seed = tuple(seed)
+        if len(seed) >= self.order:
+            state = seed[-self.order:]
+            return {state: 1} if state in self.chain else dict()
+        for prefix in [(START,) + seed, seed]:
+            if len(prefix) <= self.order:
+                states = {state: self.chain.count(state) for state, _ in
+                          self.chain.contexts(self.order, prefix=prefix)}
+                if len(states) > 0:
+                    return states
+        return dict()
+
+    def choose_start(self, seed, targets, max_chars):
+        """Return a state to start generating from, from which the targets
+           not in the state itself can all be reached in max_chars
+           characters, or None if there is none.
+
+        """
+        def fits(state):
+            remaining = tuple(word for word in targets if word not in state)
+            chars = len(" ".join(word for word in state
+                                 if word not in (START, END)))
+            if len(remaining) > 0:
+                distance = self.distances_to(remaining, max_chars).get(state)
+                if distance is None:
+                    return False
+                chars += distance
+            return chars <= max_chars
+
+        starts = self.seed_states(seed)
+        if starts is None:
+            # with no seed and no sentence starts, try random states
+            for _ in range(100):
+                state = self.random_state()
+                if fits(state):
+                    return state
+            return None
+        starts = {state: count for state, count in starts.items()
+                  if fits(state)}
+        if len(starts) == 0:
+            return None
+        states = list(starts)
+        return random.choices(states, [starts[state] for state in states])[0]
+
+    def generate(self, seed=None, required_words=(), max_chars=280,
+                 max_length=None):
+        """Generate a sentence which starts with the seed, contains each of
+           the required words, and is at most max_chars characters long.
+
+           Instead of generating sentences until one happens to fit, each
+           step only samples from the next states from which the rest of
+           the required words (in the order given) can still be reached in
+           the characters left. The fewest characters from each state to
+           the required words are found once, by a search over the
+           transitions backwards (see distances_to). In a corpus with
+           sentence markers, it steers to the END of a sentence last;
+           otherwise it stops when no next word fits. Required words in the
+           state it starts from are already contained.
+
+           Parameters:
+           seed(str or tuple): the word or words to start with, or None to
+                               start where sentences start in the corpus
+           required_words(list): words the sentence must contain
+           max_chars(int): the most characters in the sentence
+           max_length(int): the most words in the sentence, if given; only
+                            characters are steered by, so a small limit
+                            can leave no sentence that meets it
+
+           Returns:
+           str: the sentence, without markers, or None if there is none
+                which meets all of the constraints
+
+        """
+        has_markers = self.chain.count((END,)) > 0
+        targets = list(required_words) + ([END] if has_markers else [])
+        state = self.choose_start(seed, targets, max_chars)
+        if state is None:
+            return None
+        targets = [word for word in targets if word not in state]
+        words = [word for word in state if word not in (START, END)]
+        # characters so far, counting a space after the last word
+        chars = len(" ".join(words)) + 1
+        while len(targets) > 0 or not has_markers:
+            distances = (self.distances_to(targets, max_chars)
+                         if len(targets) > 0 else None)
+            candidates = list()
+            for word, count in self.chain.successors(state).items():
+                next_state = tuple(state[1:]) + (word,)
+                is_marker = word in (START, END)
+                if is_marker and (len(targets) == 0 or word != targets[0]):
+                    continue  # don't cross into another sentence
+                if (not is_marker and max_length is not None
+                        and len(words) >= max_length):
+                    continue
+                # the sentence's last space isn't counted in max_chars
+                chars_after = chars + self.added_chars(next_state)
+                if distances is not None:
+                    distance = distances.get(next_state)
+                    if distance is None:
+                        continue
+                    chars_after += distance
+                if chars_after - 1 > max_chars:
+                    continue
+                candidates.append((word, count))
+            if len(candidates) == 0:
+                if len(targets) > 0:
+                    return None
+                break  # nothing more fits, and nothing more is required
+            word = random.choices([word for word, _ in candidates],
+                                  [count for _, count in candidates])[0]
+            state = tuple(state[1:]) + (word,)
+            chars += self.added_chars(state)
+            if len(targets) > 0 and word == targets[0]:
+                targets.pop(0)
+            if word not in (START, END):
+                words.append(word)
+        return " ".join(words)
+
+    def ranked_range(self, state):
+        """Return the depth of a state's successors in the trie, the range of
+           them in its ranked arrays (see CompactContextTrie.ranked), and the
+           arrays, or None if nothing came after the state.
+
+        """
+        node = self.chain.find(state)
+        if node is None or not self.chain.has_successors(node):
+            return None
+        start, end = self.chain.child_range(node)
+        depth = node[0] + 1
+        ranks, totals = self.chain.ranked(depth)
+        return (depth, start, end, ranks, totals)
+
+    def state_at(self, words, index):
+        """Return the state made by the order words right before an index.
+        """
+        return tuple(words[index - self.order:index])
+
+    def successor_totals(self, node):
+        """Return how many times anything came after a node of the trie,
+           summed from its children's counts, and how many distinct words
+           did.
+
+        """
+        totals = self.totals.get(node)
+        if totals is None:
+            start, end = self.chain.child_range(node)
+            totals = (sum(self.chain.counts[node[0] + 1][start:end]),
+                      end - start)
+            self.totals[node] = totals
+        return totals
+
+    def transition_counts(self, state, word):
+        """Return a tuple of how many times the word came after the state,
+           and how many times anything did, from the trie.
+
+        """
+        node = self.chain.find(state)
+        if node is None:
+            return (0, 0)
+        total, _ = self.successor_totals(node)
+        return (self.chain.count(tuple(state) + (word,)), total)
+
+    def context_counts(self, state, word):
+        """Return a list of (count, total, types) tuples for the word after
+           each shorter end of the state the trie holds, longest first,
+           down to the empty context (see MarkovChain.context_counts).
+
+        """
+        levels = list()
+        state = tuple(state)
+        for i in range(len(state) + 1):
+            node = self.chain.find(state[i:])
+            if node is not None:
+                total, types = self.successor_totals(node)
+                levels.append((self.chain.count(state[i:] + (word,)), total,
+                               types))
+        return levels
+
+    def ranked_word(self, depth, ranks, rank):
+        """Return the word at a rank in the ranked arrays of a depth."""
+        return self.chain.words[self.chain.word_ids[depth][ranks[rank]]]
+
+    def sample_next(self, state, temperature=1.0, top_k=None, top_p=None):
+        """Return a word sampled from the words after a state, or None if
+           nothing came after it, using the successors sorted by count once
+           ahead of time.
+
+           Parameters:
+           state(tuple): the state to sample after
+           temperature(float): 1 samples by count, lower values favor the
+                               most frequent words more (0 always picks the
+                               most frequent), higher values flatten out
+                               the counts
+           top_k(int): only sample from the top_k most frequent words
+           top_p(float): only sample from the most frequent words which
+                         together make up at least top_p of the count
+                         (nucleus sampling)
+
+           Returns:
+           str: the word sampled
+
+        """
+        found = self.ranked_range(state)
+        if found is None:
+            return None
+        depth, start, end, ranks, totals = found
+        stop = end
+        if top_k is not None:
+            stop = min(stop, start + max(top_k, 1))
+        if top_p is not None:
+            # the first rank where the running total reaches top_p of it all
+            threshold = top_p * totals[end - 1]
+            stop = min(stop, bisect_left(totals, threshold, start, end) + 1)
+        if temperature == 0:
+            rank = start
+        elif temperature == 1:
+            # binary search over the running totals, O(log n) runtime
+            dart = random.randrange(totals[stop - 1])
+            rank = bisect_right(totals, dart, start, stop)
+        else:
+            # counts to the power 1 / temperature, scaled by the highest one
+            counts = self.chain.counts[depth]
+            highest = math.log(counts[ranks[start]])
+            weights = [math.exp((math.log(counts[ranks[i]]) - highest)
+                                / temperature) for i in range(start, stop)]
+            rank = start + random.choices(range(stop - start), weights)[0]
+        return self.ranked_word(depth, ranks, rank)
+
+    def first_state(self, seed=None):
+        """Return a state to start decoding from: one starting with the seed
+           words, or a sentence start, or a random state.
+
+        """
+        starts = self.seed_states(seed)
+        if starts is None:
+            return self.random_state()
+        if len(starts) == 0:
+            return None
+        states = list(starts)
+        return random.choices(states, [starts[state] for state in states])[0]
+
+    def sample_sentence(self, length=10, seed=None, temperature=1.0,
+                        top_k=None, top_p=None):
+        """Generate a sentence of up to length words, sampling each word with
+           sample_next. Stops early at the END of a sentence, or when nothing
+           came after the last words.
+
+           Returns:
+           str: the sentence, without markers, or None if no state starts
+                with the seed
+
+        """
+        state = self.first_state(seed)
+        if state is None:
+            return None
+        words = [word for word in state if word not in (START, END)]
+        while len(words) < length:
+            word = self.sample_next(state, temperature, top_k, top_p)
+            if word is None or word == END:
+                break
+            state = tuple(state[1:]) + (word,)
+            words.append(word)
+        return " ".join(words[:length])
+
+    def beam_search(self, length=10, beam_width=5, seed=None):
+        """Find the most likely sentences of up to length words, by beam
+           search: from the beam_width most likely starts, each step extends
+           every sentence in the beam by its beam_width most likely next
+           words (the front of the ranked successors) and keeps the
+           beam_width best. Sentences end at the END of a sentence, at
+           length words, or when nothing came after them.
+
+           Parameters:
+           length(int): the most words in a sentence
+           beam_width(int): the number of sentences kept at each step
+           seed(str or tuple): the words to start with, or None to start
+                               where sentences start in the corpus (or
+                               anywhere, without sentence markers)
+
+           Returns:
+           list: of (sentence, log probability) tuples, most likely first
+
+        """
+        starts = self.seed_states(seed)
+        if starts is None:
+            # no sentence starts, so start from the most frequent states
+            starts = {state: self.chain.count(state) for state in
+                      heapq.nlargest(beam_width, self.chain,
+                                     key=self.chain.count)}
+        total = sum(starts.values())
+        beam = [(math.log(count / total), state, [word for word in state
+                                                  if word not in (START, END)])
+                for state, count in starts.items()]
+        beam = heapq.nlargest(beam_width, beam, key=lambda entry: entry[0])
+        finished = list()
+        while len(beam) > 0:
+            extended = list()
+            for log_prob, state, words in beam:
+                found = self.ranked_range(state)
+                if found is None or len(words) >= length:
+                    finished.append((" ".join(words), log_prob))
+                    continue
+                depth, start, end, ranks, totals = found
+                counts = self.chain.counts[depth]
+                for rank in range(start, min(end, start + beam_width)):
+                    word = self.ranked_word(depth, ranks, rank)
+                    score = log_prob + math.log(counts[ranks[rank]]
+                                                / totals[end - 1])
+                    if word == END:
+                        finished.append((" ".join(words), score))
+                    else:
+                        extended.append((score, tuple(state[1:]) + (word,),
+                                         words + [word]))
+            beam = heapq.nlargest(beam_width, extended,
+                                  key=lambda entry: entry[0])
+        finished.sort(key=lambda entry: entry[1], reverse=True)
+        return finished[:beam_width]
+
 
 if __name__ == "__main__":
+    from profiling import profiled, pop_profile_flag
+    # --profile [cpu,stacks,memory] profiles building and walking the chain
+    arguments = pop_profile_flag(sys.argv[1:])
     left_right_list = ['I', 'went', 'left', 'you', 'went', 'right',
                        'I', 'went', 'left', 'I', 'went', 'right']
-    if len(sys.argv) > 1:  # user-defined order for the Markov Chain
-        order_num = int(sys.argv[1])
-        mark = HigherMarkovChain(left_right_list, order_num)
-    else:  # defaults to Second Order Markov Chain
-        # mark = HigherMarkovChain(left_right_list)
-        mark = HigherMarkovChain()
-    sentence = mark.random_walk()
+    with profiled('higher_order_build'):
+        if len(arguments) > 0:  # user-defined order for the Markov Chain
+            order_num = int(arguments[0])
+            mark = HigherMarkovChain(left_right_list, order_num)
+        else:  # defaults to Second Order Markov Chain
+            # mark = HigherMarkovChain(left_right_list)
+            mark = HigherMarkovChain()
+    with profiled('higher_order_walk'):
+        sentence = mark.random_walk()
     print(sentence)
     # length = len(sentence.split())
     # print(f'Length: {length}')
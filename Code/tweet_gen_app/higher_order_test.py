@@ -0,0 +1,205 @@
+from higher_order import HigherMarkovChain
+import higher_order
+import math
+import unittest
+
+
+class HigherMarkovChainTest(unittest.TestCase):
+    marked_list = [
+        "<s>", "one", "fish", "two", "fish", "</s>",
+        "<s>", "red", "fish", "blue", "fish", "</s>",
+        "<s>", "one", "fish", "blue", "fish", "</s>",
+        "<s>", "old", "fish", "new", "fish", "</s>"
+    ]
+
+    def assert_follows_chain(self, mark, sentence):
+        '''Each word in the sentence comes after the ones before it.'''
+        words = sentence.split()
+        for i in range(mark.order, len(words)):
+            state = tuple(words[i - mark.order:i])
+            assert words[i] in mark.chain.successors(state)
+
+    def test_generate_sentence(self):
+        # every state has a successor, so the walk never starts over
+        mark = HigherMarkovChain(["a", "b", "c", "a", "b", "d", "a", "b"], 2)
+        for _ in range(20):
+            sentence = mark.generate_sentence(12)
+            assert len(sentence.split()) == 12
+            self.assert_follows_chain(mark, sentence)
+        # nothing comes after "b e", so the walk starts over from a random
+        # state instead of getting stuck
+        mark = HigherMarkovChain(["a", "b", "c", "a", "b", "e"], 2)
+        assert mark.next_state(("b", "e")) is None
+        for _ in range(20):
+            assert len(mark.generate_sentence(12).split()) == 12
+        assert len(mark.generate_sentence(1).split()) == 1
+
+    def test_previous_states(self):
+        mark = HigherMarkovChain(self.marked_list, 2)
+        self.assertCountEqual(mark.previous_states(("fish", "blue")),
+                              [("red", "fish"), ("one", "fish")])
+        self.assertCountEqual(mark.previous_states(("fish", "</s>")),
+                              [("two", "fish"), ("blue", "fish"),
+                               ("new", "fish")])
+
+    def test_distances_to(self):
+        mark = HigherMarkovChain(self.marked_list, 2)
+        distances = mark.distances_to(("blue",))
+        assert distances[("fish", "blue")] == 0
+        # "blue " is 5 characters
+        assert distances[("red", "fish")] == 5
+        assert distances[("<s>", "one")] == len("fish blue ")
+        # sentences don't run into the next one
+        assert ("fish", "</s>") not in distances
+        # reaching "blue" and then the end adds "fish " after it
+        distances = mark.distances_to(("blue", "</s>"))
+        assert distances[("red", "fish")] == len("blue fish ")
+
+    def test_distances_to_limit(self):
+        mark = HigherMarkovChain(self.marked_list, 2)
+        # "<s> one" is 10 characters from "blue", past the limit of 5
+        distances = mark.distances_to(("blue",), 5)
+        assert distances[("red", "fish")] == 5
+        assert ("<s>", "one") not in distances
+        # a smaller limit reuses the search, a bigger one searches again
+        assert mark.distances_to(("blue",), 3) is distances
+        distances = mark.distances_to(("blue",), 10)
+        assert distances[("<s>", "one")] == len("fish blue ")
+        assert mark.distances_to(("blue",), 5) is distances
+
+    def test_distances_cache_size(self):
+        mark = HigherMarkovChain(self.marked_list, 2)
+        for word in ["one", "two", "red", "blue", "old", "new"]:
+            for end in ["fish", "</s>"]:
+                mark.distances_to((word, end))
+        assert len(mark.distances) == higher_order.DISTANCE_CACHE_SIZE
+        # the least recently used are dropped first
+        assert ("new", "</s>") in mark.distances
+        assert ("one", "fish") not in mark.distances
+
+    def test_generate(self):
+        mark = HigherMarkovChain(self.marked_list, 2)
+        for _ in range(20):
+            sentence = mark.generate()
+            assert sentence.split()[0] in ("one", "red", "old")
+            assert sentence.split()[-1] == "fish"
+            self.assert_follows_chain(mark, sentence)
+
+    def test_generate_seed(self):
+        mark = HigherMarkovChain(self.marked_list, 2)
+        for _ in range(20):
+            assert mark.generate(seed="red").startswith("red fish ")
+        assert mark.generate(seed=("old", "fish")).startswith("old fish ")
+        assert mark.generate(seed="green") is None
+
+    def test_generate_required_words(self):
+        mark = HigherMarkovChain(self.marked_list, 2)
+        for _ in range(20):
+            sentence = mark.generate(required_words=["one", "blue"])
+            assert sentence == "one fish blue fish"
+        # no sentence has both
+        assert mark.generate(required_words=["new", "blue"]) is None
+
+    def test_generate_max_chars(self):
+        mark = HigherMarkovChain(self.marked_list, 2)
+        for _ in range(20):
+            sentence = mark.generate(max_chars=17)
+            assert sentence in ("one fish two fish", "old fish new fish")
+        assert mark.generate(max_chars=16) is None
+        for _ in range(20):
+            sentence = mark.generate(required_words=["blue"], max_chars=18)
+            assert sentence in ("red fish blue fish", "one fish blue fish")
+        assert mark.generate(required_words=["blue"], max_chars=17) is None
+
+    def test_generate_without_markers(self):
+        mark = HigherMarkovChain(["a", "b", "c", "a", "b", "d", "e"], 2)
+        for _ in range(20):
+            sentence = mark.generate(required_words=["e"], max_chars=20)
+            assert sentence.split()[-1] == "e"
+            assert len(sentence) <= 20
+            self.assert_follows_chain(mark, sentence)
+
+    def test_sample_next(self):
+        words = ["a", "b", "c", "a", "b", "c", "a", "b", "d", "a", "b", "e"]
+        mark = HigherMarkovChain(words, 2)
+        # after "a b": c twice, d and e once each
+        assert mark.sample_next(("a", "b"), temperature=0) == "c"
+        assert mark.sample_next(("a", "b"), top_k=1) == "c"
+        assert mark.sample_next(("a", "b"), top_p=0.5) == "c"
+        for _ in range(20):
+            assert mark.sample_next(("a", "b")) in ("c", "d", "e")
+            assert mark.sample_next(("a", "b"), top_k=2) in ("c", "d", "e")
+            assert mark.sample_next(("a", "b"), top_p=0.6) in ("c", "d", "e")
+            assert mark.sample_next(("a", "b"), 0.5) in ("c", "d", "e")
+        assert mark.sample_next(("b", "e")) is None
+
+    def test_ranked(self):
+        words = ["a", "b", "c", "a", "b", "c", "a", "b", "d", "a", "b", "e"]
+        mark = HigherMarkovChain(words, 2)
+        depth, start, end, ranks, totals = mark.ranked_range(("a", "b"))
+        ranked_words = [mark.ranked_word(depth, ranks, rank)
+                        for rank in range(start, end)]
+        assert ranked_words[0] == "c"
+        self.assertCountEqual(ranked_words[1:], ["d", "e"])
+        assert list(totals[start:end]) == [2, 3, 4]
+
+    def test_sample_sentence(self):
+        mark = HigherMarkovChain(self.marked_list, 2)
+        for _ in range(20):
+            sentence = mark.sample_sentence(10)
+            assert len(sentence.split()) == 4
+            self.assert_follows_chain(mark, sentence)
+            assert mark.sample_sentence(3, seed="red") == "red fish blue"
+        assert mark.sample_sentence(seed="green") is None
+
+    def test_beam_search(self):
+        mark = HigherMarkovChain(self.marked_list, 2)
+        results = mark.beam_search(beam_width=2)
+        assert len(results) == 2
+        # "one" starts 2 of 4 sentences and is followed by "two" or "blue",
+        # so each sentence has a probability of 1 / 4
+        for sentence, log_prob in results:
+            assert sentence in ("one fish two fish", "one fish blue fish",
+                                "red fish blue fish", "old fish new fish")
+            self.assertAlmostEqual(log_prob, math.log(1 / 4))
+        results = mark.beam_search(length=3, beam_width=1, seed="old")
+        assert results == [("old fish new", 0.0)]
+
+    def test_transition_counts(self):
+        mark = HigherMarkovChain(self.marked_list, 2)
+        assert mark.transition_counts(("one", "fish"), "two") == (1, 2)
+        assert mark.transition_counts(("one", "fish"), "red") == (0, 2)
+        assert mark.transition_counts(("green", "eggs"), "ham") == (0, 0)
+        # the totals are summed, without ranking the successors
+        assert mark.chain.ranks == dict()
+
+    def test_prune(self):
+        mark = HigherMarkovChain(self.marked_list, 2)
+        report = mark.prune(min_count=2)
+        assert report['memory_saved'] == (report['memory_before']
+                                          - report['memory_after'])
+        assert report['memory_saved'] > 0
+        assert report['perplexity_after'] > report['perplexity_before']
+        # of the runs of three words, only those seen twice are left
+        assert mark.find_start_states() == {("<s>", "one"): 2}
+        assert mark.chain.successors(("fish", "blue")) == {"fish": 2}
+        assert ("one", "fish") not in mark.chain
+        assert ("red", "fish") not in mark.chain
+        # so no sentence can be made from start to end any more
+        assert mark.generate() is None
+
+    def test_prune_when_built(self):
+        pruned = HigherMarkovChain(self.marked_list, 2, min_count=2)
+        mark = HigherMarkovChain(self.marked_list, 2)
+        mark.prune(min_count=2)
+        assert list(pruned.chain) == list(mark.chain)
+        pruned = HigherMarkovChain(self.marked_list, 2, max_successors=1)
+        # every state is kept, with only its most frequent successor
+        assert list(pruned.chain) == list(HigherMarkovChain(
+            self.marked_list, 2).chain)
+        for state in pruned.chain:
+            assert len(pruned.chain.successors(state)) == 1
+
+
+if __name__ == "__main__":
+    unittest.main()
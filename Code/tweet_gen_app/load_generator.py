@@ -0,0 +1,258 @@
+#!python
+"""Load test for the tweet generator: how many sentences per second can
+one server serve, and how long do requests take?
+
+The app is booted with local stand-ins for MongoDB (an in-memory favorites
+collection) and Twitter (tweets are recorded, not sent), so no outside
+services are needed. Requests to /, /new_favorite/ and /favorites/ (and
+/tweet/, if it's given a weight) are then sent from several threads at
+once, in a configurable mix, and the throughput and latency percentiles
+for each route are printed as JSON.
+
+By default the app is served from this process by Werkzeug's threaded
+server. To compare gunicorn configurations, start it with the stand-ins:
+    gunicorn -w 4 --threads 2 'load_generator:create_app()'
+then point the load test at it:
+    python load_generator.py --url http://127.0.0.1:8000
+
+Usage: python load_generator.py [--url URL] [--requests N]
+                                [--concurrency C]
+                                [--mix index=8,new_favorite=1,favorites=1]
+                                [--words N] [--order K]
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import sys
+import threading
+import time
+import types
+import urllib.error
+import urllib.parse
+import urllib.request
+
+# routes that can be in the mix, and the HTTP method each one is sent with
+ROUTES = {
+    'index': ('/', 'POST'),
+    'new_favorite': ('/new_favorite/', 'POST'),
+    'favorites': ('/favorites/', 'GET'),
+    'tweet': ('/tweet/', 'POST')
+}
+DEFAULT_MIX = 'index=8,new_favorite=1,favorites=1'
+
+
+class FakeCollection(object):
+    """In-memory stand-in for a pymongo collection."""
+
+    def __init__(self):
+        self.documents = list()
+        self.lock = threading.Lock()
+        self.ids = itertools.count()
+
+    def insert_one(self, document):
+        """Store a copy of the document, giving it an _id."""
+        with self.lock:
+            document['_id'] = next(self.ids)
+            self.documents.append(dict(document))
+
+    def find(self, query=None, skip=0, limit=0):
+        """Return an iterator over the documents stored, skipping the first
+           skip of them, and stopping after limit (0 for no limit), as
+           pymongo's find does."""
+        with self.lock:
+            end = None if limit == 0 else skip + limit
+            return iter(self.documents[skip:end])
+
+
+class FakeDatabase(object):
+    """In-memory stand-in for a pymongo database."""
+
+    def __init__(self):
+        self.collections = dict()
+
+    def __getattr__(self, name):
+        """Return the collection with the given name, making it if needed."""
+        if name not in self.collections:
+            self.collections[name] = FakeCollection()
+        return self.collections[name]
+
+
+class FakeMongoClient(object):
+    """In-memory stand-in for pymongo.MongoClient."""
+
+    def __init__(self, host=None, **kwargs):
+        self.database = FakeDatabase()
+
+    def get_default_database(self):
+        return self.database
+
+
+def install_stand_ins():
+    """Make `import pymongo` give the in-memory stand-in, and return a list
+       that tweets will be added to instead of being sent to Twitter."""
+    pymongo = types.ModuleType('pymongo')
+    pymongo.MongoClient = FakeMongoClient
+    sys.modules['pymongo'] = pymongo
+    import twitter
+    sent_tweets = list()
+    twitter.tweet = sent_tweets.append
+    return sent_tweets
+
+
+def create_app(order=None):
+    """Return the tweet generator's Flask app, using the stand-ins.
+       Param: order(int): order of the Markov chain to serve sentences from,
+              or None for the app's own (also read from MARKOV_ORDER)
+    """
+    # the app reads the corpus from the folder it lives in
+    directory = os.path.dirname(os.path.abspath(__file__))
+    os.chdir(directory)
+    if directory not in sys.path:
+        sys.path.insert(0, directory)
+    install_stand_ins()
+    import app
+    if order is None and os.environ.get('MARKOV_ORDER') is not None:
+        order = int(os.environ['MARKOV_ORDER'])
+    if order is not None:
+        from higher_order import HigherMarkovChain
+        app.mark = HigherMarkovChain(order=order)
+    return app.app
+
+
+def start_server(flask_app):
+    """Serve the app from a background thread, on a free local port.
+       Return: (server, base URL)"""
+    from werkzeug.serving import make_server
+    server = make_server('127.0.0.1', 0, flask_app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return (server, 'http://127.0.0.1:{}'.format(server.server_port))
+
+
+class NoRedirects(urllib.request.HTTPRedirectHandler):
+    """Don't follow redirects, so each request times one route only."""
+
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+def parse_mix(mix):
+    """Return a dict of route names to weights, from "name=weight,..."."""
+    weights = dict()
+    for part in mix.split(','):
+        name, weight = part.split('=')
+        if name not in ROUTES:
+            raise ValueError('Unknown route in mix: {}'.format(name))
+        weights[name] = float(weight)
+    return weights
+
+
+def send_request(opener, base_url, route, num_words):
+    """Send one request for a route, and return its latency in seconds.
+       Raise an error if the response isn't a success or a redirect."""
+    path, method = ROUTES[route]
+    data = None
+    if method == 'POST':
+        sentence = 'Capitalism... it still works'
+        form = {'num': num_words, 'words': sentence, 'sentence': sentence}
+        data = urllib.parse.urlencode(form).encode()
+    start = time.perf_counter()
+    try:
+        with opener.open(base_url + path, data=data, timeout=30) as response:
+            response.read()
+    except urllib.error.HTTPError as error:
+        if not 300 <= error.code < 400:
+            raise
+    return time.perf_counter() - start
+
+
+def percentile(sorted_values, percent):
+    """Return the value at a percentile of a sorted list (nearest rank)."""
+    if len(sorted_values) == 0:
+        return None
+    index = max(int(round(percent / 100 * len(sorted_values))) - 1, 0)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+def run_load(base_url, mix, num_requests, concurrency, num_words=10):
+    """Send num_requests requests, picked from the mix, from concurrency
+       threads at once. Return a report (dict) of throughput and latency."""
+    routes = list(mix)
+    weights = [mix[route] for route in routes]
+    plan = random.choices(routes, weights, k=num_requests)
+    plan_lock = threading.Lock()
+    latencies = {route: list() for route in routes}
+    errors = {route: 0 for route in routes}
+
+    def worker():
+        opener = urllib.request.build_opener(NoRedirects)
+        while True:
+            with plan_lock:
+                if len(plan) == 0:
+                    return
+                route = plan.pop()
+            try:
+                latency = send_request(opener, base_url, route, num_words)
+                latencies[route].append(latency)
+            except (urllib.error.URLError, OSError):
+                errors[route] += 1
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - start
+    report = {
+        'url': base_url,
+        'requests': num_requests,
+        'concurrency': concurrency,
+        'seconds': seconds,
+        'requests_per_second': num_requests / seconds,
+        'routes': dict()
+    }
+    for route in routes:
+        times = sorted(latencies[route])
+        report['routes'][route] = {
+            'requests': len(times),
+            'errors': errors[route],
+            'requests_per_second': len(times) / seconds,
+            'latency_p50': percentile(times, 50),
+            'latency_p90': percentile(times, 90),
+            'latency_p99': percentile(times, 99),
+            'latency_max': times[-1] if len(times) > 0 else None
+        }
+    # sentences are made by the index route, so that's the one to watch
+    report['sentences_per_second'] = report['routes'].get(
+        'index', {'requests_per_second': 0})['requests_per_second']
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--url', help='load test a server already running')
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--mix', default=DEFAULT_MIX,
+                        help='weights of routes, e.g. ' + DEFAULT_MIX)
+    parser.add_argument('--words', type=int, default=10,
+                        help='words in each sentence generated')
+    parser.add_argument('--order', type=int,
+                        help='order of the Markov chain to serve from')
+    arguments = parser.parse_args()
+    server = None
+    base_url = arguments.url
+    if base_url is None:
+        server, base_url = start_server(create_app(arguments.order))
+    report = run_load(base_url, parse_mix(arguments.mix), arguments.requests,
+                      arguments.concurrency, arguments.words)
+    if server is not None:
+        server.shutdown()
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
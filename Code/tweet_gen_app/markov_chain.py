@@ -1,12 +1,27 @@
 import clean_words
+from clean_words import START, END
 from dictogram import Dictogram
+from bisect import bisect_right
+from collections import Counter
+from itertools import accumulate
+import math
 import random
+try:
+    import numpy
+except ImportError:  # NumPy is optional, see MarkovChain.perplexity
+    numpy = None
 
 
 class MarkovChain:
-    def __init__(self, words_list=None):
+    # number of words in a state
+    order = 1
+
+    def __init__(self, words_list=None, sentence_markers=False):
         """Construct a Markov Chain model.
            Param: words_list(list of str)
+                  sentence_markers(bool): if True, and no words_list is given,
+                                          mark where sentences start and end
+                                          in the corpus (see walk_sentence)
 
         """
         # use the passed in list of words
@@ -14,10 +29,17 @@ class MarkovChain:
             self.words_list = words_list
         else:
             # use the Adam Smith corpus
-            self.words_list = clean_words.get_clean_words()
+            self.words_list = clean_words.get_clean_words(sentence_markers)
         # populate the Markov Chain
         self.chain = dict()
         self.chain = self.populate_chain()
+        self.states = None  # list of the states, made when first needed
+        # states which begin sentences, how many sentences begin with each,
+        # and running totals of those counts, made when first needed
+        self.start_counts = None
+        self.start_states = None
+        self.start_totals = None
+        self.word_counts = None  # Counter of the corpus, made when needed
 
     def populate_chain(self):
         """Construct a dictionary representing the conditional probabilities
@@ -45,29 +67,257 @@ class MarkovChain:
             i += 1
         return chain
 
+    def random_state(self):
+        """Return a state chosen uniformly at random from the chain.
+           O(1) runtime, after a list of the states is made the first time.
+
+        """
+        if self.states is None:
+            self.states = list(self.chain)
+        return random.choice(self.states)
+
+    def state_words(self, state):
+        """Return a list of the words in a state."""
+        return [state]
+
+    def next_state(self, state):
+        """Return a state sampled from the states after the given one, or
+           None if nothing came after it.
+
+        """
+        if state not in self.chain:
+            return None
+        return self.chain[state].sample()
+
+    def find_start_states(self):
+        """Return a dict of each state which begins a sentence to how many
+           sentences begin with it: the words after START.
+
+        """
+        if START not in self.chain:
+            return dict()
+        return dict(self.chain[START])
+
+    def start_state_counts(self):
+        """Return the dict from find_start_states, found once and kept, along
+           with a list of the states and the running totals of their counts.
+
+        """
+        if self.start_counts is None:
+            self.start_counts = self.find_start_states()
+            self.start_states = list(self.start_counts)
+            self.start_totals = list(accumulate(
+                self.start_counts[state] for state in self.start_states))
+        return self.start_counts
+
+    def random_start(self):
+        """Return a state which begins a sentence, chosen in proportion to
+           how many sentences begin with it. The states and their running
+           totals are found once, then each choice is a binary search over
+           them, in O(log n) runtime.
+
+        """
+        if len(self.start_state_counts()) == 0:
+            raise ValueError('The corpus has no sentence markers.')
+        dart = random.randrange(self.start_totals[-1])
+        return self.start_states[bisect_right(self.start_totals, dart)]
+
+    def walk_sentence(self, max_length=50):
+        """Generate a whole sentence, from a state which begins a sentence in
+           the corpus until the END of a sentence, for a corpus with sentence
+           markers (see clean_words.get_clean_words).
+           Param: max_length(int): the most words to generate, if no END is
+                                   reached before then
+           Return: sentence(str), without the markers
+        """
+        state = self.random_start()
+        # a start state of one word is just START, which leaves no words
+        words = [word for word in self.state_words(state) if word != START]
+        while words[-1:] != [END] and len(words) <= max_length:
+            state = self.next_state(state)
+            if state is None:
+                break
+            words.append(self.state_words(state)[-1])
+        if words[-1:] == [END]:
+            words.pop()
+        return " ".join(words[:max_length]) + " "
+
+    def state_at(self, words, index):
+        """Return the state made by the words right before an index."""
+        return words[index - 1]
+
+    def transition_counts(self, state, word):
+        """Return a tuple of how many times the word came after the state,
+           and how many times anything did.
+
+        """
+        histogram = self.chain.get(state)
+        if histogram is None:
+            return (0, 0)
+        return (histogram.frequency(word), histogram.tokens)
+
+    def vocabulary_size(self):
+        """Return the number of distinct words in the corpus, plus one for
+           all of the words that aren't.
+
+        """
+        return len(self.unigram_counts()) + 1
+
+    def unigram_counts(self):
+        """Return a Counter of each word in the corpus, counted once."""
+        if self.word_counts is None:
+            self.word_counts = Counter(self.words_list)
+        return self.word_counts
+
+    def context_counts(self, state, word):
+        """Return a list of (count, total, types) tuples for the contexts of
+           a word the chain can back off to, longest first: how many times
+           the word came after the context, how many times anything did,
+           and how many distinct words did. The last is the empty context,
+           the whole corpus.
+
+        """
+        levels = list()
+        histogram = self.chain.get(state)
+        if histogram is not None:
+            levels.append((histogram.frequency(word), histogram.tokens,
+                           histogram.types))
+        counts = self.unigram_counts()
+        levels.append((counts[word], len(self.words_list), len(counts)))
+        return levels
+
+    def interpolated_probability(self, state, word):
+        """Return the probability of a word after a state, mixing in the
+           shorter contexts with Witten-Bell interpolation, so an unseen
+           transition gets the probability of the word after less context
+           rather than a share of the whole vocabulary:
+               P(word | context) = w * count(context, word) / count(context)
+                                   + (1 - w) * P(word | shorter context)
+           where w = count(context) / (count(context) + distinct words after
+           it). The empty context is smoothed with add-one, so words never
+           seen still get some probability.
+
+        """
+        levels = self.context_counts(state, word)
+        count, total, _ = levels[-1]
+        probability = (count + 1) / (total + self.vocabulary_size())
+        for count, total, types in reversed(levels[:-1]):
+            if total > 0:
+                weight = total / (total + types)
+                probability = (weight * count / total
+                               + (1 - weight) * probability)
+        return probability
+
+    def transitions(self, words):
+        """Return a Counter of each (state, next word) pair in a list of
+           words, for every word after the first state.
+
+        """
+        return Counter((self.state_at(words, i), words[i])
+                       for i in range(self.order, len(words)))
+
+    def log_probabilities(self, words, k=1, interpolate=False):
+        """Return the natural log of the probability of each word after the
+           first state, given the state before it, with add-k smoothing so
+           transitions never seen get some probability:
+               (count(state, word) + k) / (count(state) + k * vocabulary)
+           or, if interpolate is True, with the shorter contexts mixed in
+           (see interpolated_probability). Add-k gives every unseen
+           transition of a longer state about 1 / vocabulary, so it makes
+           higher orders look worse than they are; interpolation is the
+           fairer way to compare orders. Each distinct transition is only
+           looked up once, and the logs are taken all at once with NumPy,
+           if it's installed. A transition with no probability (k = 0)
+           gives -inf, with NumPy or without.
+
+           Parameters:
+           words(list): the words to score
+           k(float): the count added to every transition
+           interpolate(bool): interpolate with shorter contexts instead of
+                              add-k smoothing
+
+           Returns:
+           tuple: the total of the log probabilities, and the number of
+                  words they're for
+
+        """
+        transitions = self.transitions(words)
+        vocabulary = self.vocabulary_size()
+        probabilities = list()
+        repeats = list()
+        for (state, word), repeat in transitions.items():
+            if interpolate:
+                probability = self.interpolated_probability(state, word)
+            else:
+                count, total = self.transition_counts(state, word)
+                denominator = total + k * vocabulary
+                # with k = 0, nothing after an unseen state has probability
+                probability = (count + k) / denominator if denominator else 0
+            probabilities.append(probability)
+            repeats.append(repeat)
+        if numpy is not None:
+            with numpy.errstate(divide='ignore'):  # log(0) is -inf
+                logs = numpy.log(numpy.array(probabilities, dtype=float))
+            log_total = float(numpy.dot(logs, numpy.array(repeats)))
+        else:
+            log_total = math.fsum(repeat * (math.log(probability)
+                                            if probability > 0
+                                            else -math.inf)
+                                  for probability, repeat in
+                                  zip(probabilities, repeats))
+        return (log_total, sum(repeats))
+
+    def score(self, sentence, k=1, interpolate=False):
+        """Return the natural log of the probability of a sentence (a str or
+           list of words), given its first state, with add-k smoothing or
+           interpolation (see log_probabilities).
+
+        """
+        words = sentence.split() if isinstance(sentence, str) else sentence
+        return self.log_probabilities(list(words), k, interpolate)[0]
+
+    def perplexity(self, words, k=1, interpolate=False):
+        """Return the perplexity of the chain on a list of held-out words:
+           e to the power of minus the mean log probability per word. Lower
+           is better; it's how many words the chain is as unsure between, on
+           average, as if it picked among them uniformly.
+
+        """
+        log_total, num_words = self.log_probabilities(words, k, interpolate)
+        if num_words == 0:
+            raise ValueError('There are no words to score.')
+        return math.exp(-log_total / num_words)
+
     def random_walk(self, length=10):
         """Generate a sentence by randomly transitioning between states.
            Param: length(int) the number of words that should be generated
            Return: sentence(str)
         """
         # pick a word randomly to start the sentence
-        state_types = self.chain.keys()
         sentence = ''
-        first_word = random.sample(state_types, 1)[0]
+        first_word = self.random_state()
         sentence += first_word + " "
         # start the random walk
         next_word = first_word
         for i in range(length - 1):
             # make sure the word has tokens that come after, find the next word
-            if self.chain[next_word] is not None:
+            if next_word in self.chain:
                 next_word = self.chain[next_word].sample()
             else:
-                next_word = random.sample(state_types, 1)[0]
+                next_word = self.random_state()
             sentence += next_word + " "
         return sentence
 
 
 if __name__ == "__main__":
+    import sys
+    from profiling import profiled, pop_profile_flag
+    # --profile [cpu,stacks,memory] profiles building and walking the chain
+    arguments = pop_profile_flag(sys.argv[1:])
     fish_list = ['one', 'fish', 'two', 'fish', 'red', 'fish', 'blue', 'fish']
-    mark = MarkovChain(fish_list)
-    print(mark.random_walk())
+    with profiled('markov_chain_build'):
+        # "--corpus" builds the chain from the Adam Smith text instead
+        mark = MarkovChain(None if '--corpus' in arguments else fish_list)
+    with profiled('markov_chain_walk'):
+        sentence = mark.random_walk()
+    print(sentence)
@@ -1,8 +1,16 @@
 from markov_chain import MarkovChain
+from higher_order import HigherMarkovChain
+from unittest import mock
+import markov_chain
+import math
 import unittest
 
 
 class MarkovChainTest(unittest.TestCase):
+    fish_list = [
+        "one", "fish", "two", "fish", "red", "fish", "blue", "fish"
+    ]
+
     def test_init(self):
         '''Checks that the Markov Chain represents the corpus correctly.'''
         fish_list = [
@@ -42,6 +50,105 @@ class MarkovChainTest(unittest.TestCase):
             states_that_come_next = list(mark.chain[word].keys())
             assert word_after in states_that_come_next
 
+    def test_walk_sentence(self):
+        '''Sentences start after a START marker and stop at an END.'''
+        marked_list = [
+            "<s>", "one", "fish", "</s>", "<s>", "two", "fish", "</s>",
+            "<s>", "red", "fish", "blue", "fish", "</s>"
+        ]
+        mark = MarkovChain(marked_list)
+        assert mark.find_start_states() == {"one": 1, "two": 1, "red": 1}
+        for _ in range(20):
+            sentence = mark.walk_sentence().split()
+            assert sentence[0] in ("one", "two", "red")
+            assert "<s>" not in sentence and "</s>" not in sentence
+            assert len(sentence) <= 50
+            for i in range(len(sentence) - 1):
+                assert sentence[i + 1] in mark.chain[sentence[i]]
+        # without markers, there is nowhere to start a sentence
+        with self.assertRaises(ValueError):
+            MarkovChain(["one", "fish"]).walk_sentence()
+
+    def test_walk_sentence_higher_order(self):
+        marked_list = [
+            "<s>", "one", "fish", "two", "fish", "</s>",
+            "<s>", "red", "fish", "blue", "fish", "</s>"
+        ]
+        mark = HigherMarkovChain(marked_list, 2)
+        assert mark.find_start_states() == {("<s>", "one"): 1,
+                                            ("<s>", "red"): 1}
+        sentences = set(mark.walk_sentence() for _ in range(30))
+        assert sentences <= {"one fish two fish ", "red fish blue fish ",
+                             "one fish blue fish ", "red fish two fish "}
+        assert mark.walk_sentence(max_length=2) in ("one fish ", "red fish ")
+        # an order 1 start state is just the marker, so the walk starts
+        # from the words after it
+        mark = HigherMarkovChain(marked_list, 1)
+        assert mark.find_start_states() == {("<s>",): 2}
+        for _ in range(20):
+            sentence = mark.walk_sentence().split()
+            assert sentence[0] in ("one", "red")
+            assert "<s>" not in sentence and "</s>" not in sentence
+        assert mark.walk_sentence(max_length=1) in ("one ", "red ")
+
+    def test_score(self):
+        mark = MarkovChain(self.fish_list)
+        # 5 word types, plus 1 for unseen words, so with k = 1:
+        # one -> fish (1 + 1) / (1 + 6), fish -> two (1 + 1) / (3 + 6)
+        expected = math.log(2 / 7) + math.log(2 / 9)
+        self.assertAlmostEqual(mark.score("one fish two"), expected)
+        self.assertAlmostEqual(mark.score(["one", "fish", "two"]), expected)
+        # never seen: (0 + 1) / (0 + 6)
+        self.assertAlmostEqual(mark.score("green eggs"), math.log(1 / 6))
+        # without smoothing, unseen transitions are impossible
+        self.assertAlmostEqual(mark.score("one fish", k=0), 0.0)
+        assert mark.score("one fish one", k=0) == -math.inf
+        assert mark.score("green eggs", k=0) == -math.inf
+        # the same without NumPy, instead of math.log(0) raising
+        with mock.patch.object(markov_chain, 'numpy', None):
+            assert mark.score("one fish one", k=0) == -math.inf
+            assert mark.score("green eggs", k=0) == -math.inf
+            self.assertAlmostEqual(mark.score("one fish two"), expected)
+        assert mark.perplexity(["one", "fish", "one"], k=0) == math.inf
+
+    def test_score_interpolated(self):
+        mark = MarkovChain(self.fish_list)
+        # one -> fish: 1 of 1 after "one", 1 distinct word, so the weight
+        # is 1 / 2, mixed with fish over the corpus (4 + 1) / (8 + 6)
+        one_fish = 1 / 2 * 1 + 1 / 2 * 5 / 14
+        # fish -> two: 1 of 3 after "fish", 3 distinct words after it
+        fish_two = 3 / 6 * 1 / 3 + 3 / 6 * 2 / 14
+        self.assertAlmostEqual(mark.score("one fish two", interpolate=True),
+                               math.log(one_fish) + math.log(fish_two))
+        # an unseen state backs off to the corpus: (0 + 1) / (8 + 6)
+        self.assertAlmostEqual(mark.score("green eggs", interpolate=True),
+                               math.log(1 / 14))
+        # an order 1 HigherMarkovChain gives the same numbers
+        higher = HigherMarkovChain(self.fish_list, 1)
+        for sentence in ["one fish two", "fish one", "green eggs"]:
+            self.assertAlmostEqual(higher.score(sentence, interpolate=True),
+                                   mark.score(sentence, interpolate=True))
+        # only "two" came after "one fish" in an order 2 chain, so "red"
+        # gets half of its probability after "fish" alone
+        higher = HigherMarkovChain(self.fish_list, 2)
+        fish_red = 3 / 6 * 1 / 3 + 3 / 6 * 2 / 14
+        self.assertAlmostEqual(higher.score("one fish red", interpolate=True),
+                               math.log(1 / 2 * fish_red))
+
+    def test_perplexity(self):
+        mark = MarkovChain(self.fish_list)
+        words = ["one", "fish", "two"]
+        self.assertAlmostEqual(mark.perplexity(words),
+                               math.exp(-mark.score(words) / 2))
+        # an order 1 HigherMarkovChain gives the same numbers
+        higher = HigherMarkovChain(self.fish_list, 1)
+        self.assertAlmostEqual(higher.perplexity(words),
+                               mark.perplexity(words))
+        self.assertAlmostEqual(higher.score("green eggs", k=0.5),
+                               mark.score("green eggs", k=0.5))
+        with self.assertRaises(ValueError):
+            mark.perplexity(["one"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,197 @@
+#!python
+"""Counters and latency histograms for the tweet generator, which can be
+shown in the Prometheus text format (for the /metrics route).
+
+Recording a value takes a lock, a binary search over the histogram buckets
+and a few additions, so metrics can be left on in production. Set the
+environment variable TWEET_GEN_LOG_METRICS to log how long each stage takes
+as well.
+
+Metrics are kept in the memory of each process. Under gunicorn (see the
+Procfile) every worker has its own, and /metrics only shows the numbers of
+the worker that answers it, so every sample is labelled with the pid of
+its worker. Add up the latest sample of each pid to get the totals.
+"""
+from bisect import bisect_left
+from contextlib import contextmanager
+import logging
+import os
+import threading
+import time
+
+# upper bounds of the latency buckets, in seconds
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                   0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+logger = logging.getLogger(__name__)
+
+
+def format_labels(label_names, label_values, *extra):
+    """Return the labels of a sample in the Prometheus text format, followed
+       by any extra labels, already formatted like 'name="value"'."""
+    labels = ['{}="{}"'.format(name, value)
+              for name, value in zip(label_names, label_values)]
+    labels.extend(label for label in extra if label != '')
+    if len(labels) == 0:
+        return ''
+    return '{' + ','.join(labels) + '}'
+
+
+class Counter(object):
+    """A count that only goes up, such as the number of sentences made,
+       kept separately for each combination of label values."""
+
+    kind = 'counter'
+
+    def __init__(self, name, description, label_names=()):
+        self.name = name
+        self.description = description
+        self.label_names = tuple(label_names)
+        self.values = dict()  # total for each tuple of label values
+        self.lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        """Add given amount to the count for given label values."""
+        with self.lock:
+            self.values[label_values] = self.values.get(label_values,
+                                                        0) + amount
+
+    def value(self, *label_values):
+        """Return the count for given label values."""
+        return self.values.get(label_values, 0)
+
+    def samples(self, extra=''):
+        """Return a list of the lines of this counter's samples, with the
+           extra label (like 'pid="12"') added to each, if any."""
+        with self.lock:
+            values = sorted(self.values.items())
+        return ['{}{} {}'.format(self.name,
+                                 format_labels(self.label_names, labels,
+                                               extra),
+                                 value)
+                for labels, value in values]
+
+
+class Histogram(object):
+    """Counts of observed values (like latencies) in buckets, along with
+       their count and sum, kept separately for each combination of label
+       values."""
+
+    kind = 'histogram'
+
+    def __init__(self, name, description, label_names=(),
+                 buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.description = description
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        # [bucket counts, count, sum] for each tuple of label values; each
+        # value is only counted in its own bucket, and the counts are added
+        # up into cumulative ones when shown
+        self.values = dict()
+        self.lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        """Record one observed value for given label values."""
+        index = bisect_left(self.buckets, value)
+        with self.lock:
+            state = self.values.get(label_values)
+            if state is None:
+                state = [[0] * (len(self.buckets) + 1), 0, 0.0]
+                self.values[label_values] = state
+            state[0][index] += 1
+            state[1] += 1
+            state[2] += value
+
+    def count(self, *label_values):
+        """Return the number of values observed for given label values."""
+        state = self.values.get(label_values)
+        return 0 if state is None else state[1]
+
+    def samples(self, extra=''):
+        """Return a list of the lines of this histogram's samples, with the
+           extra label (like 'pid="12"') added to each, if any."""
+        with self.lock:
+            values = sorted((labels, (list(state[0]), state[1], state[2]))
+                            for labels, state in self.values.items())
+        lines = list()
+        for labels, (bucket_counts, count, total) in values:
+            cumulative = 0
+            bounds = [repr(bound) for bound in self.buckets] + ['+Inf']
+            for bound, bucket_count in zip(bounds, bucket_counts):
+                cumulative += bucket_count
+                lines.append('{}_bucket{} {}'.format(
+                    self.name, format_labels(self.label_names, labels, extra,
+                                             'le="{}"'.format(bound)),
+                    cumulative))
+            label_text = format_labels(self.label_names, labels, extra)
+            lines.append('{}_count{} {}'.format(self.name, label_text, count))
+            lines.append('{}_sum{} {!r}'.format(self.name, label_text, total))
+        return lines
+
+
+class Registry(object):
+    """All the metrics to show together on one page."""
+
+    def __init__(self, pid_label=False):
+        """Set pid_label to label every sample with the id of the process
+           showing it, for apps served by several worker processes."""
+        self.metrics = list()
+        self.pid_label = pid_label
+
+    def counter(self, name, description, label_names=()):
+        """Make a Counter, add it to this registry and return it."""
+        metric = Counter(name, description, label_names)
+        self.metrics.append(metric)
+        return metric
+
+    def histogram(self, name, description, label_names=(),
+                  buckets=DEFAULT_BUCKETS):
+        """Make a Histogram, add it to this registry and return it."""
+        metric = Histogram(name, description, label_names, buckets)
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        """Return all the metrics in the Prometheus text format."""
+        lines = list()
+        # the pid is found when shown, as workers may be forked after this
+        # module is imported
+        extra = 'pid="{}"'.format(os.getpid()) if self.pid_label else ''
+        for metric in self.metrics:
+            lines.append('# HELP {} {}'.format(metric.name,
+                                               metric.description))
+            lines.append('# TYPE {} {}'.format(metric.name, metric.kind))
+            lines.extend(metric.samples(extra))
+        return '\n'.join(lines) + '\n'
+
+
+# metrics of the tweet generator
+registry = Registry(pid_label=True)
+stage_seconds = registry.histogram(
+    'tweet_gen_stage_seconds', 'Seconds spent in each stage of a request.',
+    ['stage'])
+sentences = registry.counter(
+    'tweet_gen_sentences_total', 'Sentences generated.')
+words_generated = registry.counter(
+    'tweet_gen_words_total', 'Words generated in all sentences.')
+favorites_added = registry.counter(
+    'tweet_gen_favorites_total', 'Sentences added to the favorites.')
+tweets_sent = registry.counter(
+    'tweet_gen_tweets_total', 'Sentences posted to Twitter.')
+log_stages = os.environ.get('TWEET_GEN_LOG_METRICS', '') not in ('', '0')
+if log_stages:
+    logging.basicConfig(level=logging.INFO)
+
+
+@contextmanager
+def timed(stage):
+    """Time the code in a with block, as one observation of given stage."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        stage_seconds.observe(seconds, stage)
+        if log_stages:
+            logger.info('%s took %.6f seconds', stage, seconds)
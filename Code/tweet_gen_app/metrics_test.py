@@ -0,0 +1,73 @@
+#!python
+
+from metrics import Counter, Histogram, Registry
+import metrics
+import os
+import unittest
+
+
+class MetricsTest(unittest.TestCase):
+
+    def test_counter(self):
+        counter = Counter('words_total', 'Words.', ['kind'])
+        counter.inc('noun')
+        counter.inc('noun', amount=2)
+        counter.inc('verb')
+        assert counter.value('noun') == 3
+        assert counter.value('verb') == 1
+        assert counter.value('adjective') == 0
+        assert counter.samples() == ['words_total{kind="noun"} 3',
+                                     'words_total{kind="verb"} 1']
+
+    def test_histogram(self):
+        histogram = Histogram('latency_seconds', 'Latency.',
+                              buckets=(0.1, 1.0))
+        histogram.observe(0.05)
+        histogram.observe(0.1)  # bucket bounds are inclusive
+        histogram.observe(0.5)
+        histogram.observe(5.0)
+        assert histogram.count() == 4
+        assert histogram.samples() == [
+            'latency_seconds_bucket{le="0.1"} 2',
+            'latency_seconds_bucket{le="1.0"} 3',
+            'latency_seconds_bucket{le="+Inf"} 4',
+            'latency_seconds_count 4',
+            'latency_seconds_sum 5.65'
+        ]
+
+    def test_render(self):
+        registry = Registry()
+        counter = registry.counter('sentences_total', 'Sentences made.')
+        counter.inc()
+        text = registry.render()
+        assert text == ('# HELP sentences_total Sentences made.\n'
+                        '# TYPE sentences_total counter\n'
+                        'sentences_total 1\n')
+
+    def test_render_pid_label(self):
+        registry = Registry(pid_label=True)
+        registry.counter('sentences_total', 'Sentences made.').inc()
+        histogram = registry.histogram('latency_seconds', 'Latency.',
+                                       ['stage'], buckets=(1.0,))
+        histogram.observe(0.5, 'walk')
+        pid = 'pid="{}"'.format(os.getpid())
+        lines = registry.render().splitlines()
+        assert 'sentences_total{' + pid + '} 1' in lines
+        assert ('latency_seconds_bucket{stage="walk",' + pid
+                + ',le="1.0"} 1') in lines
+        assert 'latency_seconds_count{stage="walk",' + pid + '} 1' in lines
+
+    def test_timed(self):
+        before = metrics.stage_seconds.count('test_stage')
+        with metrics.timed('test_stage'):
+            pass
+        assert metrics.stage_seconds.count('test_stage') == before + 1
+        # the stage is still timed when the block raises an error
+        with self.assertRaises(ValueError):
+            with metrics.timed('test_stage'):
+                raise ValueError()
+        assert metrics.stage_seconds.count('test_stage') == before + 2
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,180 @@
+#!python
+"""Opt-in profiling of building Markov chains and generating sentences.
+
+Wrap code in `with profiled('label'):` and it runs as usual, unless
+profiling is turned on, by the environment variable MARKOV_PROFILE or by
+calling set_modes. Either one takes a comma-separated list of modes:
+    cpu     cProfile statistics, saved as label.pstats (for snakeviz or
+            pstats) and label.txt (the top functions by cumulative time)
+    stacks  call stacks sampled every millisecond, saved as label.folded,
+            one "caller;callee count" line per stack, the input format of
+            flamegraph.pl, speedscope and inferno
+    memory  tracemalloc's peak memory and the lines that allocated the most
+            at the end, saved as label-memory.txt
+Files are written to the folder in MARKOV_PROFILE_DIR (default "profiles"),
+and a summary of each profile is printed to stderr.
+"""
+from contextlib import contextmanager
+import cProfile
+import collections
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+
+MODES = ('cpu', 'stacks', 'memory')
+# seconds between samples of the call stack, in stacks mode
+SAMPLE_INTERVAL = 0.001
+# number of functions, or allocating lines, to list in the text reports
+TOP_LINES = 25
+
+modes = [mode for mode in os.environ.get('MARKOV_PROFILE', '').split(',')
+         if mode != '']
+output_dir = os.environ.get('MARKOV_PROFILE_DIR', 'profiles')
+
+
+def set_modes(mode_list):
+    """Turn on the given profiling modes, from a list or a comma-separated
+       string, instead of the ones in MARKOV_PROFILE."""
+    global modes
+    if isinstance(mode_list, str):
+        mode_list = [mode for mode in mode_list.split(',') if mode != '']
+    for mode in mode_list:
+        if mode not in MODES:
+            raise ValueError('Unknown profiling mode: {}'.format(mode))
+    modes = list(mode_list)
+
+
+def pop_profile_flag(arguments):
+    """Remove "--profile MODES" from a list of command line arguments, and
+       turn on those modes (all of them if none are given)."""
+    if '--profile' not in arguments:
+        return arguments
+    index = arguments.index('--profile')
+    del arguments[index]
+    if index < len(arguments) and arguments[index].split(',')[0] in MODES:
+        set_modes(arguments.pop(index))
+    else:
+        set_modes(MODES)
+    return arguments
+
+
+def output_path(label, suffix):
+    """Return the path of a profile output file, making its folder."""
+    os.makedirs(output_dir, exist_ok=True)
+    return os.path.join(output_dir, label + suffix)
+
+
+def frame_stack(frame):
+    """Return a frame's call stack as one string, outermost call first."""
+    names = list()
+    while frame is not None:
+        code = frame.f_code
+        names.append('{} ({}:{})'.format(code.co_name,
+                                         os.path.basename(code.co_filename),
+                                         code.co_firstlineno))
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+class StackSampler(object):
+    """Samples the call stack of a thread from a background thread, and
+       counts how many times each stack was seen."""
+
+    def __init__(self, thread_id, interval=SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = collections.Counter()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[frame_stack(frame)] += 1
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+
+    def write_folded(self, path):
+        """Write the stacks seen in the folded format, most frequent first."""
+        with open(path, 'w') as file:
+            for stack, count in self.stacks.most_common():
+                file.write('{} {}\n'.format(stack, count))
+
+
+def report(message):
+    """Print a profiling summary line to stderr."""
+    print('[profile] ' + message, file=sys.stderr)
+
+
+@contextmanager
+def profiled(label):
+    """Profile the code in a with block in each mode that's turned on,
+       saving the results in files named after the label."""
+    if len(modes) == 0:
+        yield
+        return
+    profiler = sampler = None
+    if 'memory' in modes:
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        memory_before = tracemalloc.get_traced_memory()[0]
+    if 'stacks' in modes:
+        sampler = StackSampler(threading.get_ident())
+        sampler.start()
+    if 'cpu' in modes:
+        profiler = cProfile.Profile()
+    start = time.perf_counter()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        seconds = time.perf_counter() - start
+        report('{} took {:.3f} seconds'.format(label, seconds))
+        if profiler is not None:
+            profiler.dump_stats(output_path(label, '.pstats'))
+            text = io.StringIO()
+            stats = pstats.Stats(profiler, stream=text)
+            stats.sort_stats('cumulative').print_stats(TOP_LINES)
+            with open(output_path(label, '.txt'), 'w') as file:
+                file.write(text.getvalue())
+            report('{} CPU profile written to {}'.format(
+                label, output_path(label, '.pstats')))
+        if sampler is not None:
+            sampler.stop()
+            sampler.write_folded(output_path(label, '.folded'))
+            report('{} {} stack samples written to {}'.format(
+                label, sum(sampler.stacks.values()),
+                output_path(label, '.folded')))
+        if 'memory' in modes:
+            current, peak = tracemalloc.get_traced_memory()
+            # leave out memory used by the profilers themselves
+            snapshot = tracemalloc.take_snapshot().filter_traces([
+                tracemalloc.Filter(False, cProfile.__file__),
+                tracemalloc.Filter(False, __file__),
+                tracemalloc.Filter(False, tracemalloc.__file__)])
+            if not was_tracing:
+                tracemalloc.stop()
+            with open(output_path(label, '-memory.txt'), 'w') as file:
+                file.write('peak: {} bytes\n'.format(peak - memory_before))
+                file.write('kept: {} bytes\n'.format(current - memory_before))
+                file.write('\nlargest allocations still held:\n')
+                for stat in snapshot.statistics('lineno')[:TOP_LINES]:
+                    file.write('{}\n'.format(stat))
+            report('{} peak memory {:.1f} MiB, {:.1f} MiB kept'.format(
+                label, (peak - memory_before) / 2 ** 20,
+                (current - memory_before) / 2 ** 20))
@@ -0,0 +1,49 @@
+#!python
+
+import profiling
+import os
+import tempfile
+import unittest
+
+
+class ProfilingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        profiling.output_dir = self.folder.name
+
+    def tearDown(self):
+        profiling.set_modes([])
+        self.folder.cleanup()
+
+    def test_pop_profile_flag(self):
+        arguments = profiling.pop_profile_flag(['3', '--profile', 'cpu'])
+        assert arguments == ['3']
+        assert profiling.modes == ['cpu']
+        # all modes are turned on when none are given
+        arguments = profiling.pop_profile_flag(['--profile', '3'])
+        assert arguments == ['3']
+        assert profiling.modes == list(profiling.MODES)
+        with self.assertRaises(ValueError):
+            profiling.set_modes('cpu,disk')
+
+    def test_off(self):
+        with profiling.profiled('off'):
+            sum(range(100))
+        assert os.listdir(self.folder.name) == []
+
+    def test_profiled(self):
+        profiling.set_modes('cpu,stacks,memory')
+        with profiling.profiled('on'):
+            words = [str(number) for number in range(100000)]
+        assert len(words) == 100000
+        self.assertCountEqual(os.listdir(self.folder.name),
+                              ['on.pstats', 'on.txt', 'on.folded',
+                               'on-memory.txt'])
+        with open(os.path.join(self.folder.name, 'on-memory.txt')) as file:
+            peak = int(file.readline().split()[1])
+        assert peak > 100000  # at least a byte for each string made
+
+
+if __name__ == '__main__':
+    unittest.main()
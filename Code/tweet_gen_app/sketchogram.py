@@ -0,0 +1,171 @@
+#!python
+
+from __future__ import division, print_function  # Python 2 and 3 compatibility
+from array import array
+import heapq
+import math
+import random
+import zlib
+
+
+class Sketchogram(object):
+    """Sketchogram is a histogram that estimates word counts with a
+    Count-Min Sketch, so it takes the same amount of memory no matter how
+    many words, or how many different words, are added to it.
+
+    The sketch is a table of depth rows by width counters. Each word is
+    hashed to one counter in every row, and adding the word adds to all of
+    them. Other words can land on the same counters, so a counter can only
+    be too high, never too low: a word's estimated count is the smallest of
+    its counters. With width = e / epsilon and depth = ln(1 / delta), an
+    estimate is over the true count by at most epsilon * tokens, with
+    probability at least 1 - delta.
+
+    Since words themselves are not stored, the top_k most frequent words
+    seen so far are tracked separately (the heavy hitters), for
+    most_common and sample."""
+
+    def __init__(self, word_list=None, epsilon=0.001, delta=0.01, top_k=20):
+        """Initialize an empty sketch with the given error bounds, and count
+        given words.
+        Param: epsilon(float): most overcount, as a fraction of all tokens
+               delta(float): chance of an estimate going over that bound
+               top_k(int): number of most frequent words to keep track of"""
+        self.epsilon = epsilon
+        self.delta = delta
+        self.width = int(math.ceil(math.e / epsilon))
+        self.depth = int(math.ceil(math.log(1 / delta)))
+        self.rows = [array('Q', [0]) * self.width for _ in range(self.depth)]
+        self.tokens = 0  # Total count of all word tokens in this histogram
+        # Estimated count of distinct word types: words are counted as new
+        # when their estimate was 0 before they were added, so this can be
+        # too low (when a new word's counters were all used already)
+        self.types = 0
+        self.top_k = top_k
+        self.heavy_hitters = dict()  # estimated counts of the top_k words
+        # min-heap of (estimate, word) for the heavy hitters, to find the
+        # least of them; an entry is stale once its word's estimate grows
+        # or the word is evicted, and is dropped when it reaches the top
+        self.heavy_heap = list()
+        # Count words in given list, if any
+        if word_list is not None:
+            for word in word_list:
+                self.add_count(word)
+
+    def columns(self, word):
+        """Return the column of the counter for given word in each row.
+        Two CRC-32 hashes of the word are combined into one hash per row
+        (double hashing). Unlike hash(), CRC-32 is the same in every
+        process, so sketches built in different processes can be merged."""
+        data = str(word).encode('utf-8')
+        first = zlib.crc32(data)
+        second = zlib.crc32(data, 0x9747B28C) | 1
+        return [(first + row * second) % self.width
+                for row in range(self.depth)]
+
+    def add_count(self, word, count=1):
+        """Increase estimated frequency count of given word by given count.
+        O(depth) time, plus O(log top_k) to update the heavy hitters.
+        """
+        estimate = None
+        for row, column in zip(self.rows, self.columns(word)):
+            if estimate is None or row[column] < estimate:
+                estimate = row[column]
+            row[column] += count
+        if estimate == 0:
+            self.types += 1
+        self.tokens += count
+        self.track(word, estimate + count)
+
+    def track(self, word, estimate):
+        """Update the heavy hitters with the new estimate for given word.
+        O(log top_k) amortized time."""
+        if word in self.heavy_hitters or len(self.heavy_hitters) < self.top_k:
+            self.heavy_hitters[word] = estimate
+            heapq.heappush(self.heavy_heap, (estimate, word))
+        elif self.top_k > 0 and estimate > self.heavy_floor():
+            # replace the least frequent heavy hitter, which this beats
+            _, least = heapq.heappop(self.heavy_heap)
+            del self.heavy_hitters[least]
+            self.heavy_hitters[word] = estimate
+            heapq.heappush(self.heavy_heap, (estimate, word))
+        if len(self.heavy_heap) > 2 * len(self.heavy_hitters) + 16:
+            # too many stale entries, so keep only the current ones
+            self.heavy_heap = [(count, word) for word, count
+                               in self.heavy_hitters.items()]
+            heapq.heapify(self.heavy_heap)
+
+    def heavy_floor(self):
+        """Return the lowest estimate among the heavy hitters, dropping the
+        stale entries above it from the heap, or 0 if there are none."""
+        heap = self.heavy_heap
+        while heap and self.heavy_hitters.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else 0
+
+    def frequency(self, word):
+        """Return estimated frequency count of given word: at least its true
+        count, and likely at most epsilon * tokens above it."""
+        return min(row[column]
+                   for row, column in zip(self.rows, self.columns(word)))
+
+    def __contains__(self, word):
+        """Return boolean indicating if given word is (likely) in this
+        histogram. Never False for a word that was added."""
+        return self.frequency(word) > 0
+
+    def error_bound(self):
+        """Return the most that an estimate is likely to be over by."""
+        return self.epsilon * self.tokens
+
+    def most_common(self, k=None):
+        """Return a list of up to k (word, estimated count) pairs for the most
+        frequent words, most frequent first."""
+        pairs = sorted(self.heavy_hitters.items(),
+                       key=lambda pair: pair[1], reverse=True)
+        return pairs if k is None else pairs[:k]
+
+    def sample(self):
+        """Return a word sampled from the heavy hitters, weighted by their
+        estimated counts. Words outside the top_k can't be sampled, since the
+        sketch doesn't store words."""
+        words = list(self.heavy_hitters)
+        weights = [self.heavy_hitters[word] for word in words]
+        return random.choices(words, weights)[0]
+
+    def merge(self, other):
+        """Add the counts of another Sketchogram with the same width and depth
+        (for example, one filled in another process) to this one."""
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError('Sketches of different sizes cannot be merged.')
+        for row, other_row in zip(self.rows, other.rows):
+            for column in range(self.width):
+                row[column] += other_row[column]
+        self.tokens += other.tokens
+        self.types = max(self.types, other.types)
+        # re-estimate every candidate for the heavy hitters
+        candidates = set(self.heavy_hitters) | set(other.heavy_hitters)
+        self.heavy_hitters = dict()
+        self.heavy_heap = list()
+        for word in candidates:
+            self.track(word, self.frequency(word))
+        return self
+
+
+def main():
+    import sys
+    arguments = sys.argv[1:]  # Exclude script name in first argument
+    if len(arguments) >= 1:
+        histogram = Sketchogram(arguments)
+    else:
+        fish_text = 'one fish two fish red fish blue fish'
+        histogram = Sketchogram(fish_text.split())
+    print('most common: {}'.format(histogram.most_common()))
+    print('{} tokens, about {} types'.format(histogram.tokens,
+                                             histogram.types))
+    print('estimates are over by at most {:.2f}, with {:.0%} certainty'.format(
+        histogram.error_bound(), 1 - histogram.delta))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+#!python
+
+from sketchogram import Sketchogram
+import random
+import unittest
+
+
+class SketchogramTest(unittest.TestCase):
+
+    # Test fixtures: known inputs and their expected results
+    fish_words = ['one', 'fish', 'two', 'fish', 'red', 'fish', 'blue', 'fish']
+    fish_dict = {'one': 1, 'fish': 4, 'two': 1, 'red': 1, 'blue': 1}
+
+    def test_size(self):
+        histogram = Sketchogram(epsilon=0.01, delta=0.05)
+        assert histogram.width == 272  # e / 0.01, rounded up
+        assert histogram.depth == 3  # ln(1 / 0.05), rounded up
+        # Memory should not grow as words are added
+        histogram.add_count('fish', 1000)
+        assert len(histogram.rows) == 3
+        assert all(len(row) == 272 for row in histogram.rows)
+
+    def test_frequency(self):
+        histogram = Sketchogram(self.fish_words)
+        for word, count in self.fish_dict.items():
+            assert histogram.frequency(word) == count
+            assert word in histogram
+        assert histogram.tokens == 8
+        assert histogram.types == 5
+
+    def test_error_bound(self):
+        # Estimates are never too low, and rarely too high by more than the
+        # error bound, even when there are many more words than counters
+        histogram = Sketchogram(epsilon=0.01, delta=0.01)
+        # seeded, so the share of estimates over the bound doesn't vary
+        generator = random.Random(0)
+        words = ['word{}'.format(generator.randint(0, 5000))
+                 for _ in range(20000)]
+        for word in words:
+            histogram.add_count(word)
+        counts = dict()
+        for word in words:
+            counts[word] = counts.get(word, 0) + 1
+        over_bound = 0
+        for word, count in counts.items():
+            estimate = histogram.frequency(word)
+            assert estimate >= count
+            if estimate - count > histogram.error_bound():
+                over_bound += 1
+        assert over_bound <= 0.01 * len(counts)
+
+    def test_most_common(self):
+        histogram = Sketchogram(self.fish_words, top_k=2)
+        for word in ['red'] * 3 + ['blue']:
+            histogram.add_count(word)
+        self.assertCountEqual(histogram.most_common(),
+                              [('fish', 4), ('red', 4)])
+        assert len(histogram.most_common(1)) == 1
+        # The floor follows the least heavy hitter as words are replaced
+        assert histogram.heavy_floor() == 4
+        histogram = Sketchogram(top_k=3)
+        for word in ['a', 'b', 'c', 'a', 'b', 'd', 'd', 'd']:
+            histogram.add_count(word)
+        assert histogram.heavy_hitters == {'a': 2, 'b': 2, 'd': 3}
+        assert histogram.heavy_floor() == 2
+        # Nothing is tracked with a top_k of 0
+        histogram = Sketchogram(self.fish_words, top_k=0)
+        assert histogram.most_common() == []
+
+    def test_sample(self):
+        histogram = Sketchogram(self.fish_words)
+        samples = [histogram.sample() for _ in range(10000)]
+        sampled_freq = samples.count('fish') / len(samples)
+        assert 0.5 * 0.9 <= sampled_freq <= 0.5 * 1.1
+
+    def test_merge(self):
+        first = Sketchogram(self.fish_words[:4])
+        second = Sketchogram(self.fish_words[4:])
+        first.merge(second)
+        for word, count in self.fish_dict.items():
+            assert first.frequency(word) == count
+        assert first.tokens == 8
+        assert first.most_common(1) == [('fish', 4)]
+        with self.assertRaises(ValueError):
+            first.merge(Sketchogram(epsilon=0.1))
+
+
+if __name__ == '__main__':
+    unittest.main()
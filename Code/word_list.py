@@ -0,0 +1,242 @@
+#!python
+
+from array import array
+from itertools import islice
+import hashlib
+import math
+import mmap
+import os
+import random
+import sys
+import tempfile
+
+# the words file that comes with most Unix systems
+DICTIONARY_PATH = "/usr/share/dict/words"
+# how many numbers come before the offsets in an index file
+HEADER_LENGTH = 2
+
+
+class WordList(object):
+    """WordList is a read-only sequence of the lines in a words file.
+
+       The file is memory mapped instead of read, so the operating system
+       shares one copy of its pages between every process that opens it,
+       and no Python strings exist for a word until it is asked for.
+       An index of line offsets gives O(1) access to any line by number.
+    """
+
+    def __init__(self, path=DICTIONARY_PATH, index_path=None):
+        """Map the words file into memory, then load its line offset index
+           from index_path if it's there and up to date, or build it.
+        """
+        self.path = path
+        with open(path, "rb") as file:
+            stat = os.fstat(file.fileno())
+            self.signature = (stat.st_size, stat.st_mtime_ns)
+            if stat.st_size == 0:
+                # an empty file cannot be memory mapped
+                self.data = b""
+            else:
+                self.data = mmap.mmap(file.fileno(), 0,
+                                      access=mmap.ACCESS_READ)
+        self.index_map = None  # mmap of the index file, if one is used
+        self.index_view = None  # the index file, read as 8-byte numbers
+        self.offsets = None
+        if index_path is not None and self.load_index(index_path) is True:
+            return
+        self.offsets = self.build_index()
+        if index_path is not None:
+            try:
+                self.save_index(index_path)
+            except OSError:
+                return  # keep using the index in this process's memory
+            self.load_index(index_path)
+
+    def build_index(self):
+        """Return an array of the offsets where each line begins, followed by
+           the offset of the end of the file.
+           Running time: O(n) for a file of n bytes (one scan through it).
+        """
+        offsets = array("Q", [0])
+        data = self.data
+        end = len(data)
+        position = data.find(b"\n")
+        while position != -1:
+            offsets.append(position + 1)
+            position = data.find(b"\n", position + 1)
+        # a last line with no newline at the end still counts as a line
+        if offsets[-1] != end:
+            offsets.append(end)
+        return offsets
+
+    def save_index(self, index_path):
+        """Write the offset index to a file, so other processes can map it
+           into memory instead of building it again. The size and modified
+           time of the words file are written first, to notice when the
+           index is out of date.
+        """
+        index = array("Q", self.signature)
+        index.extend(self.offsets)
+        # write to a temporary file, then move it into place all at once so
+        # no process ever maps a half-written index
+        directory = os.path.dirname(os.path.abspath(index_path))
+        file_descriptor, temp_path = tempfile.mkstemp(dir=directory)
+        with os.fdopen(file_descriptor, "wb") as file:
+            index.tofile(file)
+        os.replace(temp_path, index_path)
+
+    def load_index(self, index_path):
+        """Map an offset index written by save_index into memory.
+           Return False if it's missing or doesn't match the words file.
+        """
+        try:
+            with open(index_path, "rb") as file:
+                index_map = mmap.mmap(file.fileno(), 0,
+                                      access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return False
+        if len(index_map) % array("Q").itemsize != 0:
+            index_map.close()  # not an index file, or a damaged one
+            return False
+        offsets = memoryview(index_map).cast("Q")
+        if (len(offsets) <= HEADER_LENGTH
+                or tuple(offsets[:HEADER_LENGTH]) != self.signature):
+            offsets.release()
+            index_map.close()
+            return False
+        self.index_map = index_map
+        self.index_view = offsets
+        self.offsets = offsets[HEADER_LENGTH:]
+        return True
+
+    def __len__(self):
+        """Return the number of lines in the words file."""
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        """Return the word on the line at the given index, without its
+           newline. Negative indexes count back from the end, like a list.
+           Running time: O(l) for a word of l characters.
+        """
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("line index out of range")
+        line = self.data[self.offsets[index]:self.offsets[index + 1]]
+        return line.rstrip(b"\r\n").decode("utf-8", "replace")
+
+    def __iter__(self):
+        """Generate the words in the file, in order."""
+        for index in range(len(self)):
+            yield self[index]
+
+    def sample(self, k):
+        """Return a list of k different words picked uniformly at random.
+           Raises ValueError if k is more than the number of words.
+           Running time: O(k), the offset index jumps right to each word.
+        """
+        return [self[index] for index in random.sample(range(len(self)), k)]
+
+    def close(self):
+        """Unmap the words file and the index file from memory."""
+        if self.index_map is not None:
+            self.offsets.release()
+            self.index_view.release()
+            self.index_map.close()
+            self.index_map = None
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+
+
+def index_directory():
+    """Return the directory index files are kept in, which belongs to this
+       user only, making it the first time. Return None if it can't be made
+       or someone else owns it, so no one else's files are ever trusted.
+    """
+    directory = os.path.join(tempfile.gettempdir(), "word_list")
+    if hasattr(os, "getuid"):
+        # the temp directory is shared by every user on Unix
+        directory += "-{}".format(os.getuid())
+    try:
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        stat = os.stat(directory)
+    except OSError:
+        return None
+    if hasattr(os, "getuid") and stat.st_uid != os.getuid():
+        return None
+    return directory
+
+
+def index_path_for(path):
+    """Return where the shared offset index of a words file is kept, or None
+       if there's nowhere safe to keep it.
+    """
+    directory = index_directory()
+    if directory is None:
+        return None
+    name = hashlib.md5(os.path.abspath(path).encode()).hexdigest()
+    return os.path.join(directory, "{}.idx".format(name))
+
+
+# the WordList for each words file opened by this process
+word_lists = dict()
+
+
+def get_word_list(path=DICTIONARY_PATH):
+    """Return the WordList for a words file, opening it the first time only.
+       Its index is kept in this user's temp directory, so it's built by the
+       first process to need it and shared by the rest.
+    """
+    if path not in word_lists:
+        word_lists[path] = WordList(path, index_path_for(path))
+    return word_lists[path]
+
+
+def reservoir_sample(lines, k):
+    """Return a list of k items picked uniformly at random from an iterable,
+       in one pass, holding only k items in memory (reservoir sampling).
+       Instead of drawing a random number for every item, the number of items
+       to skip before the next replacement is drawn (Li's Algorithm L), so
+       most items are passed over without any work.
+       Raises ValueError if there are fewer than k items.
+    """
+    lines = iter(lines)
+    reservoir = list(islice(lines, k))
+    if len(reservoir) < k:
+        raise ValueError("sample larger than population")
+    if k == 0:
+        return reservoir
+    # 1 - random() is never 0, so it's safe to take the log of it
+    weight = math.exp(math.log(1.0 - random.random()) / k)
+    while weight < 1.0:
+        skip = math.floor(math.log(1.0 - random.random())
+                          / math.log(1.0 - weight))
+        # move ahead to the next item to put into the reservoir, if any
+        next_line = list(islice(lines, skip, skip + 1))
+        if len(next_line) == 0:
+            break
+        reservoir[random.randrange(k)] = next_line[0]
+        weight *= math.exp(math.log(1.0 - random.random()) / k)
+    # the first k items start out in order, so mix up their positions
+    random.shuffle(reservoir)
+    return reservoir
+
+
+def sample_words(k, path=DICTIONARY_PATH):
+    """Return k different words picked uniformly at random from a words file.
+       If an offset index of the file has been built already, this takes
+       O(k) time. If not, the file is streamed through once with reservoir
+       sampling, rather than loaded and indexed just to pick a few words.
+    """
+    index_path = index_path_for(path)
+    if path in word_lists or (index_path is not None
+                              and os.path.exists(index_path)):
+        return get_word_list(path).sample(k)
+    with open(path, "r", encoding="utf-8", errors="replace") as file:
+        return [line.rstrip("\r\n") for line in reservoir_sample(file, k)]
+
+
+if __name__ == "__main__":
+    words = get_word_list(*sys.argv[1:2])
+    print("{} words in {}".format(len(words), words.path))
@@ -0,0 +1,118 @@
+#!python
+
+from word_list import WordList, index_path_for, reservoir_sample
+import os
+import tempfile
+import unittest
+
+
+class WordListTest(unittest.TestCase):
+
+    # Test fixtures: contents of a small words file
+    words = ['aardvark', 'banana', 'café', 'zebra']
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'words')
+        self.index_path = os.path.join(self.directory, 'words.idx')
+        with open(self.path, 'w', encoding='utf-8') as file:
+            file.write('\n'.join(self.words) + '\n')
+
+    def tearDown(self):
+        for name in os.listdir(self.directory):
+            os.remove(os.path.join(self.directory, name))
+        os.rmdir(self.directory)
+
+    def test_length_and_items(self):
+        word_list = WordList(self.path)
+        assert len(word_list) == 4
+        assert list(word_list) == self.words
+        # Verify random access by line number, from either end
+        assert word_list[0] == 'aardvark'
+        assert word_list[2] == 'café'
+        assert word_list[-1] == 'zebra'
+        with self.assertRaises(IndexError):
+            word_list[4]
+        word_list.close()
+
+    def test_no_newline_at_end(self):
+        with open(self.path, 'w') as file:
+            file.write('one\ntwo')
+        word_list = WordList(self.path)
+        assert list(word_list) == ['one', 'two']
+        word_list.close()
+
+    def test_empty_file(self):
+        open(self.path, 'w').close()
+        word_list = WordList(self.path)
+        assert len(word_list) == 0
+        assert list(word_list) == []
+
+    def test_shared_index(self):
+        # The first WordList builds and saves the index file
+        first = WordList(self.path, self.index_path)
+        assert os.path.exists(self.index_path)
+        # The next one maps the saved index instead of building it again
+        second = WordList(self.path, self.index_path)
+        assert second.index_map is not None
+        assert list(second) == self.words
+        first.close()
+        second.close()
+
+    def test_stale_index(self):
+        WordList(self.path, self.index_path).close()
+        # Changing the words file should cause the index to be rebuilt
+        with open(self.path, 'a') as file:
+            file.write('zucchini\n')
+        word_list = WordList(self.path, self.index_path)
+        assert len(word_list) == 5
+        assert word_list[-1] == 'zucchini'
+        word_list.close()
+
+    def test_bad_index(self):
+        # A file that isn't a whole number of offsets is rebuilt, not read
+        with open(self.index_path, 'wb') as file:
+            file.write(b'abc')
+        word_list = WordList(self.path, self.index_path)
+        assert list(word_list) == self.words
+        assert os.path.getsize(self.index_path) % 8 == 0
+        word_list.close()
+
+    def test_index_path_for(self):
+        index_path = index_path_for(self.path)
+        assert index_path == index_path_for(self.path)
+        assert index_path != index_path_for(self.index_path)
+        # Index files are kept in a directory only this user can use
+        directory = os.path.dirname(index_path)
+        assert os.path.isdir(directory)
+        if hasattr(os, 'getuid'):
+            assert os.stat(directory).st_uid == os.getuid()
+            assert os.stat(directory).st_mode & 0o077 == 0
+
+    def test_sample(self):
+        word_list = WordList(self.path)
+        sample = word_list.sample(3)
+        assert len(sample) == 3
+        assert len(set(sample)) == 3  # words are picked without replacement
+        for word in sample:
+            assert word in self.words
+        with self.assertRaises(ValueError):
+            word_list.sample(5)
+        word_list.close()
+
+    def test_reservoir_sample(self):
+        assert reservoir_sample(range(10), 0) == []
+        self.assertCountEqual(reservoir_sample(range(4), 4), range(4))
+        with self.assertRaises(ValueError):
+            reservoir_sample(range(3), 4)
+        # Every item should be picked about equally often
+        counts = [0] * 10
+        for _ in range(10000):
+            for item in reservoir_sample(range(10), 2):
+                counts[item] += 1
+        for count in counts:
+            assert 2000 * 0.9 <= count <= 2000 * 1.1
+
+
+if __name__ == '__main__':
+    unittest.main()